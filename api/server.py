@@ -6,8 +6,8 @@ FastAPI-based REST API with WebSocket support for real-time updates
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
-from pydantic import BaseModel
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 import json
 import asyncio
@@ -16,6 +16,7 @@ from datetime import datetime
 
 from ..core.blockchain import QXBlockchain
 from ..core.block import Transaction
+from ..core.miner import MiningJob
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -44,6 +45,9 @@ class WalletCreate(BaseModel):
     user_id: str
     password: Optional[str] = None
 
+class WalletBatchCreate(BaseModel):
+    user_ids: List[str] = Field(..., max_length=QXBlockchain.MAX_WALLET_BATCH)  # larger batches get 422
+
 class TransactionCreate(BaseModel):
     sender_user_id: str
     recipient_address: str
@@ -58,6 +62,22 @@ class MineRequest(BaseModel):
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def start_key_reservoir():
+    """Start pre-generating wallet key pairs in the background"""
+    blockchain.key_reservoir.start()
+
+@app.on_event("shutdown")
+async def stop_key_reservoir():
+    """Stop the wallet key pair filler and any mining job still running"""
+    blockchain.cancel_mining_jobs()
+    blockchain.key_reservoir.stop(timeout=5)
+
+@app.get("/metrics/key-reservoir")
+async def get_key_reservoir_metrics():
+    """Depth and counters of the pre-generated wallet key reservoir"""
+    return blockchain.key_reservoir.stats()
+
 # WebSocket manager
 async def broadcast_update(message: Dict[str, Any]):
     """Broadcast update to all connected WebSocket clients"""
@@ -83,10 +103,9 @@ async def root():
 @app.get("/chain")
 async def get_chain():
     """Get the full blockchain"""
-    return {
-        "chain": [block.to_dict() for block in blockchain.chain],
-        "length": len(blockchain.chain)
-    }
+    chain = blockchain.chain
+    content = b'{"chain": ' + chain.to_json() + b', "length": %d}' % len(chain)
+    return Response(content=content, media_type="application/json")
 
 @app.get("/chain/stats")
 async def get_chain_stats():
@@ -99,12 +118,12 @@ async def get_block(block_index: int):
     if block_index < 0 or block_index >= len(blockchain.chain):
         raise HTTPException(status_code=404, detail="Block not found")
     
-    return blockchain.chain[block_index].to_dict()
+    return Response(content=blockchain.chain.block_json(block_index), media_type="application/json")
 
 @app.get("/blocks/latest")
 async def get_latest_block():
     """Get the latest block"""
-    return blockchain.get_latest_block().to_dict()
+    return Response(content=blockchain.chain.block_json(-1), media_type="application/json")
 
 @app.post("/wallets")
 async def create_wallet(wallet_data: WalletCreate):
@@ -126,6 +145,40 @@ async def create_wallet(wallet_data: WalletCreate):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/wallets/batch")
+async def create_wallets_batch(batch: WalletBatchCreate):
+    """
+    Create many wallets in one request
+    Keys are generated across the process pool off the event loop and all
+    wallets are inserted atomically; results stream back as one JSON object
+    per line, followed by a single aggregated websocket event
+    """
+    if not batch.user_ids:
+        raise HTTPException(status_code=400, detail="user_ids must not be empty")
+    
+    loop = asyncio.get_running_loop()
+    try:
+        results = await loop.run_in_executor(None, blockchain.create_wallets, batch.user_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    await broadcast_update({
+        "type": "wallets_created",
+        "data": {
+            "count": len(results),
+            "wallets": [{"user_id": r["user_id"], "address": r["address"]} for r in results]
+        },
+        "timestamp": datetime.now().isoformat()
+    })
+    
+    def stream_results():
+        for result in results:
+            yield json.dumps(result) + "\n"
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
 @app.get("/wallets/{user_id}")
 async def get_wallet(user_id: str):
     """Get wallet information"""
@@ -160,6 +213,21 @@ async def get_transaction_history(address: str):
         "count": len(transactions)
     }
 
+@app.get("/transactions/{tx_hash}/proof")
+async def get_transaction_proof(tx_hash: str):
+    """Get a Merkle inclusion proof for a confirmed transaction"""
+    block = blockchain.find_transaction_block(tx_hash)
+    if block is None:
+        raise HTTPException(status_code=404, detail="Transaction not found in chain")
+    
+    return {
+        "transaction_hash": tx_hash,
+        "block_index": block.index,
+        "block_hash": block.block_hash,
+        "merkle_root": block.merkle_root,
+        "proof": block.merkle_proof(tx_hash)
+    }
+
 @app.get("/transactions/pending")
 async def get_pending_transactions():
     """Get pending transactions"""
@@ -207,8 +275,10 @@ async def mine_block(mine_request: MineRequest):
         if not blockchain.pending_transactions:
             raise HTTPException(status_code=400, detail="No pending transactions to mine")
         
-        # Mine the block
-        new_block = blockchain.mine_pending_transactions(mine_request.miner_address)
+        # Mine the block off the event loop
+        new_block = await MiningJob(blockchain, mine_request.miner_address).run()
+        if new_block is None:
+            raise HTTPException(status_code=409, detail="Chain tip changed while mining; retry")
         
         # Broadcast new block
         await broadcast_update({
@@ -222,6 +292,8 @@ async def mine_block(mine_request: MineRequest):
             "block": new_block.to_dict()
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -236,10 +308,10 @@ async def validate_chain():
 
 @app.get("/export")
 async def export_blockchain():
-    """Export blockchain as JSON"""
+    """Export blockchain as JSON, wrapping the cached block encodings without re-parsing them"""
     try:
-        chain_json = blockchain.export_chain()
-        return {"blockchain": json.loads(chain_json)}
+        content = '{"blockchain": ' + blockchain.export_chain() + '}'
+        return Response(content=content, media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -0,0 +1,17 @@
+"""
+pytest configuration for QXChain
+core, api and network use package-relative imports, so the repository is
+made importable as the `qxchain` package for tests that need them
+"""
+
+import importlib.machinery
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+if 'qxchain' not in sys.modules:
+    spec = importlib.machinery.ModuleSpec('qxchain', None, is_package=True)
+    spec.submodule_search_locations = [ROOT]
+    sys.modules['qxchain'] = importlib.util.module_from_spec(spec)
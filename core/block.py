@@ -5,15 +5,44 @@ Block structure for QXChain quantum-resistant blockchain
 import hashlib
 import json
 import time
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, asdict
-from ..crypto.quantum_signatures import QuantumSignature
+from typing import Any, Callable, Dict, List, Optional, Union
+from dataclasses import dataclass, asdict, field
+from ..crypto.backends import get_backend
+from ..crypto.quantum_signatures import SigningKey
+from .encoding import ENCODING_VERSION, Decoder, Encoder
+from .merkle import MerkleTree
+from .difficulty import GENESIS_BITS, INITIAL_BITS, compact_to_target, target_bytes, work_difficulty
+from .signature_cache import verified_signatures
+
+
+class _SerializationCache:
+    """
+    Memoizes serialized forms of a dataclass until one of its fields is assigned
+    Classes using it declare a _serialized field. In-place changes to a
+    mutable field (e.g. appending to a list) are not seen.
+    """
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if not name.startswith('_'):
+            object.__setattr__(self, '_serialized', None)
+    
+    def _cached(self, key: str, build: Callable[[], Any]) -> Any:
+        cache = self._serialized
+        if cache is None:
+            cache = {}
+            object.__setattr__(self, '_serialized', cache)
+        if key not in cache:
+            cache[key] = build()
+        return cache[key]
 
 
 @dataclass
-class Transaction:
+class Transaction(_SerializationCache):
     """
     Quantum-resistant transaction structure
+    The hash covers the canonical binary encoding of the fields before the
+    signature.
     """
     sender: str
     recipient: str
@@ -24,6 +53,8 @@ class Transaction:
     signature: Optional[bytes] = None
     public_key: Optional[bytes] = None
     transaction_hash: Optional[str] = None
+    version: int = ENCODING_VERSION
+    _serialized: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         if self.transaction_hash is None:
@@ -31,51 +62,228 @@ class Transaction:
     
     def calculate_hash(self) -> str:
         """Calculate transaction hash"""
-        tx_data = {
-            'sender': self.sender,
-            'recipient': self.recipient,
-            'amount': self.amount,
-            'fee': self.fee,
-            'timestamp': self.timestamp,
-            'data': self.data
-        }
-        tx_string = json.dumps(tx_data, sort_keys=True)
-        self.transaction_hash = hashlib.sha3_256(tx_string.encode()).hexdigest()
+        self.transaction_hash = hashlib.sha3_256(self._encode_body().getvalue()).hexdigest()
         return self.transaction_hash
     
-    def sign(self, private_key: bytes) -> None:
-        """Sign transaction with quantum-resistant signature"""
+    def sign(self, private_key: Union[bytes, SigningKey]) -> None:
+        """Sign transaction with a packed private key or a prepared SigningKey"""
         message = self.transaction_hash.encode()
-        self.signature = QuantumSignature.sign(message, private_key)
+        if isinstance(private_key, (bytes, bytearray)):
+            self.signature = get_backend().signature.sign(message, private_key)
+        else:
+            self.signature = private_key.sign(message)
     
     def verify_signature(self) -> bool:
         """Verify quantum-resistant signature"""
         if not self.signature or not self.public_key:
             return False
         
+        cache_key = verified_signatures.make_key(self.transaction_hash, self.signature, self.public_key)
+        if verified_signatures.contains(cache_key):
+            return True
+        
         message = self.transaction_hash.encode()
-        return QuantumSignature.verify(message, self.signature, self.public_key)
+        if not get_backend().signature.verify(message, self.signature, self.public_key):
+            return False
+        
+        verified_signatures.add(cache_key)
+        return True
+    
+    def _encode_body(self) -> Encoder:
+        """Encoder holding the hashed fields"""
+        return (Encoder()
+                .u8(self.version)
+                .text(self.sender)
+                .text(self.recipient)
+                .amount(self.amount)
+                .amount(self.fee)
+                .f64(self.timestamp)
+                .optional_text(self.data))
+    
+    def to_bytes(self) -> bytes:
+        """Canonical binary encoding: the hashed fields, then signature and public key"""
+        return self._cached('binary', lambda: self._encode_body().blob(self.signature).blob(self.public_key).getvalue())
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Transaction':
+        """Decode a transaction; its hash is recomputed from the fields"""
+        decoder = Decoder(data)
+        version = decoder.version()
+        transaction = cls(
+            sender=decoder.text(),
+            recipient=decoder.text(),
+            amount=decoder.amount(),
+            fee=decoder.amount(),
+            timestamp=decoder.f64(),
+            data=decoder.optional_text(),
+            signature=decoder.blob(),
+            public_key=decoder.blob(),
+            version=version
+        )
+        decoder.finish()
+        return transaction
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert transaction to dictionary"""
-        return asdict(self)
+        """
+        Convert transaction to a JSON-ready dictionary, with signature and
+        public key in hex. The result is cached and must not be modified.
+        """
+        return self._cached('dict', lambda: {
+            'sender': self.sender,
+            'recipient': self.recipient,
+            'amount': self.amount,
+            'fee': self.fee,
+            'timestamp': self.timestamp,
+            'data': self.data,
+            'signature': self.signature.hex() if self.signature is not None else None,
+            'public_key': self.public_key.hex() if self.public_key is not None else None,
+            'transaction_hash': self.transaction_hash,
+            'version': self.version
+        })
+    
+    def to_json(self) -> bytes:
+        """to_dict() encoded as JSON, cached like it"""
+        return self._cached('json', lambda: json.dumps(self.to_dict()).encode())
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Transaction':
+        """Create transaction from dictionary; a stated hash must match the recomputed one"""
+        data = dict(data)
+        _check_version(data, "transaction")
+        for key in ('signature', 'public_key'):
+            if isinstance(data.get(key), str):
+                data[key] = bytes.fromhex(data[key])
+        transaction_hash = data.pop('transaction_hash', None)
+        transaction = cls(**data)
+        if transaction_hash is not None and transaction_hash != transaction.transaction_hash:
+            raise ValueError("Transaction hash does not match its fields")
+        return transaction
+
+
+def _check_version(data: Dict[str, Any], what: str) -> None:
+    """Reject dictionaries from another format version; pre-versioning ones are verified by core.legacy"""
+    if 'version' not in data:
+        raise ValueError(f"Pre-versioning {what} cannot be loaded; check it with core.legacy instead")
+    if data['version'] != ENCODING_VERSION:
+        raise ValueError(f"Unsupported {what} version {data['version']!r}")
+
+
+def verify_transactions(transactions: List[Transaction]) -> List[bool]:
+    """
+    Verify transaction signatures as one batch; unsigned transactions fail
+    Signatures already in the verified-signature cache are not checked again
+    """
+    results = [False] * len(transactions)
+    items = []
+    pending = []
+    for position, tx in enumerate(transactions):
+        if not tx.signature or not tx.public_key:
+            continue
+        cache_key = verified_signatures.make_key(tx.transaction_hash, tx.signature, tx.public_key)
+        if verified_signatures.contains(cache_key):
+            results[position] = True
+        else:
+            items.append((tx.transaction_hash.encode(), tx.signature, tx.public_key))
+            pending.append((position, cache_key))
+    
+    for (position, cache_key), valid in zip(pending, get_backend().signature.verify_batch(items)):
+        results[position] = valid
+        if valid:
+            verified_signatures.add(cache_key)
+    return results
+
+
+def encode_header(fields: Dict[str, Any]) -> bytes:
+    """Binary header without the nonce, which follows it as a 64-bit integer"""
+    return (Encoder()
+            .u8(fields['version'])
+            .u64(fields['index'])
+            .f64(fields['timestamp'])
+            .hash32(fields['previous_hash'])
+            .hash32(fields['merkle_root'])
+            .u32(fields['bits'])
+            .text(fields['miner_address'])
+            .getvalue())
+
+
+def hash_header(fields: Dict[str, Any], nonce: int) -> str:
+    """Block hash of the given header fields with nonce"""
+    return hashlib.sha3_256(encode_header(fields) + nonce.to_bytes(8, 'big')).hexdigest()
+
+
+class HeaderHasher:
+    """
+    Hashes one block header for many nonces
+    Binary headers end with the nonce, so each attempt copies the SHA3 state
+    of everything before it and feeds only the nonce bytes. Produces the
+    same hashes as hash_header.
+    """
+    
+    def __init__(self, fields: Dict[str, Any]):
+        self.fields = fields
+        self._prefix = hashlib.sha3_256(encode_header(fields))
+    
+    def digest(self, nonce: int) -> bytes:
+        """Raw SHA3-256 digest of the header with nonce"""
+        state = self._prefix.copy()
+        state.update(nonce.to_bytes(8, 'big'))
+        return state.digest()
+    
+    def hexdigest(self, nonce: int) -> str:
+        """Block hash of the header with nonce"""
+        return self.digest(nonce).hex()
+
+
+@dataclass(frozen=True)
+class BlockHeader:
+    """
+    Block metadata kept in memory for every block on the chain
+    The transactions themselves stay in the block store.
+    """
+    index: int
+    timestamp: float
+    previous_hash: str
+    merkle_root: str
+    nonce: int
+    bits: int
+    miner_address: str
+    block_hash: str
+    transaction_count: int = 0
+    version: int = ENCODING_VERSION
+    
+    @property
+    def target(self) -> int:
+        return compact_to_target(self.bits)
+    
+    @property
+    def difficulty(self) -> float:
+        return work_difficulty(self.target)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert header to dictionary"""
+        return dict(asdict(self), difficulty=self.difficulty)
 
 
 @dataclass
-class Block:
+class Block(_SerializationCache):
     """
     Quantum-resistant block structure
+    The hash covers the binary header followed by the nonce. Add transactions
+    through add_transaction so cached serializations are invalidated.
     """
     index: int
     timestamp: float
     transactions: List[Transaction]
     previous_hash: str
     nonce: int = 0
-    difficulty: int = 4
+    bits: int = INITIAL_BITS  # compact proof-of-work target
     miner_address: str = ""
     block_reward: float = 10.0
     merkle_root: Optional[str] = None
     block_hash: Optional[str] = None
+    version: int = ENCODING_VERSION
+    _merkle_tree: Optional[MerkleTree] = field(default=None, init=False, repr=False, compare=False)
+    _serialized: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         if self.merkle_root is None:
@@ -83,78 +291,116 @@ class Block:
         if self.block_hash is None:
             self.calculate_hash()
     
+    @property
+    def target(self) -> int:
+        """Proof-of-work target: the hash, as an integer, must not exceed it"""
+        return compact_to_target(self.bits)
+    
+    @property
+    def difficulty(self) -> float:
+        """Expected work relative to the easiest allowed target"""
+        return work_difficulty(self.target)
+    
+    def merkle_tree(self) -> MerkleTree:
+        """
+        Merkle tree of the transaction hashes
+        The cached tree is extended when transactions were only appended and
+        rebuilt when any earlier one changed.
+        """
+        tx_hashes = [tx.transaction_hash for tx in self.transactions]
+        tree = self._merkle_tree
+        if tree is None or len(tree) > len(tx_hashes) or tree.leaves != tx_hashes[:len(tree)]:
+            tree = self._merkle_tree = MerkleTree()
+        tree.extend(tx_hashes[len(tree):])
+        return tree
+    
+    def merkle_proof(self, tx_hash: str) -> Optional[List[Dict[str, str]]]:
+        """Inclusion proof of a transaction against merkle_root, None if it is not in the block"""
+        tree = self.merkle_tree()
+        try:
+            index = tree.leaves.index(tx_hash)
+        except ValueError:
+            return None
+        return tree.proof(index)
+    
     def calculate_merkle_root(self) -> str:
         """Calculate Merkle root of transactions"""
-        if not self.transactions:
-            self.merkle_root = hashlib.sha3_256(b'').hexdigest()
-            return self.merkle_root
-        
-        # Get transaction hashes
-        tx_hashes = [tx.transaction_hash for tx in self.transactions]
-        
-        # Build Merkle tree
-        while len(tx_hashes) > 1:
-            next_level = []
-            for i in range(0, len(tx_hashes), 2):
-                left = tx_hashes[i]
-                right = tx_hashes[i + 1] if i + 1 < len(tx_hashes) else left
-                combined = left + right
-                next_level.append(hashlib.sha3_256(combined.encode()).hexdigest())
-            tx_hashes = next_level
-        
-        self.merkle_root = tx_hashes[0]
+        self.merkle_root = self.merkle_tree().root
         return self.merkle_root
     
-    def calculate_hash(self) -> str:
-        """Calculate block hash"""
-        block_data = {
+    def header_fields(self) -> Dict[str, Any]:
+        """Hashed header fields other than the nonce"""
+        return {
+            'version': self.version,
             'index': self.index,
             'timestamp': self.timestamp,
             'previous_hash': self.previous_hash,
             'merkle_root': self.merkle_root,
-            'nonce': self.nonce,
-            'difficulty': self.difficulty,
+            'bits': self.bits,
             'miner_address': self.miner_address
         }
-        block_string = json.dumps(block_data, sort_keys=True)
-        self.block_hash = hashlib.sha3_256(block_string.encode()).hexdigest()
+    
+    def header(self) -> BlockHeader:
+        """Header of this block for the in-memory chain"""
+        return BlockHeader(
+            index=self.index,
+            timestamp=self.timestamp,
+            previous_hash=self.previous_hash,
+            merkle_root=self.merkle_root,
+            nonce=self.nonce,
+            bits=self.bits,
+            miner_address=self.miner_address,
+            block_hash=self.block_hash,
+            transaction_count=len(self.transactions),
+            version=self.version
+        )
+    
+    def calculate_hash(self) -> str:
+        """Calculate block hash"""
+        self.block_hash = hash_header(self.header_fields(), self.nonce)
         return self.block_hash
     
-    def mine_block(self, difficulty: Optional[int] = None) -> None:
+    def mine_block(self, bits: Optional[int] = None) -> None:
         """Mine block using proof-of-work"""
-        if difficulty is not None:
-            self.difficulty = difficulty
+        if bits is not None:
+            self.bits = bits
         
-        target = "0" * self.difficulty
-        self.nonce = 0
+        hasher = HeaderHasher(self.header_fields())
+        target = target_bytes(self.target)
+        nonce = 0
+        while hasher.digest(nonce) > target:
+            nonce += 1
         
-        while not self.block_hash.startswith(target):
-            self.nonce += 1
-            self.calculate_hash()
+        self.nonce = nonce
+        self.calculate_hash()
     
     def is_valid(self) -> bool:
         """Validate block structure and proof-of-work"""
         # Check hash
-        calculated_hash = self.calculate_hash()
-        if calculated_hash != self.block_hash:
+        if hash_header(self.header_fields(), self.nonce) != self.block_hash:
             return False
         
         # Check proof-of-work
-        target = "0" * self.difficulty
-        if not self.block_hash.startswith(target):
+        try:
+            if int(self.block_hash, 16) > self.target:
+                return False
+        except ValueError:
             return False
         
         # Check Merkle root
-        calculated_merkle = self.calculate_merkle_root()
-        if calculated_merkle != self.merkle_root:
+        if self.merkle_tree().root != self.merkle_root:
             return False
         
-        # Validate all transactions
-        for tx in self.transactions:
-            if not tx.verify_signature():
-                return False
+        # System transactions (sender "0") are unsigned: only the genesis block
+        # may mint freely, later blocks carry at most one mining reward. Its
+        # amount is checked by the chain, which knows the configured reward.
+        system_txs = [tx for tx in self.transactions if tx.sender == "0"]
+        if self.index > 0 and len(system_txs) > 1:
+            return False
         
-        return True
+        # Validate all signed transactions as one batch
+        signed_txs = [tx for tx in self.transactions if tx.sender != "0"]
+        return all(verify_transactions(signed_txs))
     
     def add_transaction(self, transaction: Transaction) -> bool:
         """Add transaction to block"""
@@ -173,24 +419,77 @@ class Block:
         return sum(tx.amount for tx in self.transactions)
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert block to dictionary"""
+        """Convert block to a JSON-ready dictionary; cached, must not be modified"""
+        return self._cached('dict', self._build_dict)
+    
+    def to_json(self) -> bytes:
+        """to_dict() encoded as JSON, cached like it"""
+        return self._cached('json', lambda: json.dumps(self.to_dict()).encode())
+    
+    def _build_dict(self) -> Dict[str, Any]:
         return {
             'index': self.index,
             'timestamp': self.timestamp,
             'transactions': [tx.to_dict() for tx in self.transactions],
             'previous_hash': self.previous_hash,
             'nonce': self.nonce,
+            'bits': self.bits,
             'difficulty': self.difficulty,
             'miner_address': self.miner_address,
             'block_reward': self.block_reward,
             'merkle_root': self.merkle_root,
-            'block_hash': self.block_hash
+            'block_hash': self.block_hash,
+            'version': self.version
         }
     
+    def to_bytes(self) -> bytes:
+        """Canonical binary encoding: header, nonce, reward, then length-prefixed transactions"""
+        return self._cached('binary', self._encode)
+    
+    def _encode(self) -> bytes:
+        encoder = (Encoder()
+                   .raw(encode_header(self.header_fields()))
+                   .u64(self.nonce)
+                   .amount(self.block_reward)
+                   .u32(len(self.transactions)))
+        for tx in self.transactions:
+            encoder.blob(tx.to_bytes())
+        return encoder.getvalue()
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Block':
+        """Decode a block; its hash is recomputed from the header"""
+        decoder = Decoder(data)
+        version = decoder.version()
+        index = decoder.u64()
+        timestamp = decoder.f64()
+        previous_hash = decoder.hash32()
+        merkle_root = decoder.hash32()
+        bits = decoder.u32()
+        miner_address = decoder.text()
+        nonce = decoder.u64()
+        block_reward = decoder.amount()
+        transactions = [Transaction.from_bytes(decoder.blob() or b'') for _ in range(decoder.u32())]
+        decoder.finish()
+        
+        return cls(
+            index=index,
+            timestamp=timestamp,
+            transactions=transactions,
+            previous_hash=previous_hash,
+            nonce=nonce,
+            bits=bits,
+            miner_address=miner_address,
+            block_reward=block_reward,
+            merkle_root=merkle_root,
+            version=version
+        )
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Block':
         """Create block from dictionary"""
-        transactions = [Transaction(**tx_data) for tx_data in data.get('transactions', [])]
+        _check_version(data, "block")
+        transactions = [Transaction.from_dict(tx_data) for tx_data in data.get('transactions', [])]
         
         return cls(
             index=data['index'],
@@ -198,11 +497,12 @@ class Block:
             transactions=transactions,
             previous_hash=data['previous_hash'],
             nonce=data.get('nonce', 0),
-            difficulty=data.get('difficulty', 4),
+            bits=data.get('bits', INITIAL_BITS),
             miner_address=data.get('miner_address', ''),
             block_reward=data.get('block_reward', 10.0),
             merkle_root=data.get('merkle_root'),
-            block_hash=data.get('block_hash')
+            block_hash=data.get('block_hash'),
+            version=data['version']
         )
     
     @classmethod
@@ -221,8 +521,8 @@ class Block:
             index=0,
             timestamp=time.time(),
             transactions=[genesis_tx],
-            previous_hash="0",
-            difficulty=1,
+            previous_hash="0" * 64,
+            bits=GENESIS_BITS,
             miner_address="genesis",
             block_reward=0.0
         )
\ No newline at end of file
@@ -0,0 +1,206 @@
+"""
+Block body storage for QXChain
+The chain keeps only headers in memory; full blocks live in a BlockStore
+keyed by block hash and are decoded on demand, with a small cache of
+recently used blocks and a larger one of their JSON encodings. ChainView
+presents the stored bodies as the familiar list of blocks
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Dict, Iterator, List, Union
+
+from .block import Block, BlockHeader
+
+
+class BlockStore:
+    """
+    Base block store: binary-encoded bodies with LRUs of decoded blocks and JSON
+    Subclasses implement _save, _load, _contains, _delete, _hashes and _clear
+    on encoded bytes.
+    Stored blocks are immutable, so cached JSON never goes stale.
+    """
+    
+    def __init__(self, cache_size: int = 32, json_cache_size: int = 1024):
+        self.cache_size = cache_size
+        self.json_cache_size = json_cache_size
+        self._cache: 'OrderedDict[str, Block]' = OrderedDict()
+        self._json_cache: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def put(self, block: Block) -> None:
+        self._save(block.block_hash, block.to_bytes())
+        with self._lock:
+            self._remember(block)
+    
+    def get(self, block_hash: str) -> Block:
+        """Stored block with block_hash; KeyError if it is unknown"""
+        with self._lock:
+            block = self._cache.get(block_hash)
+            if block is not None:
+                self._cache.move_to_end(block_hash)
+                return block
+        block = Block.from_bytes(self._load(block_hash))
+        with self._lock:
+            self._remember(block)
+        return block
+    
+    def get_json(self, block_hash: str) -> bytes:
+        """JSON encoding of a stored block, as served by the API and to peers"""
+        with self._lock:
+            encoded = self._json_cache.get(block_hash)
+            if encoded is not None:
+                self._json_cache.move_to_end(block_hash)
+                return encoded
+        encoded = self.get(block_hash).to_json()
+        with self._lock:
+            self._json_cache[block_hash] = encoded
+            while len(self._json_cache) > self.json_cache_size:
+                self._json_cache.popitem(last=False)
+        return encoded
+    
+    def __contains__(self, block_hash: str) -> bool:
+        return self._contains(block_hash)
+    
+    def discard(self, block_hash: str) -> None:
+        """Drop one stored block if present"""
+        with self._lock:
+            self._cache.pop(block_hash, None)
+            self._json_cache.pop(block_hash, None)
+        self._delete(block_hash)
+    
+    def hashes(self) -> List[str]:
+        """Hashes of every stored block, in no particular order"""
+        return self._hashes()
+    
+    def clear(self) -> None:
+        """Drop every stored block"""
+        with self._lock:
+            self._cache.clear()
+            self._json_cache.clear()
+        self._clear()
+    
+    def _remember(self, block: Block) -> None:
+        self._cache[block.block_hash] = block
+        self._cache.move_to_end(block.block_hash)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+    
+    def _save(self, block_hash: str, data: bytes) -> None:
+        raise NotImplementedError
+    
+    def _load(self, block_hash: str) -> bytes:
+        raise NotImplementedError
+    
+    def _contains(self, block_hash: str) -> bool:
+        raise NotImplementedError
+    
+    def _delete(self, block_hash: str) -> None:
+        raise NotImplementedError
+    
+    def _hashes(self) -> List[str]:
+        raise NotImplementedError
+    
+    def _clear(self) -> None:
+        raise NotImplementedError
+
+
+class MemoryBlockStore(BlockStore):
+    """Encoded bodies in a dict: no per-transaction objects outside the cache"""
+    
+    def __init__(self, cache_size: int = 32, json_cache_size: int = 1024):
+        super().__init__(cache_size, json_cache_size)
+        self._bodies: Dict[str, bytes] = {}
+    
+    def _save(self, block_hash: str, data: bytes) -> None:
+        self._bodies[block_hash] = data
+    
+    def _load(self, block_hash: str) -> bytes:
+        return self._bodies[block_hash]
+    
+    def _contains(self, block_hash: str) -> bool:
+        return block_hash in self._bodies
+    
+    def _delete(self, block_hash: str) -> None:
+        self._bodies.pop(block_hash, None)
+    
+    def _hashes(self) -> List[str]:
+        return list(self._bodies)
+    
+    def _clear(self) -> None:
+        self._bodies.clear()
+
+
+class FileBlockStore(BlockStore):
+    """Encoded bodies as <block_hash>.blk files in one directory"""
+    
+    SUFFIX = '.blk'
+    
+    def __init__(self, directory: str, cache_size: int = 32, json_cache_size: int = 1024):
+        super().__init__(cache_size, json_cache_size)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+    
+    def _path(self, block_hash: str) -> str:
+        return os.path.join(self.directory, block_hash + self.SUFFIX)
+    
+    def _save(self, block_hash: str, data: bytes) -> None:
+        path = self._path(block_hash)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    
+    def _load(self, block_hash: str) -> bytes:
+        try:
+            with open(self._path(block_hash), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            raise KeyError(block_hash) from None
+    
+    def _contains(self, block_hash: str) -> bool:
+        return os.path.exists(self._path(block_hash))
+    
+    def _delete(self, block_hash: str) -> None:
+        try:
+            os.remove(self._path(block_hash))
+        except FileNotFoundError:
+            pass
+    
+    def _hashes(self) -> List[str]:
+        return [name[:-len(self.SUFFIX)] for name in os.listdir(self.directory) if name.endswith(self.SUFFIX)]
+    
+    def _clear(self) -> None:
+        for name in os.listdir(self.directory):
+            if name.endswith(self.SUFFIX):
+                os.remove(os.path.join(self.directory, name))
+
+
+class ChainView(Sequence):
+    """Read-only sequence of full blocks, loaded from the store as they are accessed"""
+    
+    def __init__(self, headers: List[BlockHeader], store: BlockStore):
+        self._headers = headers
+        self._store = store
+    
+    def __len__(self) -> int:
+        return len(self._headers)
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[Block, List[Block]]:
+        if isinstance(index, slice):
+            return [self._store.get(header.block_hash) for header in self._headers[index]]
+        return self._store.get(self._headers[index].block_hash)
+    
+    def __iter__(self) -> Iterator[Block]:
+        for header in list(self._headers):
+            yield self._store.get(header.block_hash)
+    
+    def block_json(self, index: int) -> bytes:
+        """Cached JSON encoding of the block at index"""
+        return self._store.get_json(self._headers[index].block_hash)
+    
+    def to_json(self) -> bytes:
+        """JSON array of all blocks, assembled from their cached encodings"""
+        return b'[' + b', '.join(self._store.get_json(header.block_hash) for header in list(self._headers)) + b']'
@@ -5,27 +5,60 @@ QXChain Quantum-Resistant Blockchain Core
 import json
 import time
 import hashlib
-from typing import List, Dict, Optional, Tuple
-from .block import Block, Transaction
-from ..crypto.kyber import Kyber1024
-from ..crypto.quantum_signatures import QuantumSignature
+import threading
+import weakref
+from typing import TYPE_CHECKING, Iterable, List, Dict, Optional, Sequence, Tuple
+from .block import Block, BlockHeader, Transaction, verify_transactions
+from .block_store import BlockStore, ChainView, MemoryBlockStore
+from .difficulty import (INITIAL_BITS, chain_work, compact_to_target, retarget, target_to_compact, target_work,
+                         work_difficulty)
+from ..crypto.backends import backend_info, get_backend
+from ..crypto.context_cache import ContextCache
+from ..crypto.quantum_signatures import SigningKey
+from .miner import ParallelMiner
+from .key_reservoir import KeypairReservoir, WalletKeys, generate_wallet_keys, generate_wallet_keys_parallel
 import base58
 
+if TYPE_CHECKING:
+    from .miner import MiningJob
+
 
 class QXBlockchain:
     """
     Main blockchain class with quantum-resistant features
     """
     
-    def __init__(self):
-        self.chain: List[Block] = []
+    # Settings every block is validated against; chains built to validate
+    # a peer's blocks must share them
+    CONSENSUS_PARAMS = ('target_block_time', 'retarget_window', 'block_reward',
+                        'median_time_span', 'max_future_block_time')
+    
+    # Most wallets create_wallets generates keys for in one call
+    MAX_WALLET_BATCH = 1000
+    
+    def __init__(self, block_store: Optional[BlockStore] = None):
+        self.headers: List[BlockHeader] = []  # the chain; bodies live in block_store
+        self.tx_index: Dict[str, str] = {}  # transaction hash -> hash of the block holding it
+        self.block_store = block_store or MemoryBlockStore()
         self.pending_transactions: List[Transaction] = []
         self.balances: Dict[str, float] = {}
         self.wallets: Dict[str, Dict] = {}  # user_id -> wallet_data
+        self.signing_keys = ContextCache(max_entries=256)  # user_id -> prepared signing key, LRU
+        self.key_reservoir = KeypairReservoir()  # started by the node; inline keygen until then
+        self._wallet_lock = threading.Lock()
+        self._chain_lock = threading.RLock()  # mining jobs connect blocks from executor threads
+        self.miner = ParallelMiner()
+        self.last_mining_stats: Optional[Dict] = None
+        self._mining_jobs: 'weakref.WeakSet[MiningJob]' = weakref.WeakSet()  # cancelled when the tip moves
         self.nodes: set = set()
-        self.difficulty = 4
+        self.bits = INITIAL_BITS  # compact target of the next block
+        self.target_block_time = 10.0
+        self.retarget_window = 10  # block intervals averaged when retargeting
+        self.median_time_span = 11  # blocks whose median timestamp a new block must exceed
+        self.max_future_block_time = 2 * 60 * 60.0  # seconds a timestamp may run ahead of the local clock
         self.block_reward = 10.0
         self.max_transactions_per_block = 100
+        self._validated: Optional[Tuple[int, str]] = None  # (index, hash) of the last block known valid
         
         # Create genesis block
         self.create_genesis_block()
@@ -33,29 +66,155 @@ class QXBlockchain:
     def create_genesis_block(self) -> None:
         """Create and add genesis block to chain"""
         genesis_block = Block.create_genesis_block()
-        genesis_block.mine_block(difficulty=1)
+        genesis_block.mine_block()
         
         # Initialize genesis balance
         genesis_address = "QX1Genesis1111111111111111111111111"
         self.balances[genesis_address] = 42000000.0
         
-        self.chain.append(genesis_block)
+        self.block_store.put(genesis_block)
+        self.headers.append(genesis_block.header())
+        self._index_transactions(genesis_block)
+    
+    @property
+    def chain(self) -> ChainView:
+        """Full blocks of the chain, loaded from the block store on access"""
+        return ChainView(self.headers, self.block_store)
+    
+    @chain.setter
+    def chain(self, blocks: Iterable[Block]) -> None:
+        """
+        Switch to another chain, e.g. on a reorganization
+        Only bodies missing from the store are written, and the new headers
+        replace the old ones in one assignment before the bodies left off the
+        chain are dropped, so a crash part-way leaves a loadable store.
+        """
+        blocks = list(blocks)
+        with self._chain_lock:
+            for block in blocks:
+                if block.block_hash not in self.block_store:
+                    self.block_store.put(block)
+            kept = {block.block_hash for block in blocks}
+            old_headers, self.headers = self.headers, [block.header() for block in blocks]
+            self._rebuild_tx_index(blocks)
+            for header in old_headers:
+                if header.block_hash not in kept:
+                    self.block_store.discard(header.block_hash)
+    
+    def set_block_store(self, block_store: BlockStore) -> None:
+        """
+        Switch to another block store without deleting anything in it
+        A store that already holds blocks, e.g. a block directory from an
+        earlier run, is loaded: its heaviest chain from a genesis block
+        replaces the in-memory chain, and ValueError is raised if that chain
+        is invalid. An empty store receives the current chain.
+        """
+        with self._chain_lock:
+            stored_hashes = block_store.hashes()
+            if not stored_hashes:
+                for block in self.chain:
+                    block_store.put(block)
+                self.block_store = block_store
+                return
+            
+            headers = self._heaviest_chain([block_store.get(block_hash).header() for block_hash in stored_hashes])
+            previous = self.block_store, self.headers, self._validated
+            self.block_store, self.headers, self._validated = block_store, headers, None
+            if not self.headers or not self.validate_chain():
+                self.block_store, self.headers, self._validated = previous
+                raise ValueError("Block store does not hold a valid chain")
+            self._rebuild_tx_index(self.chain)
+            self.recalculate_balances()
+            self.adjust_difficulty()
+            self.cancel_mining_jobs()
+    
+    def _index_transactions(self, block: Block) -> None:
+        for tx in block.transactions:
+            self.tx_index[tx.transaction_hash] = block.block_hash
+    
+    def _rebuild_tx_index(self, blocks: Iterable[Block]) -> None:
+        """Replace tx_index with the transactions of blocks; later blocks win for repeated hashes"""
+        self.tx_index = {tx.transaction_hash: block.block_hash for block in blocks for tx in block.transactions}
+    
+    @staticmethod
+    def _heaviest_chain(headers: List[BlockHeader]) -> List[BlockHeader]:
+        """Chain with the most cumulative work that can be linked from a genesis block"""
+        by_hash = {header.block_hash: header for header in headers}
+        work: Dict[str, int] = {}
+        for header in sorted(headers, key=lambda header: header.index):
+            parent = by_hash.get(header.previous_hash)
+            if header.index == 0:
+                work[header.block_hash] = target_work(header.target)
+            elif parent is not None and parent.index == header.index - 1 and parent.block_hash in work:
+                work[header.block_hash] = work[parent.block_hash] + target_work(header.target)
+        if not work:
+            return []
+        
+        chain = [by_hash[max(work, key=work.get)]]
+        while chain[-1].index > 0:
+            chain.append(by_hash[chain[-1].previous_hash])
+        return chain[::-1]
+    
+    def get_latest_header(self) -> BlockHeader:
+        """Get the header of the latest block"""
+        return self.headers[-1]
     
     def get_latest_block(self) -> Block:
         """Get the latest block in the chain"""
-        return self.chain[-1]
+        return self.block_store.get(self.headers[-1].block_hash)
     
     def create_wallet(self, user_id: str, password: Optional[str] = None) -> Dict:
         """Create a new quantum-resistant wallet"""
         if user_id in self.wallets:
             return {"error": "User ID already exists"}
         
-        # Generate quantum-resistant key pairs
-        # Kyber for key encapsulation
-        kyber_pk, kyber_sk = Kyber1024.keygen()
-        
-        # Quantum signature keys
-        sig_pk, sig_sk = QuantumSignature.keygen()
+        # Quantum-resistant key pairs (Kyber + signature), pre-generated when possible
+        keys = self.key_reservoir.take() or generate_wallet_keys()
+        with self._wallet_lock:
+            if user_id in self.wallets:
+                return {"error": "User ID already exists"}
+            return self._store_wallet(user_id, password, keys)
+    
+    def create_wallets(self, user_ids: List[str]) -> List[Dict]:
+        """
+        Create many wallets at once; all are inserted or none are
+        Keys come from the reservoir first, the rest are generated across the
+        process pool. Raises ValueError if any user ID is repeated or taken, or
+        if the batch is larger than MAX_WALLET_BATCH.
+        """
+        if len(user_ids) > self.MAX_WALLET_BATCH:
+            raise ValueError(f"At most {self.MAX_WALLET_BATCH} wallets can be created at once")
+        self._check_new_user_ids(user_ids)
+        keys = self.key_reservoir.take_many(len(user_ids))
+        keys += generate_wallet_keys_parallel(len(user_ids) - len(keys))
+        
+        with self._wallet_lock:
+            # Re-check under the lock in case a wallet was created meanwhile;
+            # the keys were never handed out, so they go back to the reservoir
+            try:
+                self._check_new_user_ids(user_ids)
+            except ValueError:
+                self.key_reservoir.give_back(keys)
+                raise
+            return [self._store_wallet(user_id, None, wallet_keys) for user_id, wallet_keys in zip(user_ids, keys)]
+    
+    def _check_new_user_ids(self, user_ids: List[str]) -> None:
+        """Reject a wallet batch with repeated or existing user IDs"""
+        seen = set()
+        duplicates = [user_id for user_id in user_ids if user_id in seen or seen.add(user_id)]
+        existing = [user_id for user_id in seen if user_id in self.wallets]
+        problems = []
+        if duplicates:
+            problems.append(f"repeated in batch: {', '.join(sorted(set(duplicates)))}")
+        if existing:
+            problems.append(f"already exist: {', '.join(sorted(existing))}")
+        if problems:
+            raise ValueError("User IDs " + "; ".join(problems))
+    
+    def _store_wallet(self, user_id: str, password: Optional[str], keys: WalletKeys) -> Dict:
+        """Record a wallet built from generated key pairs and return its public view"""
+        kyber_pk, kyber_sk = keys.kyber_public_key, keys.kyber_private_key
+        sig_pk, sig_sk = keys.signature_public_key, keys.signature_private_key
         
         # Generate address from public keys
         combined_pk = kyber_pk + sig_pk
@@ -94,6 +253,17 @@ class QXBlockchain:
         """Get wallet information"""
         return self.wallets.get(user_id)
     
+    def get_signing_key(self, user_id: str) -> Optional[SigningKey]:
+        """Get the prepared signing key for a wallet, loading it on first use"""
+        signing_key = self.signing_keys.get(user_id)
+        if signing_key is None:
+            wallet = self.get_wallet(user_id)
+            if not wallet:
+                return None
+            signing_key = get_backend().signature.load_signing_key(bytes.fromhex(wallet['signature_private_key']))
+            self.signing_keys.put(user_id, signing_key)
+        return signing_key
+    
     def get_balance(self, address: str) -> float:
         """Get balance for an address"""
         return self.balances.get(address, 0.0)
@@ -121,12 +291,12 @@ class QXBlockchain:
             data=data
         )
         
-        # Sign transaction
-        private_key = bytes.fromhex(wallet['signature_private_key'])
-        public_key = bytes.fromhex(wallet['signature_public_key'])
+        # Sign transaction; the public key comes from the wallet, since not every
+        # backend can derive it from the private key
+        signing_key = self.get_signing_key(sender_user_id)
         
-        transaction.public_key = public_key
-        transaction.sign(private_key)
+        transaction.public_key = bytes.fromhex(wallet['signature_public_key'])
+        transaction.sign(signing_key)
         
         return transaction
     
@@ -135,110 +305,227 @@ class QXBlockchain:
         if not transaction.verify_signature():
             return False
         
-        # Check if sender has sufficient balance
-        sender_balance = self.get_balance(transaction.sender)
-        if sender_balance < transaction.amount + transaction.fee:
-            return False
-        
-        self.pending_transactions.append(transaction)
-        return True
+        return self._admit_pending(transaction)
     
-    def mine_pending_transactions(self, miner_address: str) -> Block:
-        """Mine a new block with pending transactions"""
-        # Select transactions for the block
-        transactions_to_mine = self.pending_transactions[:self.max_transactions_per_block]
-        
-        # Add mining reward transaction
-        reward_tx = Transaction(
-            sender="0",  # System
-            recipient=miner_address,
-            amount=self.block_reward,
-            fee=0.0,
-            timestamp=time.time(),
-            data="Mining reward"
-        )
-        transactions_to_mine.append(reward_tx)
-        
-        # Create new block
-        new_block = Block(
-            index=len(self.chain),
-            timestamp=time.time(),
-            transactions=transactions_to_mine,
-            previous_hash=self.get_latest_block().block_hash,
-            difficulty=self.difficulty,
-            miner_address=miner_address,
-            block_reward=self.block_reward
-        )
-        
-        # Mine the block
-        new_block.mine_block()
-        
-        # Update balances
-        for tx in transactions_to_mine:
-            if tx.sender != "0":  # Not a reward transaction
-                self.balances[tx.sender] -= (tx.amount + tx.fee)
-            self.balances[tx.recipient] = self.balances.get(tx.recipient, 0) + tx.amount
+    def add_transactions(self, transactions: List[Transaction]) -> List[bool]:
+        """Add several transactions to the pending pool, verifying signatures as one batch"""
+        return [
+            valid and self._admit_pending(transaction)
+            for transaction, valid in zip(transactions, verify_transactions(transactions))
+        ]
+    
+    def _admit_pending(self, transaction: Transaction) -> bool:
+        """Append a signature-checked transaction if the sender can afford it"""
+        with self._chain_lock:
+            # Check if sender has sufficient balance
+            sender_balance = self.get_balance(transaction.sender)
+            if sender_balance < transaction.amount + transaction.fee:
+                return False
             
-            # Add fees to miner
-            if tx.fee > 0:
-                self.balances[miner_address] = self.balances.get(miner_address, 0) + tx.fee
-        
-        # Add block to chain
-        self.chain.append(new_block)
-        
-        # Remove mined transactions from pending
-        self.pending_transactions = self.pending_transactions[len(transactions_to_mine)-1:]
-        
-        # Adjust difficulty
-        self.adjust_difficulty()
-        
-        return new_block
+            self.pending_transactions.append(transaction)
+            return True
     
-    def adjust_difficulty(self) -> None:
-        """Adjust mining difficulty based on block time"""
-        if len(self.chain) < 2:
-            return
-        
-        # Target block time: 10 seconds
-        target_time = 10.0
-        
-        # Look at last 10 blocks
-        recent_blocks = self.chain[-10:] if len(self.chain) >= 10 else self.chain[1:]
-        
+    def create_block_template(self, miner_address: str) -> Block:
+        """Build an unmined block with pending transactions and the mining reward on the current tip"""
+        with self._chain_lock:
+            # Select transactions for the block
+            transactions_to_mine = self.pending_transactions[:self.max_transactions_per_block]
+            
+            # Add mining reward transaction
+            reward_tx = Transaction(
+                sender="0",  # System
+                recipient=miner_address,
+                amount=self.block_reward,
+                fee=0.0,
+                timestamp=time.time(),
+                data="Mining reward"
+            )
+            transactions_to_mine.append(reward_tx)
+            
+            return Block(
+                index=len(self.headers),
+                timestamp=time.time(),
+                transactions=transactions_to_mine,
+                previous_hash=self.get_latest_header().block_hash,
+                bits=self.bits,
+                miner_address=miner_address,
+                block_reward=self.block_reward
+            )
+    
+    def register_mining_job(self, job: 'MiningJob') -> None:
+        """Track a mining job so it is cancelled once its template goes stale"""
+        with self._chain_lock:
+            self._mining_jobs.add(job)
+    
+    def cancel_mining_jobs(self, height: Optional[int] = None) -> None:
+        """Cancel active mining jobs for blocks at or below height, or all of them"""
+        with self._chain_lock:
+            jobs = list(self._mining_jobs)
+        for job in jobs:
+            if height is None or job.height <= height:
+                job.cancel()
+    
+    def mine_pending_transactions(self, miner_address: str,
+                                  cancel: Optional[threading.Event] = None) -> Optional[Block]:
+        """
+        Mine a new block with pending transactions
+        Returns None if cancel was set, or if another block claimed the same
+        height while mining.
+        """
+        new_block = self.create_block_template(miner_address)
+        
+        # Mine the block across all cores
+        result = self.miner.mine(new_block, cancel=cancel)
+        self.last_mining_stats = result.to_dict()
+        if not result.found:
+            return None
+        
+        return new_block if self.add_block(new_block) else None
+    
+    def add_block(self, block: Block) -> bool:
+        """
+        Append a mined block that extends the current tip and apply its transactions
+        Proof-of-work and signatures are the caller's responsibility
+        """
+        with self._chain_lock:
+            latest_block = self.get_latest_header()
+            if block.previous_hash != latest_block.block_hash or block.index != latest_block.index + 1:
+                return False
+            if block.bits != self.bits:
+                return False
+            if not self._valid_timestamp(block, self.headers):
+                return False
+            if not self._valid_reward(block):
+                return False
+            
+            # Update balances
+            for tx in block.transactions:
+                if tx.sender != "0":  # Not a reward transaction
+                    self.balances[tx.sender] -= (tx.amount + tx.fee)
+                self.balances[tx.recipient] = self.balances.get(tx.recipient, 0) + tx.amount
+                
+                # Add fees to miner
+                if tx.fee > 0:
+                    self.balances[block.miner_address] = self.balances.get(block.miner_address, 0) + tx.fee
+            
+            # Add block to chain
+            self.block_store.put(block)
+            self.headers.append(block.header())
+            self._index_transactions(block)
+            self.cancel_mining_jobs(block.index)
+            
+            # Remove mined transactions from pending
+            mined_hashes = {tx.transaction_hash for tx in block.transactions}
+            self.pending_transactions = [
+                tx for tx in self.pending_transactions
+                if tx.transaction_hash not in mined_hashes
+            ]
+            
+            # Adjust difficulty
+            self.adjust_difficulty()
+            return True
+    
+    def next_bits(self, chain: Sequence[BlockHeader]) -> int:
+        """
+        Compact target for the block following chain (headers or blocks)
+        Retargets proportionally over the last retarget_window block intervals,
+        leaving out the genesis block whose timestamp predates mining.
+        """
+        recent_blocks = chain[1:][-(self.retarget_window + 1):]
         if len(recent_blocks) < 2:
-            return
-        
-        time_taken = recent_blocks[-1].timestamp - recent_blocks[0].timestamp
-        average_time = time_taken / (len(recent_blocks) - 1)
+            return INITIAL_BITS
         
-        if average_time < target_time * 0.5:
-            self.difficulty += 1
-        elif average_time > target_time * 2:
-            self.difficulty = max(1, self.difficulty - 1)
+        new_target = retarget([block.target for block in recent_blocks],
+                              [block.timestamp for block in recent_blocks],
+                              self.target_block_time)
+        return target_to_compact(new_target)
+    
+    def adjust_difficulty(self) -> None:
+        """Retarget the next block from recent block times"""
+        self.bits = self.next_bits(self.headers)
+    
+    def _consensus_params(self) -> Dict[str, float]:
+        """Current values of CONSENSUS_PARAMS"""
+        return {name: getattr(self, name) for name in self.CONSENSUS_PARAMS}
+    
+    def median_time_past(self, chain: Sequence[BlockHeader]) -> float:
+        """Median timestamp of the last median_time_span blocks of chain"""
+        timestamps = sorted(block.timestamp for block in chain[-self.median_time_span:])
+        return timestamps[len(timestamps) // 2]
+    
+    def _valid_timestamp(self, block: Block, chain: Sequence[BlockHeader]) -> bool:
+        """
+        Check the timestamp of a block extending chain
+        It must be later than the median time past, so miners cannot walk
+        timestamps (and with them the retargeted difficulty) backwards, and at
+        most max_future_block_time ahead of the local clock.
+        """
+        return self.median_time_past(chain) < block.timestamp <= time.time() + self.max_future_block_time
+    
+    def total_work(self) -> int:
+        """Cumulative proof-of-work of the chain"""
+        return chain_work(header.target for header in self.headers)
+    
+    def _valid_reward(self, block: Block) -> bool:
+        """
+        Check that a block mints at most the chain's configured block_reward
+        The block's own block_reward field is not hashed and is ignored.
+        Transaction fees are paid to the miner by add_block, not minted, so
+        the reward transaction may not include them, and it pays no fee itself.
+        """
+        system_txs = [tx for tx in block.transactions if tx.sender == "0"]
+        return (sum(tx.amount for tx in system_txs) <= self.block_reward
+                and all(tx.fee == 0 for tx in system_txs))
     
     def validate_chain(self) -> bool:
-        """Validate the entire blockchain"""
-        for i in range(1, len(self.chain)):
-            current_block = self.chain[i]
-            previous_block = self.chain[i - 1]
+        """
+        Validate the entire blockchain
+        Blocks up to the last one found valid are not checked again while it
+        is still on the chain, so repeated calls only load new block bodies.
+        """
+        headers = self.headers[:]
+        start = 1
+        if self._validated is not None:
+            index, block_hash = self._validated
+            if index < len(headers) and headers[index].block_hash == block_hash:
+                start = index + 1
+        
+        for i in range(start, len(headers)):
+            current_block = self.block_store.get(headers[i].block_hash)
+            previous_block = headers[i - 1]
             
             # Validate current block
             if not current_block.is_valid():
                 return False
             
+            # Check the timestamp against the median time past and the local clock
+            if not self._valid_timestamp(current_block, headers[max(0, i - self.median_time_span):i]):
+                return False
+            
+            # Check the mining reward against the chain's configuration
+            if not self._valid_reward(current_block):
+                return False
+            
+            # Check the block was mined against the retargeted difficulty
+            if current_block.bits != self.next_bits(headers[:i]):
+                return False
+            
             # Check if current block points to previous block
             if current_block.previous_hash != previous_block.block_hash:
                 return False
         
+        self._validated = (len(headers) - 1, headers[-1].block_hash)
         return True
     
     def replace_chain(self, new_chain: List[Block]) -> bool:
-        """Replace chain if new chain is longer and valid"""
-        if len(new_chain) <= len(self.chain):
+        """Replace chain if new chain has more cumulative work and is valid"""
+        if chain_work(block.target for block in new_chain) <= self.total_work():
             return False
         
         # Validate new chain
         temp_blockchain = QXBlockchain()
+        for name, value in self._consensus_params().items():
+            setattr(temp_blockchain, name, value)
         temp_blockchain.chain = new_chain
         
         if not temp_blockchain.validate_chain():
@@ -247,6 +534,8 @@ class QXBlockchain:
         # Replace chain and recalculate balances
         self.chain = new_chain
         self.recalculate_balances()
+        self.adjust_difficulty()
+        self.cancel_mining_jobs()
         return True
     
     def recalculate_balances(self) -> None:
@@ -275,30 +564,39 @@ class QXBlockchain:
         
         return transactions
     
+    def find_transaction_block(self, tx_hash: str) -> Optional[Block]:
+        """Block containing the transaction with tx_hash, None if it is not on the chain"""
+        block_hash = self.tx_index.get(tx_hash)
+        return self.block_store.get(block_hash) if block_hash is not None else None
+    
     def get_chain_stats(self) -> Dict:
         """Get blockchain statistics"""
-        total_transactions = sum(len(block.transactions) for block in self.chain)
+        total_transactions = sum(header.transaction_count for header in self.headers)
         total_supply = sum(self.balances.values())
         
         return {
-            'total_blocks': len(self.chain),
+            'total_blocks': len(self.headers),
             'total_transactions': total_transactions,
             'total_supply': total_supply,
-            'current_difficulty': self.difficulty,
+            'current_difficulty': round(work_difficulty(compact_to_target(self.bits)), 2),
+            'current_bits': self.bits,
+            'current_target': f"{compact_to_target(self.bits):064x}",
             'pending_transactions': len(self.pending_transactions),
-            'latest_block_hash': self.get_latest_block().block_hash,
-            'chain_valid': self.validate_chain()
+            'latest_block_hash': self.get_latest_header().block_hash,
+            'chain_valid': self.validate_chain(),
+            'crypto_backend': backend_info(),
+            'key_reservoir': self.key_reservoir.stats(),
+            'last_mining': self.last_mining_stats
         }
     
     def export_chain(self) -> str:
-        """Export blockchain to JSON"""
+        """Export blockchain to JSON, reusing each block's cached encoding"""
         chain_data = {
-            'chain': [block.to_dict() for block in self.chain],
             'balances': self.balances,
-            'difficulty': self.difficulty,
+            'bits': self.bits,
             'block_reward': self.block_reward
         }
-        return json.dumps(chain_data, indent=2)
+        return '{"chain": ' + self.chain.to_json().decode() + ', ' + json.dumps(chain_data)[1:]
     
     def import_chain(self, chain_json: str) -> bool:
         """Import blockchain from JSON"""
@@ -310,7 +608,6 @@ class QXBlockchain:
             
             # Validate and replace
             if self.replace_chain(new_chain):
-                self.difficulty = data.get('difficulty', 4)
                 self.block_reward = data.get('block_reward', 10.0)
                 return True
             
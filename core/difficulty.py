@@ -0,0 +1,87 @@
+"""
+Proof-of-work targets for QXChain
+A block is valid when its SHA3-256 hash, read as a 256-bit big-endian
+integer, is at most the target. Headers carry the target in 32-bit compact
+form (one exponent byte, three mantissa bytes), and the target is retargeted
+proportionally to the observed block times over a sliding window.
+"""
+
+from typing import Iterable, Sequence
+
+# Easiest allowed target: one leading zero hex digit
+MAX_TARGET = (1 << 252) - 1
+
+
+def compact_to_target(bits: int) -> int:
+    """Expand a compact target: mantissa * 256^(exponent - 3)"""
+    exponent = bits >> 24
+    mantissa = bits & 0x7FFFFF
+    if bits & 0x800000:
+        raise ValueError("Negative compact target")
+    if exponent <= 3:
+        return mantissa >> (8 * (3 - exponent))
+    return mantissa << (8 * (exponent - 3))
+
+
+def target_to_compact(target: int) -> int:
+    """Encode a target in compact form, truncating it to a 23-bit mantissa"""
+    if target <= 0:
+        return 0
+    size = (target.bit_length() + 7) // 8
+    if size <= 3:
+        mantissa = target << (8 * (3 - size))
+    else:
+        mantissa = target >> (8 * (size - 3))
+    if mantissa & 0x800000:  # keep the sign bit clear
+        mantissa >>= 8
+        size += 1
+    return (size << 24) | mantissa
+
+
+def leading_zeros_target(zeros: int) -> int:
+    """Target equivalent to requiring `zeros` leading hex zeros in the hash"""
+    return min(MAX_TARGET, (1 << (256 - 4 * zeros)) - 1)
+
+
+def target_bytes(target: int) -> bytes:
+    """Target as 32 big-endian bytes, comparable directly with raw digests"""
+    return min(target, (1 << 256) - 1).to_bytes(32, 'big')
+
+
+def work_difficulty(target: int) -> float:
+    """Expected work relative to MAX_TARGET (1.0 is the easiest allowed target)"""
+    return MAX_TARGET / max(target, 1)
+
+
+def target_work(target: int) -> int:
+    """Expected number of hashes to find a block at target: 2^256 / (target + 1)"""
+    return (1 << 256) // (target + 1)
+
+
+def chain_work(targets: Iterable[int]) -> int:
+    """Cumulative work of a chain of blocks with these targets; forks are chosen by it"""
+    return sum(target_work(target) for target in targets)
+
+
+def retarget(targets: Sequence[int], timestamps: Sequence[float], block_time: float,
+             max_adjustment: float = 4.0) -> int:
+    """
+    Next target from a window of consecutive blocks
+    targets and timestamps belong to the same blocks, oldest first. The
+    average target of the blocks after the first is scaled by
+    actual / expected timespan, clamped to a factor of max_adjustment either way.
+    """
+    intervals = len(timestamps) - 1
+    if intervals < 1:
+        raise ValueError("Retargeting needs at least two blocks")
+    expected = block_time * intervals
+    actual = min(max(timestamps[-1] - timestamps[0], expected / max_adjustment), expected * max_adjustment)
+    average = sum(targets[1:]) // intervals
+    # Scale in integer arithmetic; timespans are resolved to the millisecond
+    new_target = average * int(actual * 1000) // int(expected * 1000)
+    return max(1, min(MAX_TARGET, new_target))
+
+
+# Target of the genesis block and of the first blocks before retargeting has data
+GENESIS_BITS = target_to_compact(MAX_TARGET)
+INITIAL_BITS = target_to_compact(leading_zeros_target(4))
@@ -0,0 +1,161 @@
+"""
+Canonical binary encoding for QXChain transactions and blocks
+All integers are big-endian, timestamps are IEEE 754 doubles, amounts are
+signed 64-bit counts of base units, hashes are 32 raw bytes, and strings
+and byte buffers carry a length prefix. The first byte of every encoding is
+its format version.
+Chains exported before this format cannot be loaded, since their signatures
+predate the current scheme; core.legacy still verifies their JSON hashes
+"""
+
+import struct
+from typing import Optional
+
+ENCODING_VERSION = 1
+
+# Base units per coin; amounts are encoded as integers of these
+UNITS_PER_COIN = 10 ** 8
+
+_U8 = struct.Struct('>B')
+_U16 = struct.Struct('>H')
+_U32 = struct.Struct('>I')
+_U64 = struct.Struct('>Q')
+_I64 = struct.Struct('>q')
+_F64 = struct.Struct('>d')
+
+
+def amount_to_units(amount: float) -> int:
+    """Amount in base units; ValueError unless it is a whole number of them"""
+    units = round(amount * UNITS_PER_COIN)
+    if units_to_amount(units) != amount:
+        raise ValueError(f"Amount {amount!r} is not a whole number of base units")
+    return units
+
+
+def units_to_amount(units: int) -> float:
+    return units / UNITS_PER_COIN
+
+
+class Encoder:
+    """Appends fixed-layout fields to one growing buffer"""
+    
+    def __init__(self):
+        self.buffer = bytearray()
+    
+    def raw(self, value: bytes) -> 'Encoder':
+        """Bytes already in encoded form"""
+        self.buffer += value
+        return self
+    
+    def u8(self, value: int) -> 'Encoder':
+        self.buffer += _U8.pack(value)
+        return self
+    
+    def u32(self, value: int) -> 'Encoder':
+        self.buffer += _U32.pack(value)
+        return self
+    
+    def u64(self, value: int) -> 'Encoder':
+        self.buffer += _U64.pack(value)
+        return self
+    
+    def amount(self, value: float) -> 'Encoder':
+        self.buffer += _I64.pack(amount_to_units(value))
+        return self
+    
+    def f64(self, value: float) -> 'Encoder':
+        self.buffer += _F64.pack(value)
+        return self
+    
+    def hash32(self, value: str) -> 'Encoder':
+        """Hex digest as 32 raw bytes"""
+        raw = bytes.fromhex(value)
+        if len(raw) != 32:
+            raise ValueError(f"Expected a 32-byte hex digest, got {len(raw)} bytes")
+        self.buffer += raw
+        return self
+    
+    def text(self, value: str) -> 'Encoder':
+        """UTF-8 string with a 16-bit length prefix"""
+        raw = value.encode()
+        if len(raw) > 0xFFFF:
+            raise ValueError(f"String of {len(raw)} bytes exceeds the 65535-byte limit")
+        self.buffer += _U16.pack(len(raw)) + raw
+        return self
+    
+    def blob(self, value: Optional[bytes]) -> 'Encoder':
+        """Byte buffer with a 32-bit length prefix; None encodes as empty"""
+        raw = value or b''
+        self.buffer += _U32.pack(len(raw)) + raw
+        return self
+    
+    def optional_text(self, value: Optional[str]) -> 'Encoder':
+        """Presence flag followed by a 32-bit length-prefixed UTF-8 string"""
+        if value is None:
+            return self.u8(0)
+        return self.u8(1).blob(value.encode())
+    
+    def getvalue(self) -> bytes:
+        return bytes(self.buffer)
+
+
+class Decoder:
+    """Reads fields written by Encoder; truncated input raises ValueError"""
+    
+    def __init__(self, data: bytes, offset: int = 0):
+        self.data = memoryview(data)
+        self.offset = offset
+    
+    def _take(self, size: int) -> memoryview:
+        end = self.offset + size
+        if end > len(self.data):
+            raise ValueError("Truncated encoding")
+        chunk = self.data[self.offset:end]
+        self.offset = end
+        return chunk
+    
+    def _unpack(self, layout: struct.Struct):
+        value, = layout.unpack_from(self._take(layout.size))
+        return value
+    
+    def u8(self) -> int:
+        return self._unpack(_U8)
+    
+    def u32(self) -> int:
+        return self._unpack(_U32)
+    
+    def u64(self) -> int:
+        return self._unpack(_U64)
+    
+    def amount(self) -> float:
+        return units_to_amount(self._unpack(_I64))
+    
+    def f64(self) -> float:
+        return self._unpack(_F64)
+    
+    def hash32(self) -> str:
+        return self._take(32).hex()
+    
+    def text(self) -> str:
+        return str(self._take(self._unpack(_U16)), 'utf-8')
+    
+    def blob(self) -> Optional[bytes]:
+        raw = bytes(self._take(self._unpack(_U32)))
+        return raw or None
+    
+    def optional_text(self) -> Optional[str]:
+        if not self.u8():
+            return None
+        return str(self._take(self._unpack(_U32)), 'utf-8')
+    
+    def version(self) -> int:
+        """Read the leading version byte, rejecting formats this node cannot decode"""
+        version = self.u8()
+        if version != ENCODING_VERSION:
+            raise ValueError(f"Unsupported encoding version {version}")
+        return version
+    
+    def finish(self) -> None:
+        """Reject trailing bytes after the last field"""
+        if self.offset != len(self.data):
+            raise ValueError("Trailing bytes after encoding")
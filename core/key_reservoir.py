@@ -0,0 +1,199 @@
+"""
+Pre-generated wallet key reservoir for QXChain
+A background thread keeps a buffer of fresh Kyber and signature key pairs
+filled from the shared process pool, so wallet creation only pops a ready
+entry instead of running two lattice keygens on the request path
+"""
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+from ..crypto.backends import get_backend, load_backend
+from ..crypto.process_pool import get_process_pool, reset_process_pool
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class WalletKeys:
+    """Key pairs for one wallet, tagged with the backend that produced them"""
+    backend: str
+    kyber_public_key: bytes
+    kyber_private_key: bytes
+    signature_public_key: bytes
+    signature_private_key: bytes
+
+
+def generate_wallet_keys(backend_name: Optional[str] = None) -> WalletKeys:
+    """Generate one wallet's key pairs with the active backend, or the named one in worker processes"""
+    backend = load_backend(backend_name) if backend_name else get_backend()
+    kyber_pk, kyber_sk = backend.kem.keygen()
+    sig_pk, sig_sk = backend.signature.keygen()
+    return WalletKeys(backend.name, kyber_pk, kyber_sk, sig_pk, sig_sk)
+
+
+def generate_wallet_keys_batch(backend_name: str, count: int) -> List[WalletKeys]:
+    """Process-pool task: generate count wallets' key pairs"""
+    return [generate_wallet_keys(backend_name) for _ in range(count)]
+
+
+def generate_wallet_keys_parallel(count: int, batch_size: int = 8) -> List[WalletKeys]:
+    """Generate count wallets' key pairs across the shared process pool, inline without one"""
+    backend_name = get_backend().name
+    pool = get_process_pool()
+    if pool is None or count <= batch_size:
+        return generate_wallet_keys_batch(backend_name, count)
+    counts = [min(batch_size, count - start) for start in range(0, count, batch_size)]
+    try:
+        results = pool.map(generate_wallet_keys_batch, [backend_name] * len(counts), counts)
+        return [keys for batch in results for keys in batch]
+    except BrokenProcessPool:
+        reset_process_pool()
+        return generate_wallet_keys_batch(backend_name, count)
+
+
+class KeypairReservoir:
+    """
+    Bounded buffer of ready wallet key pairs with low/high watermarks
+    Refilling starts when the depth drops below low_watermark and tops the
+    buffer up to high_watermark. Entries from a backend other than the
+    active one are discarded on take().
+    """
+    
+    def __init__(self, low_watermark: int = 16, high_watermark: int = 64, batch_size: int = 4):
+        if not 0 <= low_watermark <= high_watermark:
+            raise ValueError("Watermarks must satisfy 0 <= low_watermark <= high_watermark")
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self.batch_size = max(1, batch_size)
+        self._keys: Deque[WalletKeys] = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.served = 0
+        self.misses = 0
+        self.generated = 0
+        self.discarded = 0
+        self.returned = 0
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    @property
+    def depth(self) -> int:
+        return len(self._keys)
+    
+    def start(self) -> None:
+        """Start the background filler; it immediately fills to the high watermark"""
+        if self.running:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._fill_loop, name="keypair-reservoir", daemon=True)
+        self._thread.start()
+        self._wakeup.set()
+    
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background filler; buffered keys stay available"""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def take(self) -> Optional[WalletKeys]:
+        """Pop a ready key set for the active backend, or None when the reservoir is empty"""
+        backend_name = get_backend().name
+        keys = None
+        with self._lock:
+            while self._keys:
+                candidate = self._keys.popleft()
+                if candidate.backend == backend_name:
+                    keys = candidate
+                    break
+                self.discarded += 1
+            if keys is None:
+                self.misses += 1
+            else:
+                self.served += 1
+            low = len(self._keys) < self.low_watermark
+        if low:
+            self._wakeup.set()
+        return keys
+    
+    def take_many(self, count: int) -> List[WalletKeys]:
+        """Pop up to count ready key sets for the active backend without waiting"""
+        taken = []
+        while len(taken) < count:
+            keys = self.take()
+            if keys is None:
+                break
+            taken.append(keys)
+        return taken
+    
+    def give_back(self, keys: List[WalletKeys]) -> None:
+        """Return key sets that were taken but never used, e.g. by a rejected wallet batch"""
+        with self._lock:
+            room = max(0, self.high_watermark - len(self._keys))
+            self._keys.extendleft(reversed(keys[:room]))
+            self.returned += min(room, len(keys))
+            self.discarded += max(0, len(keys) - room)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Reservoir depth, watermarks and counters"""
+        with self._lock:
+            return {
+                'depth': len(self._keys),
+                'low_watermark': self.low_watermark,
+                'high_watermark': self.high_watermark,
+                'running': self.running,
+                'served': self.served,
+                'misses': self.misses,
+                'generated': self.generated,
+                'discarded': self.discarded,
+                'returned': self.returned
+            }
+    
+    def _fill_loop(self) -> None:
+        """Sleep until woken below the low watermark, then top up to the high watermark"""
+        while not self._stopping.is_set():
+            self._wakeup.wait()
+            self._wakeup.clear()
+            while not self._stopping.is_set() and self.depth < self.high_watermark:
+                try:
+                    self._refill(self.high_watermark - self.depth)
+                except Exception as e:
+                    logger.error(f"Keypair reservoir refill failed: {e}")
+                    self._stopping.wait(1.0)
+    
+    def _refill(self, needed: int) -> None:
+        """Generate up to needed key sets, in the process pool when one is available"""
+        backend_name = get_backend().name
+        pool = get_process_pool()
+        if pool is None:
+            self._store(generate_wallet_keys_batch(backend_name, min(needed, self.batch_size)))
+            return
+        
+        counts = [self.batch_size] * (needed // self.batch_size)
+        if needed % self.batch_size:
+            counts.append(needed % self.batch_size)
+        try:
+            futures = [pool.submit(generate_wallet_keys_batch, backend_name, count) for count in counts]
+            for future in as_completed(futures):
+                self._store(future.result())
+        except BrokenProcessPool:
+            reset_process_pool()
+            self._store(generate_wallet_keys_batch(backend_name, min(needed, self.batch_size)))
+    
+    def _store(self, keys: List[WalletKeys]) -> None:
+        with self._lock:
+            room = max(0, self.high_watermark - len(self._keys))
+            self._keys.extend(keys[:room])
+            self.generated += len(keys)
+            self.discarded += max(0, len(keys) - room)
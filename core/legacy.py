@@ -0,0 +1,72 @@
+"""
+Verification of blocks exported before the versioned binary encoding
+Those blocks carry no version field. Their hashes cover sorted-key JSON,
+with a leading-zeros `difficulty` where headers now have a compact target,
+and their signatures predate the current scheme, so they cannot join a
+current chain. Their hashes, proof-of-work, Merkle roots and links can
+still be checked from the exported dictionaries
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List
+
+from .merkle import MerkleTree
+
+
+def is_legacy(data: Dict[str, Any]) -> bool:
+    """True for block and transaction dictionaries without a format version"""
+    return 'version' not in data
+
+
+def legacy_transaction_hash(tx: Dict[str, Any]) -> str:
+    """Hash of a pre-versioning transaction: SHA3-256 of its sorted-key JSON fields"""
+    tx_data = {key: tx.get(key) for key in ('sender', 'recipient', 'amount', 'fee', 'timestamp', 'data')}
+    return hashlib.sha3_256(json.dumps(tx_data, sort_keys=True).encode()).hexdigest()
+
+
+def legacy_block_hash(block: Dict[str, Any]) -> str:
+    """Hash of a pre-versioning block header, difficulty included"""
+    block_data = {
+        'index': block['index'],
+        'timestamp': block['timestamp'],
+        'previous_hash': block['previous_hash'],
+        'merkle_root': block['merkle_root'],
+        'nonce': block['nonce'],
+        'difficulty': block['difficulty'],
+        'miner_address': block['miner_address']
+    }
+    return hashlib.sha3_256(json.dumps(block_data, sort_keys=True).encode()).hexdigest()
+
+
+def verify_legacy_block(block: Dict[str, Any]) -> bool:
+    """
+    Check a pre-versioning block's transaction hashes, Merkle root, header
+    hash and leading-zeros proof-of-work; signatures are not checked
+    """
+    try:
+        if not is_legacy(block):
+            return False
+        tx_hashes = []
+        for tx in block['transactions']:
+            tx_hash = legacy_transaction_hash(tx)
+            if tx.get('transaction_hash') != tx_hash:
+                return False
+            tx_hashes.append(tx_hash)
+        if MerkleTree(tx_hashes).root != block['merkle_root']:
+            return False
+        block_hash = legacy_block_hash(block)
+        return block_hash == block['block_hash'] and block_hash.startswith('0' * block['difficulty'])
+    except (KeyError, TypeError):
+        return False
+
+
+def verify_legacy_chain(blocks: List[Dict[str, Any]]) -> bool:
+    """Check every block of a pre-versioning export and the links between them"""
+    for position, block in enumerate(blocks):
+        if not verify_legacy_block(block):
+            return False
+        if position > 0 and (block['index'] != blocks[position - 1]['index'] + 1
+                             or block['previous_hash'] != blocks[position - 1]['block_hash']):
+            return False
+    return True
@@ -0,0 +1,101 @@
+"""
+Incremental Merkle tree for QXChain blocks
+Leaves are transaction hashes; a parent is SHA3-256 of the concatenated
+hex digests of its children, and an odd node at the end of a level is
+paired with itself. Every level is kept, so appending a leaf only rehashes
+the right-most path and inclusion proofs are read straight from the levels
+"""
+
+import hashlib
+from typing import Dict, Iterable, List
+
+EMPTY_ROOT = hashlib.sha3_256(b'').hexdigest()
+
+
+def hash_pair(left: str, right: str) -> str:
+    """Parent hash of two child hashes"""
+    return hashlib.sha3_256((left + right).encode()).hexdigest()
+
+
+class MerkleTree:
+    """
+    Merkle accumulator with cached levels
+    levels[0] holds the leaves and levels[-1] the root; append() updates
+    one node per level.
+    """
+    
+    def __init__(self, leaves: Iterable[str] = ()):
+        self.levels: List[List[str]] = [[]]
+        self.extend(leaves)
+    
+    def __len__(self) -> int:
+        return len(self.levels[0])
+    
+    @property
+    def leaves(self) -> List[str]:
+        return self.levels[0]
+    
+    @property
+    def root(self) -> str:
+        """Merkle root, or the hash of empty input for an empty tree"""
+        if not self.levels[0]:
+            return EMPTY_ROOT
+        return self.levels[-1][0]
+    
+    def append(self, leaf: str) -> None:
+        """Add a leaf and rehash the path from it to the root"""
+        self.levels[0].append(leaf)
+        index = len(self.levels[0]) - 1
+        level = 0
+        while len(self.levels[level]) > 1:
+            nodes = self.levels[level]
+            parent = index // 2
+            left = nodes[2 * parent]
+            right = nodes[2 * parent + 1] if 2 * parent + 1 < len(nodes) else left
+            if level + 1 == len(self.levels):
+                self.levels.append([])
+            upper = self.levels[level + 1]
+            if parent < len(upper):
+                upper[parent] = hash_pair(left, right)
+            else:
+                upper.append(hash_pair(left, right))
+            index = parent
+            level += 1
+    
+    def extend(self, leaves: Iterable[str]) -> None:
+        for leaf in leaves:
+            self.append(leaf)
+    
+    def proof(self, index: int) -> List[Dict[str, str]]:
+        """
+        Inclusion proof for the leaf at index, from the leaf level upwards
+        Each step names the sibling hash and whether it sits left or right
+        of the running hash.
+        """
+        if not 0 <= index < len(self.levels[0]):
+            raise IndexError("Leaf index out of range")
+        steps = []
+        for nodes in self.levels[:-1]:
+            if index % 2:
+                steps.append({'hash': nodes[index - 1], 'position': 'left'})
+            else:
+                sibling = nodes[index + 1] if index + 1 < len(nodes) else nodes[index]
+                steps.append({'hash': sibling, 'position': 'right'})
+            index //= 2
+        return steps
+
+
+def verify_merkle_proof(tx_hash: str, proof: List[Dict[str, str]], merkle_root: str) -> bool:
+    """Check that tx_hash is a leaf of the tree with merkle_root, given its proof"""
+    current = tx_hash
+    try:
+        for step in proof:
+            if step['position'] == 'left':
+                current = hash_pair(step['hash'], current)
+            elif step['position'] == 'right':
+                current = hash_pair(current, step['hash'])
+            else:
+                return False
+    except (KeyError, TypeError):
+        return False
+    return current == merkle_root
@@ -0,0 +1,233 @@
+"""
+Multi-core proof-of-work miner for QXChain
+Splits the nonce space across a dedicated process pool (worker i tries
+nonces i, i + W, i + 2W, ...) and stops every worker through a shared event
+as soon as one of them finds a valid hash
+"""
+
+import asyncio
+import atexit
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from ..crypto.process_pool import pool_context
+from .block import Block, HeaderHasher
+from .difficulty import target_bytes
+
+if TYPE_CHECKING:
+    from .blockchain import QXBlockchain
+
+# Stop event inherited by the mining worker processes
+_worker_stop = None
+
+# Miners alive in this process; held weakly so short-lived chains can be collected
+_miners: 'weakref.WeakSet[ParallelMiner]' = weakref.WeakSet()
+
+
+def _init_worker(stop_event) -> None:
+    global _worker_stop
+    _worker_stop = stop_event
+
+
+def _search_nonces(fields: Dict[str, Any], target: bytes, start: int, step: int,
+                   check_interval: int) -> Tuple[Optional[int], Optional[str], int, float]:
+    """
+    Worker task: try nonces start, start + step, ... until one hashes at or
+    below target or the stop event is set; returns (nonce, hash, hashes, seconds)
+    """
+    hasher = HeaderHasher(fields)
+    digest = hasher.digest
+    nonce = start
+    hashes = 0
+    began = time.perf_counter()
+    while not _worker_stop.is_set():
+        for _ in range(check_interval):
+            hashes += 1
+            if digest(nonce) <= target:
+                _worker_stop.set()
+                return nonce, hasher.hexdigest(nonce), hashes, time.perf_counter() - began
+            nonce += step
+    return None, None, hashes, time.perf_counter() - began
+
+
+@dataclass
+class MiningResult:
+    """Outcome of one mining run with per-worker and aggregate hashrates"""
+    nonce: Optional[int]
+    block_hash: Optional[str]
+    hashes: int
+    elapsed: float
+    worker_hashrates: List[float] = field(default_factory=list)
+    
+    @property
+    def found(self) -> bool:
+        return self.nonce is not None
+    
+    @property
+    def hashrate(self) -> float:
+        return self.hashes / self.elapsed if self.elapsed > 0 else 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'found': self.found,
+            'nonce': self.nonce,
+            'hashes': self.hashes,
+            'elapsed': self.elapsed,
+            'hashrate': self.hashrate,
+            'workers': len(self.worker_hashrates),
+            'worker_hashrates': self.worker_hashrates
+        }
+
+
+class ParallelMiner:
+    """
+    Proof-of-work miner over a dedicated process pool
+    Runs inline when fewer than two workers are available or the difficulty
+    is too low for process start-up and dispatch to pay off.
+    """
+    
+    # Relative work below which mining runs inline (about 65k expected hashes)
+    MIN_PARALLEL_DIFFICULTY = 4096
+    
+    def __init__(self, workers: Optional[int] = None, check_interval: int = 4096):
+        self.workers = workers or os.cpu_count() or 1
+        self.check_interval = check_interval
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._stop = None
+        self._lock = threading.Lock()
+        _miners.add(self)
+    
+    def mine(self, block: Block, bits: Optional[int] = None,
+             cancel: Optional[threading.Event] = None) -> MiningResult:
+        """
+        Find a nonce for block and store it with the resulting hash
+        If cancel is set before a nonce is found, the block is left unchanged
+        and the result has found == False.
+        """
+        if bits is not None:
+            block.bits = bits
+        if self.workers < 2 or block.difficulty < self.MIN_PARALLEL_DIFFICULTY:
+            result = self._mine_inline(block, cancel)
+        else:
+            with self._lock:  # one parallel run at a time shares the stop event
+                try:
+                    result = self._mine_parallel(block, cancel)
+                except BrokenProcessPool:
+                    self.shutdown()
+                    result = self._mine_inline(block, cancel)
+        if result.found:
+            block.nonce = result.nonce
+            block.block_hash = result.block_hash
+        return result
+    
+    def shutdown(self) -> None:
+        """Stop the worker processes; the next parallel run starts new ones"""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            if self._stop is not None:
+                self._stop.set()
+            pool.shutdown(wait=True)
+    
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            context = pool_context()
+            self._stop = context.Event()
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                             initializer=_init_worker, initargs=(self._stop,))
+        return self._pool
+    
+    def _mine_parallel(self, block: Block, cancel: Optional[threading.Event]) -> MiningResult:
+        pool = self._get_pool()
+        self._stop.clear()
+        fields = block.header_fields()
+        began = time.perf_counter()
+        target = target_bytes(block.target)
+        futures = [pool.submit(_search_nonces, fields, target, i, self.workers, self.check_interval)
+                   for i in range(self.workers)]
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            if done or (cancel is not None and cancel.is_set()):
+                self._stop.set()
+        elapsed = time.perf_counter() - began
+        
+        reports = [future.result() for future in futures]
+        winners = [report for report in reports if report[0] is not None]
+        nonce, block_hash = min(winners)[:2] if winners else (None, None)
+        return MiningResult(
+            nonce=nonce,
+            block_hash=block_hash,
+            hashes=sum(report[2] for report in reports),
+            elapsed=elapsed,
+            worker_hashrates=[report[2] / report[3] if report[3] > 0 else 0.0 for report in reports]
+        )
+    
+    def _mine_inline(self, block: Block, cancel: Optional[threading.Event]) -> MiningResult:
+        hasher = HeaderHasher(block.header_fields())
+        digest = hasher.digest
+        target = target_bytes(block.target)
+        nonce = 0
+        began = time.perf_counter()
+        while cancel is None or not cancel.is_set():
+            for _ in range(self.check_interval):
+                if digest(nonce) <= target:
+                    elapsed = time.perf_counter() - began
+                    return MiningResult(nonce, hasher.hexdigest(nonce), nonce + 1, elapsed,
+                                        [(nonce + 1) / elapsed if elapsed > 0 else 0.0])
+                nonce += 1
+        elapsed = time.perf_counter() - began
+        return MiningResult(None, None, nonce, elapsed, [nonce / elapsed if elapsed > 0 else 0.0])
+
+
+class MiningJob:
+    """
+    One cancellable mining attempt on a fixed block template
+    The proof-of-work search runs in the event loop's default executor so
+    the loop keeps serving peers and API requests. cancel() stops the search
+    within a few thousand hashes; a cancelled job returns None and callers
+    start a new job on a fresh template. Jobs register with their chain,
+    which cancels them when another block takes their height or the chain
+    is replaced.
+    """
+    
+    def __init__(self, blockchain: 'QXBlockchain', miner_address: str):
+        self.blockchain = blockchain
+        self.miner_address = miner_address
+        self.cancel_event = threading.Event()
+        self.block = blockchain.create_block_template(miner_address)
+        self.result: Optional[MiningResult] = None
+        blockchain.register_mining_job(self)
+    
+    @property
+    def height(self) -> int:
+        """Index of the block being mined"""
+        return self.block.index
+    
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+    
+    def cancel(self) -> None:
+        """Abort the proof-of-work search"""
+        self.cancel_event.set()
+    
+    async def run(self) -> Optional[Block]:
+        """Mine the template off the event loop and connect it; None if cancelled or stale"""
+        loop = asyncio.get_running_loop()
+        self.result = await loop.run_in_executor(None, self.blockchain.miner.mine, self.block, None, self.cancel_event)
+        self.blockchain.last_mining_stats = self.result.to_dict()
+        if not self.result.found or self.cancelled:
+            return None
+        return self.block if self.blockchain.add_block(self.block) else None
+
+
+@atexit.register
+def _shutdown_miners() -> None:
+    for miner in list(_miners):
+        miner.shutdown()
@@ -0,0 +1,78 @@
+"""
+Verified-signature cache for QXChain transactions
+Lets a transaction pay for signature verification once per node: mempool
+admission, block validation and chain validation all consult it
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+CacheKey = Tuple[str, bytes, bytes]
+
+
+class SignatureCache:
+    """
+    Bounded LRU of signatures already known to be valid
+    Keyed by (transaction_hash, digest(signature), digest(public_key)), so a
+    changed signature or key for the same transaction is a miss. Only
+    successful verifications are recorded.
+    """
+    
+    def __init__(self, max_entries: int = 50000):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[CacheKey, None]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def make_key(transaction_hash: str, signature: bytes, public_key: bytes) -> CacheKey:
+        """Build the cache key for a signed transaction"""
+        return (
+            transaction_hash,
+            hashlib.blake2b(signature, digest_size=16).digest(),
+            hashlib.blake2b(public_key, digest_size=16).digest()
+        )
+    
+    def contains(self, key: CacheKey) -> bool:
+        """Check whether a signature was already verified, refreshing its position"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True
+            self.misses += 1
+            return False
+    
+    def add(self, key: CacheKey) -> None:
+        """Record a successfully verified signature"""
+        with self._lock:
+            self._entries[key] = None
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Forget all verified signatures and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Cache occupancy and hit/miss counters"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Node-wide cache shared by the mempool and block/chain validation
+verified_signatures = SignatureCache()
@@ -0,0 +1,148 @@
+"""
+Crypto backend registry
+Maps backend names to loaders returning a KEM and a signature class, and
+holds the node-wide active backend. Selection happens once at node start
+from an explicit name, the QXCHAIN_CRYPTO_BACKEND environment variable, or
+'auto'; a backend that fails to load falls back to the next compatible one.
+"""
+
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from . import kyber, native, quantum_signatures
+
+logger = logging.getLogger(__name__)
+
+ENV_VAR = 'QXCHAIN_CRYPTO_BACKEND'
+DEFAULT_BACKEND = 'auto'
+
+# Tried in order for 'auto' and when the requested backend cannot load.
+# Both produce byte-identical keys and signatures; the native backend uses
+# different formats and is therefore only used when asked for by name.
+FALLBACK_ORDER = ('numpy', 'python')
+
+
+@dataclass(frozen=True)
+class CryptoBackend:
+    """A loaded backend: KEM and signature classes sharing one key format family"""
+    name: str
+    kem: Any
+    signature: Any
+    description: str
+
+
+_loaders: Dict[str, Callable[[], CryptoBackend]] = {}
+_active: Optional[CryptoBackend] = None
+_selection: Dict[str, Any] = {}
+_lock = threading.Lock()
+
+
+def register_backend(name: str, loader: Callable[[], CryptoBackend]) -> None:
+    """Register a backend loader; the loader raises ImportError/RuntimeError if unusable"""
+    _loaders[name] = loader
+
+
+def registered_backends() -> List[str]:
+    """Names of all registered backends, loadable or not"""
+    return list(_loaders)
+
+
+def load_backend(name: str) -> CryptoBackend:
+    """Load a backend by name without activating it"""
+    loader = _loaders.get(name)
+    if loader is None:
+        raise ValueError(f"Unknown crypto backend '{name}' (registered: {', '.join(_loaders)})")
+    return loader()
+
+
+def select_backend(name: Optional[str] = None) -> CryptoBackend:
+    """
+    Activate a backend for this process
+    name defaults to $QXCHAIN_CRYPTO_BACKEND, then 'auto'. If the requested
+    backend cannot load, the first loadable entry of FALLBACK_ORDER is used
+    and the reason is kept for backend_info().
+    """
+    global _active
+    requested = (name or os.environ.get(ENV_VAR) or DEFAULT_BACKEND).strip().lower()
+    candidates = list(FALLBACK_ORDER) if requested == 'auto' else [requested]
+    candidates += [fallback for fallback in FALLBACK_ORDER if fallback not in candidates]
+
+    errors = {}
+    for candidate in candidates:
+        try:
+            backend = load_backend(candidate)
+        except (ImportError, RuntimeError, ValueError) as e:
+            errors[candidate] = str(e)
+            continue
+        with _lock:
+            _active = backend
+            _selection.clear()
+            _selection.update({'requested': requested, 'errors': errors})
+        if requested not in ('auto', backend.name):
+            logger.warning(f"Crypto backend '{requested}' unavailable ({errors.get(requested)}); "
+                           f"falling back to '{backend.name}'")
+        else:
+            logger.info(f"Using crypto backend '{backend.name}'")
+        return backend
+    raise RuntimeError(f"No crypto backend could be loaded: {errors}")
+
+
+def get_backend() -> CryptoBackend:
+    """The active backend, selecting the default one on first use"""
+    backend = _active
+    if backend is None:
+        backend = select_backend()
+    return backend
+
+
+def backend_info() -> Dict[str, Any]:
+    """Active backend summary for status endpoints"""
+    backend = get_backend()
+    return {
+        'name': backend.name,
+        'description': backend.description,
+        'kem': backend.kem.__name__,
+        'signature': backend.signature.__name__,
+        'requested': _selection.get('requested'),
+        'fallback': _selection.get('requested') not in ('auto', backend.name),
+        'unavailable': dict(_selection.get('errors', {})),
+        'registered': registered_backends()
+    }
+
+
+def _load_python() -> CryptoBackend:
+    return CryptoBackend(
+        name='python',
+        kem=kyber.Kyber1024Reference,
+        signature=quantum_signatures.QuantumSignatureReference,
+        description='Pure-Python reference implementation'
+    )
+
+
+def _load_numpy() -> CryptoBackend:
+    if kyber.np is None or quantum_signatures.np is None:
+        raise ImportError("numpy is not installed")
+    return CryptoBackend(
+        name='numpy',
+        kem=kyber.Kyber1024NumPy,
+        signature=quantum_signatures.QuantumSignatureNumPy,
+        description='NumPy-vectorized NTT implementation'
+    )
+
+
+def _load_oqs() -> CryptoBackend:
+    native.require_oqs()
+    return CryptoBackend(
+        name='oqs',
+        kem=native.NativeKyber,
+        signature=native.NativeSignature,
+        description=f"liboqs ({native.NativeKyber.mechanism()}, {native.NativeSignature.mechanism()})"
+    )
+
+
+register_backend('python', _load_python)
+register_backend('numpy', _load_numpy)
+register_backend('oqs', _load_oqs)
@@ -0,0 +1,47 @@
+"""
+Bit-packing codecs for lattice keys, ciphertexts and signatures
+Pure-Python reference; crypto/polyvec.py has the ndarray equivalents
+"""
+
+from typing import Iterable, List
+
+
+def pack_bits(values: Iterable[int], bits: int) -> bytes:
+    """Pack non-negative integers as consecutive little-endian bit fields"""
+    out = bytearray()
+    acc = 0
+    filled = 0
+    for value in values:
+        acc |= value << filled
+        filled += bits
+        while filled >= 8:
+            out.append(acc & 0xFF)
+            acc >>= 8
+            filled -= 8
+    if filled:
+        out.append(acc & 0xFF)
+    return bytes(out)
+
+
+def unpack_bits(data: bytes, bits: int, count: int) -> List[int]:
+    """Read count little-endian bit fields of the given width from the start of data"""
+    needed = (count * bits + 7) // 8
+    if len(data) < needed:
+        raise ValueError(f"Expected at least {needed} bytes, got {len(data)}")
+    mask = (1 << bits) - 1
+    values = []
+    acc = 0
+    filled = 0
+    for byte in memoryview(data)[:needed]:
+        acc |= byte << filled
+        filled += 8
+        while filled >= bits and len(values) < count:
+            values.append(acc & mask)
+            acc >>= bits
+            filled -= bits
+    return values
+
+
+def packed_size(count: int, bits: int) -> int:
+    """Number of bytes pack_bits produces for count fields"""
+    return (count * bits + 7) // 8
@@ -0,0 +1,114 @@
+"""
+Bounded LRU cache of prepared per-public-key contexts
+Used to skip re-unpacking keys and re-expanding matrices for hot senders
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+
+def estimate_size(obj: Any) -> int:
+    """Approximate memory footprint of a context built from arrays, lists, bytes and ints"""
+    nbytes = getattr(obj, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(estimate_size(item) for item in obj)
+    if hasattr(obj, '__dataclass_fields__'):
+        return sum(estimate_size(getattr(obj, name)) for name in obj.__dataclass_fields__)
+    return sys.getsizeof(obj)
+
+
+class ContextCache:
+    """
+    Thread-safe LRU keyed by public-key bytes
+    Bounded by entry count and by the estimated memory of the cached contexts
+    """
+    
+    def __init__(self, max_entries: int = 4096, max_bytes: int = 128 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[bytes, Any]' = OrderedDict()
+        self._sizes: Dict[bytes, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: bytes) -> Optional[Any]:
+        """Return the cached context for key, or None"""
+        with self._lock:
+            context = self._entries.get(key)
+            if context is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return context
+    
+    def get_or_create(self, key: bytes, factory: Callable[[bytes], Any]) -> Any:
+        """Return the cached context for key, building and caching it on a miss"""
+        context = self.get(key)
+        if context is None:
+            context = factory(key)
+            self.put(key, context)
+        return context
+    
+    def put(self, key: bytes, context: Any) -> None:
+        """Insert a context and evict least recently used entries over the caps"""
+        size = estimate_size(context)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._sizes.pop(key)
+                del self._entries[key]
+            if size > self.max_bytes or self.max_entries <= 0:
+                return
+            self._entries[key] = context
+            self._sizes[key] = size
+            self._bytes += size
+            self._evict()
+    
+    def configure(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+        """Change the caps, evicting immediately if the cache is now over them"""
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self._evict()
+    
+    def clear(self) -> None:
+        """Drop all cached contexts and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Cache occupancy and hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _evict(self) -> None:
+        """Evict least recently used entries; caller holds the lock"""
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            key, _ = self._entries.popitem(last=False)
+            self._bytes -= self._sizes.pop(key)
+            self.evictions += 1
@@ -3,15 +3,36 @@ Kyber1024 Post-Quantum Key Encapsulation Mechanism
 Adapted from QuantumR-Chain implementation for QXChain
 """
 
+from __future__ import annotations
+
 import os
 import hashlib
-from typing import Tuple, List
-import numpy as np
+from dataclasses import dataclass
+from typing import Any, Tuple, List
+
+from . import codec
+from .context_cache import ContextCache
+
+try:
+    import numpy as np
+    from . import polyvec
+except ImportError:  # Fall back to the pure-Python reference implementation
+    np = None
+    polyvec = None
+
+
+@dataclass
+class EncapsulationContext:
+    """Public-key material prepared once and reused by every encapsulation"""
+    rho: bytes
+    t_hat: Any  # t in the NTT domain
+    At_hat: Any  # Transposed matrix A in the NTT domain
 
 
-class Kyber1024:
+class Kyber1024Reference:
     """
     Kyber1024 implementation for quantum-resistant key encapsulation
+    Pure-Python reference: polynomials are lists of ints
     """
     
     # Kyber1024 parameters
@@ -23,9 +44,25 @@ class Kyber1024:
     DU = 11
     DV = 5
     
+    # Serialized sizes: 12-bit coefficients, ciphertext compressed to DU/DV bits
+    PUBLIC_KEY_BYTES = 32 + K * N * 12 // 8
+    PRIVATE_KEY_BYTES = K * N * 12 // 8
+    CIPHERTEXT_BYTES = K * N * DU // 8 + N * DV // 8
+    
+    # XOF output first squeezed per matrix entry; more is squeezed on demand
+    UNIFORM_STREAM_BYTES = 3 * N
+    
     # Polynomial ring operations
     ZETA = [2285, 2571, 2970, 1812, 1493, 1422, 287, 202, 3158, 622, 1577, 182, 962, 2127, 1855, 1468, 573, 2004, 264, 383, 2500, 1458, 1727, 3199, 2648, 1017, 732, 608, 1787, 411, 3124, 1758, 1223, 652, 2777, 1015, 2036, 1491, 3047, 1785, 516, 3321, 3009, 2663, 1711, 2167, 126, 1469, 2476, 3239, 3058, 830, 107, 1908, 3082, 2378, 2931, 961, 1821, 2604, 448, 2264, 677, 2054, 2226, 430, 555, 843, 2078, 871, 1550, 105, 422, 587, 177, 3094, 3038, 2869, 1574, 1653, 3083, 778, 1159, 3182, 2552, 1483, 2727, 1119, 1739, 644, 2457, 349, 418, 329, 3173, 3254, 817, 1097, 603, 610, 1322, 2044, 1864, 384, 2114, 3193, 1218, 1994, 2455, 220, 2142, 1670, 2144, 1799, 2051, 794, 1819, 2475, 2459, 478, 3221, 3021, 996, 991, 958, 1869, 1522, 1628]
     
+    # NTT twiddle factors: ZETA is stored in Montgomery form (x * 2^16 mod Q),
+    # 169 = 2^-16 mod Q converts it back to plain powers of the root 17
+    NTT_ZETAS = [z * 169 % 3329 for z in ZETA]
+    NTT_F = pow(128, -1, Q)  # Scaling factor for the inverse NTT
+    
+    # Prepared contexts for recently used public keys
+    _encapsulation_cache = ContextCache()
+    
     @classmethod
     def keygen(cls) -> Tuple[bytes, bytes]:
         """
@@ -62,8 +99,8 @@ class Kyber1024:
         Encapsulate a shared secret using the public key
         Returns: (ciphertext, shared_secret)
         """
-        # Unpack public key
-        t, rho = cls._unpack_public_key(pk)
+        # Unpacked key and expanded matrix A, cached per public key
+        ctx = cls._encapsulation_cache.get_or_create(pk, cls.prepare_encapsulation_context)
         
         # Generate random message
         m = os.urandom(32)
@@ -71,19 +108,16 @@ class Kyber1024:
         # Hash message to get randomness
         r = cls._shake128(m, 32)
         
-        # Generate matrix A from rho
-        A = cls._gen_matrix(rho)
-        
         # Sample polynomials
         r_vec = cls._sample_poly_cbd(r, cls.ETA1, cls.K)
         e1 = cls._sample_poly_cbd(r + b'\x01', cls.ETA2, cls.K)
         e2 = cls._sample_poly_cbd(r + b'\x02', cls.ETA2, 1)[0]
         
         # Compute ciphertext
-        u = cls._matrix_transpose_vector_mul(A, r_vec)
+        u = cls._matrix_ntt_vector_mul(ctx.At_hat, r_vec)
         u = cls._vector_add(u, e1)
         
-        v = cls._vector_dot_product(t, r_vec)
+        v = cls._vector_ntt_dot_product(ctx.t_hat, r_vec)
         v = cls._poly_add(v, e2)
         v = cls._poly_add(v, cls._decode_message(m))
         
@@ -115,6 +149,22 @@ class Kyber1024:
         
         return ss
     
+    @classmethod
+    def prepare_encapsulation_context(cls, pk: bytes) -> EncapsulationContext:
+        """Unpack a public key and expand its matrix into NTT form"""
+        t, rho = cls._unpack_public_key(pk)
+        A = cls._gen_matrix(rho)
+        return EncapsulationContext(
+            rho=rho,
+            t_hat=cls._ntt_vector(t),
+            At_hat=cls._ntt_matrix(cls._transpose(A))
+        )
+    
+    @classmethod
+    def encapsulation_cache(cls) -> ContextCache:
+        """LRU of prepared encapsulation contexts (hit/miss counters, memory cap)"""
+        return cls._encapsulation_cache
+    
     @staticmethod
     def _shake128(data: bytes, length: int) -> bytes:
         """SHAKE-128 extendable output function"""
@@ -146,24 +196,25 @@ class Kyber1024:
     
     @classmethod
     def _sample_uniform_poly(cls, seed: bytes) -> List[int]:
-        """Sample a uniform polynomial from seed"""
-        poly = [0] * cls.N
-        stream = cls._shake128(seed, 3 * cls.N)
+        """Sample a uniform polynomial from seed, squeezing more output if needed"""
+        poly = []
+        length = cls.UNIFORM_STREAM_BYTES
+        stream = cls._shake128(seed, length)
         
-        j = 0
-        for i in range(0, len(stream), 3):
-            if j >= cls.N:
-                break
+        i = 0
+        while len(poly) < cls.N:
+            if i + 3 > len(stream):
+                length *= 2
+                stream = cls._shake128(seed, length)
             
             d1 = stream[i] + 256 * (stream[i + 1] % 16)
             d2 = (stream[i + 1] // 16) + 16 * stream[i + 2]
             
             if d1 < cls.Q:
-                poly[j] = d1
-                j += 1
-            if d2 < cls.Q and j < cls.N:
-                poly[j] = d2
-                j += 1
+                poly.append(d1)
+            if d2 < cls.Q and len(poly) < cls.N:
+                poly.append(d2)
+            i += 3
         
         return poly
     
@@ -204,27 +255,40 @@ class Kyber1024:
     @classmethod
     def _matrix_vector_mul(cls, A: List[List[List[int]]], v: List[List[int]]) -> List[List[int]]:
         """Matrix-vector multiplication in polynomial ring"""
-        result = []
-        for i in range(len(A)):
-            poly_sum = [0] * cls.N
-            for j in range(len(v)):
-                poly_prod = cls._poly_mul(A[i][j], v[j])
-                poly_sum = cls._poly_add(poly_sum, poly_prod)
-            result.append(poly_sum)
-        return result
+        return cls._matrix_ntt_vector_mul(cls._ntt_matrix(A), v)
     
     @classmethod
     def _matrix_transpose_vector_mul(cls, A: List[List[List[int]]], v: List[List[int]]) -> List[List[int]]:
         """Matrix transpose-vector multiplication"""
+        return cls._matrix_ntt_vector_mul(cls._ntt_matrix(cls._transpose(A)), v)
+    
+    @classmethod
+    def _matrix_ntt_vector_mul(cls, A_hat: List[List[List[int]]], v: List[List[int]]) -> List[List[int]]:
+        """Multiply an NTT-domain matrix by a coefficient-domain vector"""
+        v_hat = cls._ntt_vector(v)
         result = []
-        for j in range(len(A[0])):
-            poly_sum = [0] * cls.N
-            for i in range(len(A)):
-                poly_prod = cls._poly_mul(A[i][j], v[i])
-                poly_sum = cls._poly_add(poly_sum, poly_prod)
-            result.append(poly_sum)
+        for row in A_hat:
+            acc = [0] * cls.N
+            for a_hat, p_hat in zip(row, v_hat):
+                acc = cls._poly_add(acc, cls._ntt_basemul(a_hat, p_hat))
+            result.append(cls._inv_ntt(acc))
         return result
     
+    @classmethod
+    def _ntt_matrix(cls, A: List[List[List[int]]]) -> List[List[List[int]]]:
+        """Transform every entry of a polynomial matrix to the NTT domain"""
+        return [cls._ntt_vector(row) for row in A]
+    
+    @classmethod
+    def _ntt_vector(cls, v: List[List[int]]) -> List[List[int]]:
+        """Transform every polynomial of a vector to the NTT domain"""
+        return [cls._ntt(poly) for poly in v]
+    
+    @classmethod
+    def _transpose(cls, A: List[List[List[int]]]) -> List[List[List[int]]]:
+        """Transpose a polynomial matrix"""
+        return [list(column) for column in zip(*A)]
+    
     @classmethod
     def _vector_add(cls, a: List[List[int]], b: List[List[int]]) -> List[List[int]]:
         """Vector addition"""
@@ -233,11 +297,15 @@ class Kyber1024:
     @classmethod
     def _vector_dot_product(cls, a: List[List[int]], b: List[List[int]]) -> List[int]:
         """Vector dot product"""
-        result = [0] * cls.N
-        for i in range(len(a)):
-            poly_prod = cls._poly_mul(a[i], b[i])
-            result = cls._poly_add(result, poly_prod)
-        return result
+        return cls._vector_ntt_dot_product(cls._ntt_vector(a), b)
+    
+    @classmethod
+    def _vector_ntt_dot_product(cls, a_hat: List[List[int]], b: List[List[int]]) -> List[int]:
+        """Dot product of an NTT-domain vector with a coefficient-domain vector"""
+        acc = [0] * cls.N
+        for p_hat, q_hat in zip(a_hat, cls._ntt_vector(b)):
+            acc = cls._poly_add(acc, cls._ntt_basemul(p_hat, q_hat))
+        return cls._inv_ntt(acc)
     
     @classmethod
     def _poly_add(cls, a: List[int], b: List[int]) -> List[int]:
@@ -252,7 +320,11 @@ class Kyber1024:
     @classmethod
     def _poly_mul(cls, a: List[int], b: List[int]) -> List[int]:
         """Polynomial multiplication using NTT"""
-        # Simplified polynomial multiplication (should use NTT for efficiency)
+        return cls._inv_ntt(cls._ntt_basemul(cls._ntt(a), cls._ntt(b)))
+    
+    @classmethod
+    def _poly_mul_schoolbook(cls, a: List[int], b: List[int]) -> List[int]:
+        """Reference O(N^2) polynomial multiplication in Z_q[x]/(x^n + 1)"""
         result = [0] * cls.N
         for i in range(cls.N):
             for j in range(cls.N):
@@ -263,6 +335,62 @@ class Kyber1024:
                     result[i + j - cls.N] = (result[i + j - cls.N] - a[i] * b[j]) % cls.Q
         return result
     
+    @classmethod
+    def _ntt(cls, poly: List[int]) -> List[int]:
+        """
+        Forward number-theoretic transform (Cooley-Tukey, bit-reversed output)
+        Q has no 512th root of unity, so the last layer stops at 128 pairs of
+        degree-1 residues which are multiplied by _ntt_basemul
+        """
+        r = [coeff % cls.Q for coeff in poly]
+        zetas = cls.NTT_ZETAS
+        q = cls.Q
+        k = 1
+        length = 128
+        while length >= 2:
+            for start in range(0, cls.N, 2 * length):
+                zeta = zetas[k]
+                k += 1
+                for j in range(start, start + length):
+                    t = zeta * r[j + length] % q
+                    r[j + length] = (r[j] - t) % q
+                    r[j] = (r[j] + t) % q
+            length >>= 1
+        return r
+    
+    @classmethod
+    def _inv_ntt(cls, poly: List[int]) -> List[int]:
+        """Inverse number-theoretic transform (Gentleman-Sande), includes 1/128 scaling"""
+        r = list(poly)
+        zetas = cls.NTT_ZETAS
+        q = cls.Q
+        k = 127
+        length = 2
+        while length <= 128:
+            for start in range(0, cls.N, 2 * length):
+                zeta = zetas[k]
+                k -= 1
+                for j in range(start, start + length):
+                    t = r[j]
+                    r[j] = (t + r[j + length]) % q
+                    r[j + length] = zeta * (r[j + length] - t) % q
+            length <<= 1
+        return [coeff * cls.NTT_F % q for coeff in r]
+    
+    @classmethod
+    def _ntt_basemul(cls, a: List[int], b: List[int]) -> List[int]:
+        """Pointwise product of two NTT-domain polynomials (degree-1 base multiplication)"""
+        q = cls.Q
+        r = [0] * cls.N
+        for i in range(cls.N // 4):
+            zeta = cls.NTT_ZETAS[64 + i]
+            for offset, z in ((4 * i, zeta), (4 * i + 2, q - zeta)):
+                a0, a1 = a[offset], a[offset + 1]
+                b0, b1 = b[offset], b[offset + 1]
+                r[offset] = (a0 * b0 + a1 * b1 % q * z) % q
+                r[offset + 1] = (a0 * b1 + a1 * b0) % q
+        return r
+    
     @classmethod
     def _decode_message(cls, m: bytes) -> List[int]:
         """Decode message to polynomial"""
@@ -279,89 +407,259 @@ class Kyber1024:
         """Encode polynomial to message"""
         m = bytearray(32)
         for i in range(cls.N):
-            bit = 1 if poly[i] > cls.Q // 2 else 0
+            # Coefficients near Q/2 decode to 1, coefficients near 0 (or Q) to 0
+            bit = 1 if cls.Q // 4 < poly[i] % cls.Q < 3 * cls.Q // 4 else 0
             byte_pos = i // 8
             bit_pos = i % 8
             if byte_pos < 32:
                 m[byte_pos] |= bit << bit_pos
         return bytes(m)
     
+    @classmethod
+    def _compress(cls, poly: List[int], d: int) -> List[int]:
+        """Compress coefficients to d bits: round(x * 2^d / Q) mod 2^d"""
+        return [(((coeff % cls.Q) << d) + cls.Q // 2) // cls.Q & ((1 << d) - 1) for coeff in poly]
+    
+    @classmethod
+    def _decompress(cls, poly: List[int], d: int) -> List[int]:
+        """Decompress d-bit coefficients: round(x * Q / 2^d)"""
+        return [(coeff * cls.Q + (1 << (d - 1))) >> d for coeff in poly]
+    
+    @classmethod
+    def _check_length(cls, data: bytes, expected: int, what: str) -> None:
+        """Reject encodings of the wrong size before decoding them"""
+        if len(data) != expected:
+            raise ValueError(f"Invalid Kyber1024 {what} length: {len(data)} != {expected}")
+    
+    @classmethod
+    def _check_canonical(cls, coeffs, what: str) -> None:
+        """Reject coefficients outside [0, Q): the encoding must be unique"""
+        if max(coeffs) >= cls.Q:
+            raise ValueError(f"Invalid Kyber1024 {what}: coefficient not reduced mod Q")
+    
+    @classmethod
+    def _split_polys(cls, coeffs: List[int], k: int) -> List[List[int]]:
+        """Split a flat coefficient list into k polynomials"""
+        return [coeffs[i * cls.N:(i + 1) * cls.N] for i in range(k)]
+    
     @classmethod
     def _pack_public_key(cls, t: List[List[int]], rho: bytes) -> bytes:
-        """Pack public key"""
-        # Simplified packing (should compress polynomials)
-        data = rho
-        for poly in t:
-            for coeff in poly:
-                data += coeff.to_bytes(2, 'little')
-        return data
+        """Pack public key: rho followed by t as 12-bit coefficients"""
+        return rho + codec.pack_bits((coeff for poly in t for coeff in poly), 12)
     
     @classmethod
     def _unpack_public_key(cls, pk: bytes) -> Tuple[List[List[int]], bytes]:
         """Unpack public key"""
-        rho = pk[:32]
-        t = []
-        offset = 32
-        for i in range(cls.K):
-            poly = []
-            for j in range(cls.N):
-                coeff = int.from_bytes(pk[offset:offset+2], 'little')
-                poly.append(coeff)
-                offset += 2
-            t.append(poly)
-        return t, rho
+        cls._check_length(pk, cls.PUBLIC_KEY_BYTES, "public key")
+        coeffs = codec.unpack_bits(pk[32:], 12, cls.K * cls.N)
+        cls._check_canonical(coeffs, "public key")
+        return cls._split_polys(coeffs, cls.K), pk[:32]
     
     @classmethod
     def _pack_private_key(cls, s: List[List[int]]) -> bytes:
-        """Pack private key"""
-        data = b''
-        for poly in s:
-            for coeff in poly:
-                data += coeff.to_bytes(2, 'little')
-        return data
+        """Pack private key: s as 12-bit coefficients"""
+        return codec.pack_bits((coeff for poly in s for coeff in poly), 12)
     
     @classmethod
     def _unpack_private_key(cls, sk: bytes) -> List[List[int]]:
         """Unpack private key"""
-        s = []
-        offset = 0
-        for i in range(cls.K):
-            poly = []
-            for j in range(cls.N):
-                coeff = int.from_bytes(sk[offset:offset+2], 'little')
-                poly.append(coeff)
-                offset += 2
-            s.append(poly)
-        return s
+        cls._check_length(sk, cls.PRIVATE_KEY_BYTES, "private key")
+        coeffs = codec.unpack_bits(sk, 12, cls.K * cls.N)
+        cls._check_canonical(coeffs, "private key")
+        return cls._split_polys(coeffs, cls.K)
     
     @classmethod
     def _pack_ciphertext(cls, u: List[List[int]], v: List[int]) -> bytes:
-        """Pack ciphertext"""
-        data = b''
-        for poly in u:
-            for coeff in poly:
-                data += coeff.to_bytes(2, 'little')
-        for coeff in v:
-            data += coeff.to_bytes(2, 'little')
-        return data
+        """Pack ciphertext: u compressed to DU bits, v to DV bits"""
+        u_bits = codec.pack_bits((coeff for poly in u for coeff in cls._compress(poly, cls.DU)), cls.DU)
+        return u_bits + codec.pack_bits(cls._compress(v, cls.DV), cls.DV)
     
     @classmethod
     def _unpack_ciphertext(cls, ct: bytes) -> Tuple[List[List[int]], List[int]]:
         """Unpack ciphertext"""
-        u = []
-        offset = 0
-        for i in range(cls.K):
-            poly = []
-            for j in range(cls.N):
-                coeff = int.from_bytes(ct[offset:offset+2], 'little')
-                poly.append(coeff)
-                offset += 2
-            u.append(poly)
-        
-        v = []
-        for j in range(cls.N):
-            coeff = int.from_bytes(ct[offset:offset+2], 'little')
-            v.append(coeff)
-            offset += 2
-        
-        return u, v
\ No newline at end of file
+        cls._check_length(ct, cls.CIPHERTEXT_BYTES, "ciphertext")
+        u_size = codec.packed_size(cls.K * cls.N, cls.DU)
+        u = cls._split_polys(cls._decompress(codec.unpack_bits(ct, cls.DU, cls.K * cls.N), cls.DU), cls.K)
+        v = cls._decompress(codec.unpack_bits(ct[u_size:], cls.DV, cls.N), cls.DV)
+        return u, v
+
+class Kyber1024NumPy(Kyber1024Reference):
+    """
+    Kyber1024 with ndarray-backed polynomials
+    Vectors are (k, N) and matrices (k, k, N) int64 arrays, so each helper
+    processes a whole vector per call. Byte formats match the reference.
+    """
+    
+    # Contexts hold ndarrays here, so they are not shared with the reference class
+    _encapsulation_cache = ContextCache()
+    
+    if np is not None:
+        _ZETAS = polyvec.as_table(Kyber1024Reference.NTT_ZETAS)
+        # Degree-1 base multiplication moduli: x^2 - zeta, x^2 + zeta per group of four
+        _BASEMUL_ZETAS = polyvec.as_table(
+            [z for i in range(64) for z in (Kyber1024Reference.NTT_ZETAS[64 + i],
+                                            -Kyber1024Reference.NTT_ZETAS[64 + i])]
+        )
+    
+    @classmethod
+    def _gen_matrix(cls, rho: bytes) -> np.ndarray:
+        """Generate matrix A from seed rho, sampling all entries in one pass"""
+        seeds = [rho + bytes([j, i]) for i in range(cls.K) for j in range(cls.K)]
+        A = polyvec.sample_uniform_matrix(cls._shake128, seeds, cls.Q, cls.N, 12, cls.UNIFORM_STREAM_BYTES)
+        return A.reshape(cls.K, cls.K, cls.N)
+    
+    @classmethod
+    def _sample_uniform_poly(cls, seed: bytes) -> np.ndarray:
+        """Sample a uniform polynomial from seed"""
+        return polyvec.sample_uniform_matrix(cls._shake128, [seed], cls.Q, cls.N, 12, cls.UNIFORM_STREAM_BYTES)[0]
+    
+    @classmethod
+    def _sample_poly_cbd(cls, seed: bytes, eta: int, k: int) -> np.ndarray:
+        """Sample polynomials from centered binomial distribution"""
+        return np.stack([cls._cbd(cls._shake128(seed + bytes([i]), 64 * eta), eta) for i in range(k)])
+    
+    @classmethod
+    def _cbd(cls, stream: bytes, eta: int) -> np.ndarray:
+        """Centered binomial distribution sampling"""
+        return polyvec.cbd(stream, eta, cls.N) % cls.Q
+    
+    @classmethod
+    def _matrix_ntt_vector_mul(cls, A_hat: np.ndarray, v: np.ndarray) -> np.ndarray:
+        """Multiply an NTT-domain matrix by a coefficient-domain vector"""
+        products = cls._ntt_basemul(A_hat, cls._ntt(v)[None, :, :])
+        return cls._inv_ntt(products.sum(axis=1))
+    
+    @classmethod
+    def _ntt_matrix(cls, A: np.ndarray) -> np.ndarray:
+        """Transform every entry of a polynomial matrix to the NTT domain"""
+        return cls._ntt(A)
+    
+    @classmethod
+    def _ntt_vector(cls, v: np.ndarray) -> np.ndarray:
+        """Transform every polynomial of a vector to the NTT domain"""
+        return cls._ntt(v)
+    
+    @classmethod
+    def _transpose(cls, A: np.ndarray) -> np.ndarray:
+        """Transpose a polynomial matrix"""
+        return np.swapaxes(A, 0, 1)
+    
+    @classmethod
+    def _vector_add(cls, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Vector addition"""
+        return (a + b) % cls.Q
+    
+    @classmethod
+    def _vector_ntt_dot_product(cls, a_hat: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Dot product of an NTT-domain vector with a coefficient-domain vector"""
+        return cls._inv_ntt(cls._ntt_basemul(a_hat, cls._ntt(b)).sum(axis=0))
+    
+    @classmethod
+    def _poly_add(cls, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Polynomial addition"""
+        return (a + b) % cls.Q
+    
+    @classmethod
+    def _poly_sub(cls, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Polynomial subtraction"""
+        return (a - b) % cls.Q
+    
+    @classmethod
+    def _poly_mul(cls, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Polynomial multiplication using NTT"""
+        return cls._inv_ntt(cls._ntt_basemul(cls._ntt(a), cls._ntt(b)))
+    
+    @classmethod
+    def _ntt(cls, poly: np.ndarray) -> np.ndarray:
+        """Forward NTT over the last axis"""
+        return polyvec.ntt(poly, cls._ZETAS, cls.Q, 2)
+    
+    @classmethod
+    def _inv_ntt(cls, poly: np.ndarray) -> np.ndarray:
+        """Inverse NTT over the last axis"""
+        return polyvec.inv_ntt(poly, cls._ZETAS, cls.Q, 2, cls.NTT_F)
+    
+    @classmethod
+    def _ntt_basemul(cls, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Pointwise product of NTT-domain polynomials (degree-1 base multiplication)"""
+        a, b = np.broadcast_arrays(a, b)
+        shape = a.shape
+        a = a.reshape(shape[:-1] + (cls.N // 2, 2))
+        b = b.reshape(shape[:-1] + (cls.N // 2, 2))
+        a0, a1 = a[..., 0], a[..., 1]
+        b0, b1 = b[..., 0], b[..., 1]
+        r0 = (a0 * b0 + a1 * b1 % cls.Q * cls._BASEMUL_ZETAS) % cls.Q
+        r1 = (a0 * b1 + a1 * b0) % cls.Q
+        return np.stack((r0, r1), axis=-1).reshape(shape)
+    
+    @classmethod
+    def _decode_message(cls, m: bytes) -> np.ndarray:
+        """Decode message to polynomial"""
+        bits = np.unpackbits(np.frombuffer(m[:32], dtype=np.uint8), bitorder='little')
+        return bits.astype(np.int64) * (cls.Q // 2)
+    
+    @classmethod
+    def _encode_message(cls, poly: np.ndarray) -> bytes:
+        """Encode polynomial to message"""
+        coeffs = poly % cls.Q
+        bits = (coeffs > cls.Q // 4) & (coeffs < 3 * cls.Q // 4)
+        return np.packbits(bits.astype(np.uint8), bitorder='little').tobytes()
+    
+    @classmethod
+    def _compress(cls, poly: np.ndarray, d: int) -> np.ndarray:
+        """Compress coefficients to d bits: round(x * 2^d / Q) mod 2^d"""
+        return (((poly % cls.Q) << d) + cls.Q // 2) // cls.Q & ((1 << d) - 1)
+    
+    @classmethod
+    def _decompress(cls, poly: np.ndarray, d: int) -> np.ndarray:
+        """Decompress d-bit coefficients: round(x * Q / 2^d)"""
+        return (poly * cls.Q + (1 << (d - 1))) >> d
+    
+    @classmethod
+    def _check_canonical(cls, coeffs: np.ndarray, what: str) -> None:
+        """Reject coefficients outside [0, Q): the encoding must be unique"""
+        if coeffs.max() >= cls.Q:
+            raise ValueError(f"Invalid Kyber1024 {what}: coefficient not reduced mod Q")
+    
+    @classmethod
+    def _pack_public_key(cls, t: np.ndarray, rho: bytes) -> bytes:
+        """Pack public key: rho followed by t as 12-bit coefficients"""
+        return rho + polyvec.pack_bits(t, 12)
+    
+    @classmethod
+    def _unpack_public_key(cls, pk: bytes) -> Tuple[np.ndarray, bytes]:
+        """Unpack public key"""
+        cls._check_length(pk, cls.PUBLIC_KEY_BYTES, "public key")
+        t = polyvec.unpack_bits(memoryview(pk)[32:], 12, cls.K * cls.N).reshape(cls.K, cls.N)
+        cls._check_canonical(t, "public key")
+        return t, pk[:32]
+    
+    @classmethod
+    def _pack_private_key(cls, s: np.ndarray) -> bytes:
+        """Pack private key: s as 12-bit coefficients"""
+        return polyvec.pack_bits(s, 12)
+    
+    @classmethod
+    def _unpack_private_key(cls, sk: bytes) -> np.ndarray:
+        """Unpack private key"""
+        cls._check_length(sk, cls.PRIVATE_KEY_BYTES, "private key")
+        s = polyvec.unpack_bits(sk, 12, cls.K * cls.N).reshape(cls.K, cls.N)
+        cls._check_canonical(s, "private key")
+        return s
+    
+    @classmethod
+    def _pack_ciphertext(cls, u: np.ndarray, v: np.ndarray) -> bytes:
+        """Pack ciphertext: u compressed to DU bits, v to DV bits"""
+        return polyvec.pack_bits(cls._compress(u, cls.DU), cls.DU) + polyvec.pack_bits(cls._compress(v, cls.DV), cls.DV)
+    
+    @classmethod
+    def _unpack_ciphertext(cls, ct: bytes) -> Tuple[np.ndarray, np.ndarray]:
+        """Unpack ciphertext"""
+        cls._check_length(ct, cls.CIPHERTEXT_BYTES, "ciphertext")
+        u_size = codec.packed_size(cls.K * cls.N, cls.DU)
+        u = cls._decompress(polyvec.unpack_bits(ct, cls.DU, cls.K * cls.N), cls.DU).reshape(cls.K, cls.N)
+        v = cls._decompress(polyvec.unpack_bits(memoryview(ct)[u_size:], cls.DV, cls.N), cls.DV)
+        return u, v
+
+# Default implementation: vectorized when numpy is available
+Kyber1024 = Kyber1024NumPy if np is not None else Kyber1024Reference
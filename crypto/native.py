@@ -0,0 +1,118 @@
+"""
+Adapters exposing a native post-quantum library (liboqs via the `oqs`
+package) through the same class interface as Kyber1024 and QuantumSignature
+Keys, ciphertexts and signatures use the library's own formats, so they are
+not interchangeable with the pure-Python and NumPy backends
+"""
+
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import oqs
+except ImportError:  # Native backend is optional
+    oqs = None
+
+# Preferred mechanism names, newest naming first
+KEM_MECHANISMS = ('ML-KEM-1024', 'Kyber1024')
+SIGNATURE_MECHANISMS = ('ML-DSA-65', 'Dilithium3')
+
+
+def _pick_mechanism(preferred: Sequence[str], enabled: Sequence[str]) -> str:
+    """Return the first preferred mechanism the installed liboqs enables"""
+    for name in preferred:
+        if name in enabled:
+            return name
+    raise RuntimeError(f"liboqs has none of {', '.join(preferred)} enabled")
+
+
+def require_oqs() -> None:
+    """Raise ImportError when the native library is unavailable"""
+    if oqs is None:
+        raise ImportError("The 'oqs' package (liboqs-python) is not installed")
+
+
+class NativeKyber:
+    """Key encapsulation backed by liboqs"""
+
+    MECHANISM: Optional[str] = None
+
+    @classmethod
+    def mechanism(cls) -> str:
+        if cls.MECHANISM is None:
+            require_oqs()
+            cls.MECHANISM = _pick_mechanism(KEM_MECHANISMS, oqs.get_enabled_kem_mechanisms())
+        return cls.MECHANISM
+
+    @classmethod
+    def keygen(cls) -> Tuple[bytes, bytes]:
+        with oqs.KeyEncapsulation(cls.mechanism()) as kem:
+            pk = kem.generate_keypair()
+            return bytes(pk), bytes(kem.export_secret_key())
+
+    @classmethod
+    def encaps(cls, pk: bytes) -> Tuple[bytes, bytes]:
+        with oqs.KeyEncapsulation(cls.mechanism()) as kem:
+            ct, ss = kem.encap_secret(pk)
+            return bytes(ct), bytes(ss)
+
+    @classmethod
+    def decaps(cls, ct: bytes, sk: bytes) -> bytes:
+        with oqs.KeyEncapsulation(cls.mechanism(), secret_key=sk) as kem:
+            return bytes(kem.decap_secret(ct))
+
+
+class NativeSigningKey:
+    """Loaded liboqs signer for one private key"""
+
+    def __init__(self, mechanism: str, private_key: bytes, public_key: Optional[bytes] = None):
+        self.mechanism = mechanism
+        self.public_key = public_key
+        self._signer = oqs.Signature(mechanism, secret_key=private_key)
+
+    def sign(self, message: bytes) -> bytes:
+        return bytes(self._signer.sign(message))
+
+    def sign_many(self, messages: Iterable[bytes]) -> List[bytes]:
+        return [self.sign(message) for message in messages]
+
+
+class NativeSignature:
+    """Signatures backed by liboqs"""
+
+    MECHANISM: Optional[str] = None
+
+    @classmethod
+    def mechanism(cls) -> str:
+        if cls.MECHANISM is None:
+            require_oqs()
+            cls.MECHANISM = _pick_mechanism(SIGNATURE_MECHANISMS, oqs.get_enabled_sig_mechanisms())
+        return cls.MECHANISM
+
+    @classmethod
+    def keygen(cls) -> Tuple[bytes, bytes]:
+        with oqs.Signature(cls.mechanism()) as signer:
+            pk = signer.generate_keypair()
+            return bytes(pk), bytes(signer.export_secret_key())
+
+    @classmethod
+    def sign(cls, message: bytes, private_key: bytes) -> bytes:
+        return cls.load_signing_key(private_key).sign(message)
+
+    @classmethod
+    def load_signing_key(cls, private_key: bytes, public_key: Optional[bytes] = None) -> NativeSigningKey:
+        """liboqs cannot derive the public key, so it is only set when given"""
+        return NativeSigningKey(cls.mechanism(), private_key, public_key)
+
+    @classmethod
+    def verify(cls, message: bytes, signature: bytes, public_key: bytes) -> bool:
+        try:
+            with oqs.Signature(cls.mechanism()) as verifier:
+                return bool(verifier.verify(message, signature, public_key))
+        except Exception:
+            return False
+
+    @classmethod
+    def verify_batch(cls, items: Sequence[Tuple[bytes, bytes, bytes]],
+                     processes: Optional[int] = None) -> List[bool]:
+        """Native verification is fast enough to run inline"""
+        return [cls.verify(message, signature, public_key) for message, signature, public_key in items]
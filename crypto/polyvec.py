@@ -0,0 +1,147 @@
+"""
+NumPy-vectorized polynomial arithmetic shared by Kyber1024 and QuantumSignature
+Polynomials are int64 arrays of shape (..., N); vectors and matrices simply add
+leading axes, so every operation below runs over a whole vector in one call
+"""
+
+from typing import Callable, Sequence
+import numpy as np
+
+
+def ntt(a: np.ndarray, zetas: np.ndarray, q: int, min_length: int) -> np.ndarray:
+    """
+    Forward Cooley-Tukey NTT over the last axis (bit-reversed output)
+    min_length is 2 for Kyber's incomplete transform and 1 for a full one
+    """
+    r = np.array(a, dtype=np.int64) % q
+    n = r.shape[-1]
+    lead = r.shape[:-1]
+    k = 1
+    length = n // 2
+    while length >= min_length:
+        blocks = n // (2 * length)
+        r = r.reshape(lead + (blocks, 2, length))
+        z = zetas[k:k + blocks, None]
+        k += blocks
+        t = z * r[..., 1, :] % q
+        lo = r[..., 0, :]
+        r = np.stack(((lo + t) % q, (lo - t) % q), axis=-2)
+        length >>= 1
+    return r.reshape(lead + (n,))
+
+
+def inv_ntt(a: np.ndarray, zetas: np.ndarray, q: int, min_length: int, f: int) -> np.ndarray:
+    """Inverse Gentleman-Sande NTT over the last axis, including the final scaling by f"""
+    r = np.array(a, dtype=np.int64) % q
+    n = r.shape[-1]
+    lead = r.shape[:-1]
+    k = len(zetas)
+    length = min_length
+    while length <= n // 2:
+        blocks = n // (2 * length)
+        r = r.reshape(lead + (blocks, 2, length))
+        z = zetas[k - blocks:k][::-1, None]
+        k -= blocks
+        lo = r[..., 0, :]
+        hi = r[..., 1, :]
+        r = np.stack(((lo + hi) % q, z * (hi - lo) % q), axis=-2)
+        length <<= 1
+    return r.reshape(lead + (n,)) * f % q
+
+
+def cbd(stream: bytes, eta: int, n: int) -> np.ndarray:
+    """
+    Centered binomial sample a - b, each the sum of eta stream bits
+    Bits past the end of the stream count as zero, like the reference loop
+    """
+    bits = np.unpackbits(np.frombuffer(stream, dtype=np.uint8), bitorder='little')
+    needed = 2 * eta * n
+    if len(bits) < needed:
+        bits = np.concatenate((bits, np.zeros(needed - len(bits), dtype=np.uint8)))
+    pairs = bits[:needed].reshape(n, 2, eta).sum(axis=2, dtype=np.int64)
+    return pairs[:, 0] - pairs[:, 1]
+
+
+def uniform_candidates(stream: np.ndarray, bits: int) -> np.ndarray:
+    """
+    Rejection-sampling candidates from (..., 3m) bytes of XOF output: two
+    12-bit values per 3 bytes, or one 3-byte value masked to bits (13 to 24)
+    """
+    triples = stream.reshape(stream.shape[:-1] + (-1, 3)).astype(np.int64)
+    if bits == 12:
+        d1 = triples[..., 0] | ((triples[..., 1] & 0x0F) << 8)
+        d2 = (triples[..., 1] >> 4) | (triples[..., 2] << 4)
+        return np.stack((d1, d2), axis=-1).reshape(stream.shape[:-1] + (-1,))
+    if 12 < bits <= 24:
+        value = triples[..., 0] | (triples[..., 1] << 8) | (triples[..., 2] << 16)
+        return value & ((1 << bits) - 1)
+    raise ValueError(f"Unsupported candidate width: {bits} bits")
+
+
+def sample_uniform_matrix(xof: Callable[[bytes, int], bytes], seeds: Sequence[bytes],
+                          q: int, n: int, bits: int, nbytes: int) -> np.ndarray:
+    """
+    Rejection-sample one polynomial below q per seed, returned as (len(seeds), n)
+    Candidate extraction and filtering run over every seed's XOF output at
+    once. Seeds whose first nbytes leave fewer than n survivors are squeezed
+    again with twice the output until every row is full; since XOF output is
+    prefix-stable, the result does not depend on nbytes.
+    """
+    nbytes -= nbytes % 3
+    out = np.empty((len(seeds), n), dtype=np.int64)
+    pending = np.arange(len(seeds))
+    while len(pending):
+        stream = b''.join(xof(seeds[k], nbytes) for k in pending)
+        candidates = uniform_candidates(np.frombuffer(stream, dtype=np.uint8).reshape(len(pending), nbytes), bits)
+        accept = candidates < q
+        full = accept.sum(axis=1) >= n
+        if full.any():
+            accept = accept[full]
+            keep = accept & (np.cumsum(accept, axis=1) <= n)
+            out[pending[full]] = candidates[full][keep].reshape(-1, n)
+        pending = pending[~full]
+        nbytes *= 2
+    return out
+
+
+def pack_ints(values: np.ndarray, nbytes: int, signed: bool = False) -> bytes:
+    """Serialize integers as fixed-width little-endian fields (1 to 4 bytes each)"""
+    flat = np.asarray(values, dtype=np.int64).reshape(-1)
+    if signed:
+        flat = flat % (1 << (8 * nbytes))
+    raw = flat.astype('<u4').view(np.uint8).reshape(-1, 4)
+    return raw[:, :nbytes].tobytes()
+
+
+def unpack_ints(data: bytes, nbytes: int, count: int, signed: bool = False) -> np.ndarray:
+    """Parse count fixed-width little-endian integers from the start of data"""
+    raw = np.frombuffer(data, dtype=np.uint8, count=count * nbytes).reshape(count, nbytes)
+    values = np.zeros(count, dtype=np.int64)
+    for i in range(nbytes):
+        values |= raw[:, i].astype(np.int64) << (8 * i)
+    if signed:
+        sign_bit = 1 << (8 * nbytes - 1)
+        values = np.where(values >= sign_bit, values - (sign_bit << 1), values)
+    return values
+
+
+def as_table(values: Sequence[int]) -> np.ndarray:
+    """Convert a precomputed constant table to an int64 array"""
+    return np.array(values, dtype=np.int64)
+
+
+def pack_bits(values: np.ndarray, bits: int) -> bytes:
+    """Pack non-negative integers as consecutive little-endian bit fields"""
+    flat = np.asarray(values, dtype=np.int64).reshape(-1)
+    fields = (flat[:, None] >> np.arange(bits)) & 1
+    return np.packbits(fields.astype(np.uint8).reshape(-1), bitorder='little').tobytes()
+
+
+def unpack_bits(data: bytes, bits: int, count: int) -> np.ndarray:
+    """Read count little-endian bit fields of the given width from the start of data"""
+    needed = (count * bits + 7) // 8
+    if len(data) < needed:
+        raise ValueError(f"Expected at least {needed} bytes, got {len(data)}")
+    raw = np.unpackbits(np.frombuffer(data, dtype=np.uint8, count=needed), bitorder='little')
+    fields = raw[:count * bits].reshape(count, bits).astype(np.int64)
+    return fields @ (np.int64(1) << np.arange(bits, dtype=np.int64))
@@ -0,0 +1,64 @@
+"""
+Persistent process pool shared by CPU-bound crypto work
+Created lazily on first use and sized to the available cores. Workers are
+started through a fork server (or spawned) rather than forked from the
+multi-threaded node, whose other threads may hold locks at fork time
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+_pool: Optional[ProcessPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def default_workers() -> int:
+    """Number of worker processes used when no size is given"""
+    return os.cpu_count() or 1
+
+
+def pool_context() -> multiprocessing.context.BaseContext:
+    """Start method for worker pools: forkserver where supported, spawn otherwise"""
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(method)
+
+
+def get_process_pool(max_workers: Optional[int] = None) -> Optional[ProcessPoolExecutor]:
+    """
+    Return the shared pool, creating it on first use
+    Returns None when fewer than two workers would be available, so callers
+    run the work inline instead of paying inter-process overhead
+    """
+    global _pool
+    workers = max_workers or default_workers()
+    if workers < 2:
+        return None
+    with _lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=pool_context())
+        return _pool
+
+
+def reset_process_pool() -> None:
+    """Discard the shared pool (e.g. after a worker crashed); the next call recreates it"""
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False)
+
+
+def shutdown_process_pool() -> None:
+    """Shut the shared pool down and wait for its workers"""
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+atexit.register(shutdown_process_pool)
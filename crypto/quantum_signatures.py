@@ -3,17 +3,71 @@ Post-Quantum Digital Signature System for QXChain
 Implements Dilithium-like signature scheme for quantum resistance
 """
 
+from __future__ import annotations
+
 import hashlib
+import operator
 import os
-from typing import Tuple, Optional
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, Optional
 import json
 from .kyber import Kyber1024
+from . import codec
+from .context_cache import ContextCache
+from .process_pool import default_workers, get_process_pool, reset_process_pool
+
+try:
+    import numpy as np
+    from . import polyvec
+except ImportError:  # Fall back to the pure-Python reference implementation
+    np = None
+    polyvec = None
+
+
+@dataclass
+class VerificationContext:
+    """Public-key material prepared once and reused by every verification"""
+    key_digest: bytes  # SHA3-256 of the packed public key
+    t: Any
+    A_hat: Any  # Matrix A in the NTT domain
+
+
+def _verify_groups(scheme: Any, groups: List[Tuple[bytes, List[Tuple[bytes, bytes]]]]) -> List[List[bool]]:
+    """Process-pool task: verify (message, signature) pairs grouped by public key"""
+    return [[scheme.verify(message, signature, public_key) for message, signature in pairs]
+            for public_key, pairs in groups]
+
+
+class SigningKey:
+    """
+    Private key unpacked and expanded once for repeated signing
+    Holds only key material: masks and commitments depend on the message
+    and are never cached.
+    """
+    
+    def __init__(self, scheme: Any, public_key: bytes, K_bytes: bytes, s1: Any, s2: Any, A_hat: Any):
+        self.scheme = scheme
+        self.public_key = public_key
+        self.key_digest = hashlib.sha3_256(public_key).digest()
+        self.K_bytes = K_bytes
+        self.s1 = s1
+        self.s2 = s2
+        self.A_hat = A_hat
+    
+    def sign(self, message: bytes) -> bytes:
+        """Sign a message; byte-identical to scheme.sign with the packed private key"""
+        return self.scheme._sign_prepared(message, self)
+    
+    def sign_many(self, messages: Iterable[bytes]) -> List[bytes]:
+        """Sign each message in order"""
+        return [self.scheme._sign_prepared(message, self) for message in messages]
 
 
-class QuantumSignature:
+class QuantumSignatureReference:
     """
     Post-quantum digital signature implementation
     Based on lattice-based cryptography principles
+    Pure-Python reference: polynomials are lists of ints
     """
     
     # Signature parameters
@@ -27,6 +81,31 @@ class QuantumSignature:
     GAMMA1 = 1 << 17
     GAMMA2 = (Q - 1) // 88
     
+    # Serialized field widths and sizes
+    T_BITS = 23  # t in [0, Q)
+    ETA_BITS = 3  # ETA - s in [0, 2*ETA]
+    Z_BITS = 18  # GAMMA1 - z in [0, 2*GAMMA1)
+    CHALLENGE_BYTES = 1 + TAU + (TAU + 7) // 8  # count, positions, sign bits
+    PUBLIC_KEY_BYTES = 32 + K * N * T_BITS // 8
+    PRIVATE_KEY_BYTES = 64 + (L + K) * N * ETA_BITS // 8 + K * N * T_BITS // 8
+    SIGNATURE_BYTES = CHALLENGE_BYTES + L * N * Z_BITS // 8
+    
+    # Matrix entries are sampled from 23-bit candidates; the first squeeze
+    # leaves room for rejections and more output is squeezed on demand
+    UNIFORM_BITS = 23
+    UNIFORM_STREAM_BYTES = 3 * (N + 16)
+    
+    # NTT parameters: 1753 is a primitive 512th root of unity mod Q, so
+    # x^256 + 1 splits completely and products become pointwise
+    NTT_ZETAS = [pow(1753, int(format(i, '08b')[::-1], 2), 8380417) for i in range(256)]
+    NTT_F = pow(256, -1, Q)  # Scaling factor for the inverse NTT
+    
+    # Prepared contexts for recently seen public keys
+    _verification_cache = ContextCache()
+    
+    # Batches smaller than this are verified inline rather than in the process pool
+    MIN_PARALLEL_BATCH = 8
+    
     @classmethod
     def keygen(cls) -> Tuple[bytes, bytes]:
         """
@@ -64,37 +143,52 @@ class QuantumSignature:
         Sign a message using the private key
         Returns: signature
         """
-        # Unpack private key
+        return cls.load_signing_key(private_key).sign(message)
+    
+    @classmethod
+    def load_signing_key(cls, private_key: bytes) -> SigningKey:
+        """Unpack a private key and expand its matrix A once, for signing many messages"""
         rho, K_bytes, s1, s2, t = cls._unpack_private_key(private_key)
+        return SigningKey(
+            scheme=cls,
+            public_key=cls._pack_public_key(rho, t),
+            K_bytes=K_bytes,
+            s1=s1,
+            s2=s2,
+            A_hat=cls._ntt_matrix(cls._expand_matrix(rho))
+        )
+    
+    @classmethod
+    def _sign_prepared(cls, message: bytes, key: SigningKey) -> bytes:
+        """Rejection-sampling signing loop over a prepared key"""
+        # Hash message, bound to the public key through its digest
+        mu = cls._shake256(key.key_digest + message, 64)
         
-        # Generate matrix A
-        A = cls._expand_matrix(rho)
-        
-        # Hash message
-        mu = cls._shake256(message + cls._pack_public_key(rho, t), 64)
+        # Mask seed bound to the message: masks reused across messages leak s1
+        rhoprime = cls._shake256(key.K_bytes + mu, 64)
         
         # Rejection sampling loop
         nonce = 0
         while True:
-            # Sample mask
-            y = cls._sample_mask(K_bytes + nonce.to_bytes(2, 'little'))
-            
-            # Compute w = Ay
-            w = cls._matrix_vector_mul(A, y)
-            w1 = cls._high_bits(w)
+            # Mask y, commitment w = Ay and its packed high bits
+            y = cls._sample_mask(rhoprime + nonce.to_bytes(2, 'little'))
+            nonce += 1
+            w = cls._matrix_ntt_vector_mul(key.A_hat, y)
+            w1_packed = cls._pack_w1(cls._high_bits(w))
             
             # Compute challenge
-            c = cls._sample_challenge(mu + cls._pack_w1(w1))
+            c = cls._sample_challenge(mu + w1_packed)
+            c_terms = cls._challenge_terms(c)
             
             # Compute z = y + cs1
-            z = cls._vector_add(y, cls._scalar_vector_mul(c, s1))
+            z = cls._center_vector(cls._vector_add(y, cls._sparse_scalar_vector_mul(c_terms, key.s1)))
             
             # Check bounds
             if cls._check_bounds(z, cls.GAMMA1 - cls.BETA):
                 continue
             
             # Compute r0 = low_bits(w - cs2)
-            cs2 = cls._scalar_vector_mul(c, s2)
+            cs2 = cls._sparse_scalar_vector_mul(c_terms, key.s2)
             w_minus_cs2 = cls._vector_sub(w, cs2)
             r0 = cls._low_bits(w_minus_cs2)
             
@@ -113,23 +207,20 @@ class QuantumSignature:
         Returns: True if valid, False otherwise
         """
         try:
-            # Unpack public key and signature
-            rho, t = cls._unpack_public_key(public_key)
+            # Unpacked key and expanded matrix A, cached per public key
+            ctx = cls._verification_cache.get_or_create(public_key, cls.prepare_verification_context)
             c, z = cls._unpack_signature(signature)
             
             # Check signature bounds
-            if not cls._check_bounds(z, cls.GAMMA1 - cls.BETA):
+            if cls._check_bounds(z, cls.GAMMA1 - cls.BETA):
                 return False
             
-            # Generate matrix A
-            A = cls._expand_matrix(rho)
-            
-            # Hash message
-            mu = cls._shake256(message + public_key, 64)
+            # Hash message, bound to the public key through its digest
+            mu = cls._shake256(ctx.key_digest + message, 64)
             
             # Compute Az - ct
-            Az = cls._matrix_vector_mul(A, z)
-            ct = cls._scalar_vector_mul(c, t)
+            Az = cls._matrix_ntt_vector_mul(ctx.A_hat, z)
+            ct = cls._sparse_scalar_vector_mul(cls._challenge_terms(c), ctx.t)
             w_prime = cls._vector_sub(Az, ct)
             
             # Compute w1'
@@ -139,10 +230,76 @@ class QuantumSignature:
             c_prime = cls._sample_challenge(mu + cls._pack_w1(w1_prime))
             
             return c == c_prime
-            
+        
         except Exception:
             return False
     
+    @classmethod
+    def prepare_verification_context(cls, public_key: bytes) -> VerificationContext:
+        """Unpack a public key and expand its matrix into NTT form"""
+        rho, t = cls._unpack_public_key(public_key)
+        return VerificationContext(
+            key_digest=hashlib.sha3_256(public_key).digest(),
+            t=t,
+            A_hat=cls._ntt_matrix(cls._expand_matrix(rho))
+        )
+    
+    @classmethod
+    def verification_cache(cls) -> ContextCache:
+        """LRU of prepared verification contexts (hit/miss counters, memory cap)"""
+        return cls._verification_cache
+    
+    @classmethod
+    def verify_batch(cls, items: Sequence[Tuple[bytes, bytes, bytes]],
+                     processes: Optional[int] = None) -> List[bool]:
+        """
+        Verify (message, signature, public_key) triples
+        Items are grouped by public key so each worker prepares a key's context
+        once, and the groups are spread over the shared process pool.
+        Returns one result per item, in order.
+        """
+        groups: Dict[bytes, List[int]] = {}
+        for index, (_, _, public_key) in enumerate(items):
+            groups.setdefault(public_key, []).append(index)
+        
+        workers = processes or default_workers()
+        pool = get_process_pool(workers) if len(items) >= cls.MIN_PARALLEL_BATCH else None
+        if pool is None:
+            return [cls.verify(message, signature, public_key) for message, signature, public_key in items]
+        
+        # Balance the work: split large groups, then hand each bundle the
+        # next group while keeping bundle sizes roughly equal
+        chunk = -(-len(items) // workers)
+        parts = []
+        for public_key, indices in groups.items():
+            for start in range(0, len(indices), chunk):
+                parts.append((public_key, indices[start:start + chunk]))
+        parts.sort(key=lambda part: len(part[1]), reverse=True)
+        bundles: List[List[Tuple[bytes, List[int]]]] = [[] for _ in range(workers)]
+        loads = [0] * workers
+        for part in parts:
+            target = loads.index(min(loads))
+            bundles[target].append(part)
+            loads[target] += len(part[1])
+        
+        results = [False] * len(items)
+        try:
+            futures = []
+            for bundle in bundles:
+                if not bundle:
+                    continue
+                payload = [(public_key, [items[i][:2] for i in indices]) for public_key, indices in bundle]
+                futures.append((bundle, pool.submit(_verify_groups, cls, payload)))
+            for bundle, future in futures:
+                for (_, indices), outcomes in zip(bundle, future.result()):
+                    for index, outcome in zip(indices, outcomes):
+                        results[index] = outcome
+        except Exception:
+            # Broken pool (worker crash, fork failure): finish inline
+            reset_process_pool()
+            return [cls.verify(message, signature, public_key) for message, signature, public_key in items]
+        return results
+    
     @staticmethod
     def _shake256(data: bytes, length: int) -> bytes:
         """SHAKE-256 extendable output function"""
@@ -164,24 +321,22 @@ class QuantumSignature:
     
     @classmethod
     def _sample_uniform_poly(cls, seed: bytes) -> list:
-        """Sample a uniform polynomial"""
-        poly = [0] * cls.N
-        stream = cls._shake256(seed, 3 * cls.N)
+        """Sample a uniform polynomial from 23-bit candidates, squeezing more output if needed"""
+        poly = []
+        mask = (1 << cls.UNIFORM_BITS) - 1
+        length = cls.UNIFORM_STREAM_BYTES
+        stream = cls._shake256(seed, length)
         
-        j = 0
-        for i in range(0, len(stream), 3):
-            if j >= cls.N:
-                break
-            
-            d1 = stream[i] + 256 * (stream[i + 1] % 16)
-            d2 = (stream[i + 1] // 16) + 16 * stream[i + 2]
+        i = 0
+        while len(poly) < cls.N:
+            if i + 3 > len(stream):
+                length *= 2
+                stream = cls._shake256(seed, length)
             
-            if d1 < cls.Q:
-                poly[j] = d1
-                j += 1
-            if d2 < cls.Q and j < cls.N:
-                poly[j] = d2
-                j += 1
+            candidate = int.from_bytes(stream[i:i + 3], 'little') & mask
+            if candidate < cls.Q:
+                poly.append(candidate)
+            i += 3
         
         return poly
     
@@ -245,7 +400,7 @@ class QuantumSignature:
                 if byte_pos < len(stream):
                     b += (stream[byte_pos] >> bit_offset) & 1
             
-            poly[i] = (a - b) % cls.Q
+            poly[i] = a - b
         return poly
     
     @classmethod
@@ -263,13 +418,23 @@ class QuantumSignature:
     @classmethod
     def _matrix_vector_mul(cls, A: list, v: list) -> list:
         """Matrix-vector multiplication"""
+        return cls._matrix_ntt_vector_mul(cls._ntt_matrix(A), v)
+    
+    @classmethod
+    def _ntt_matrix(cls, A: list) -> list:
+        """Transform every entry of a polynomial matrix to the NTT domain"""
+        return [[cls._ntt(poly) for poly in row] for row in A]
+    
+    @classmethod
+    def _matrix_ntt_vector_mul(cls, A_hat: list, v: list) -> list:
+        """Multiply an NTT-domain matrix by a coefficient-domain vector"""
+        v_hat = [cls._ntt(poly) for poly in v]
         result = []
-        for i in range(len(A)):
-            poly_sum = [0] * cls.N
-            for j in range(len(v)):
-                poly_prod = cls._poly_mul(A[i][j], v[j])
-                poly_sum = cls._poly_add(poly_sum, poly_prod)
-            result.append(poly_sum)
+        for row in A_hat:
+            acc = [0] * cls.N
+            for a_hat, p_hat in zip(row, v_hat):
+                acc = cls._poly_add(acc, cls._ntt_pointwise(a_hat, p_hat))
+            result.append(cls._inv_ntt(acc))
         return result
     
     @classmethod
@@ -283,9 +448,34 @@ class QuantumSignature:
         return [cls._poly_sub(a[i], b[i]) for i in range(len(a))]
     
     @classmethod
-    def _scalar_vector_mul(cls, c: list, v: list) -> list:
-        """Scalar-vector multiplication"""
-        return [cls._poly_mul(c, poly) for poly in v]
+    def _scalar_vector_mul(cls, c_hat: list, v: list) -> list:
+        """Scalar-vector multiplication with an NTT-domain scalar"""
+        return [cls._inv_ntt(cls._ntt_pointwise(c_hat, cls._ntt(poly))) for poly in v]
+    
+    @classmethod
+    def _challenge_terms(cls, c: list) -> list:
+        """Non-zero challenge coefficients as (position, sign) pairs"""
+        return [(pos, coeff) for pos, coeff in enumerate(c) if coeff]
+    
+    @classmethod
+    def _sparse_scalar_vector_mul(cls, terms: list, v: list) -> list:
+        """
+        Multiply each polynomial of v by a sparse challenge given as
+        (position, sign) pairs: one signed negacyclic rotation per term,
+        O(TAU * N) instead of a dense multiplication
+        """
+        result = []
+        for poly in v:
+            acc = [0] * cls.N
+            for pos, sign in terms:
+                src = poly if sign in (1, -1) else [sign * coeff for coeff in poly]
+                add, sub = (operator.sub, operator.add) if sign == -1 else (operator.add, operator.sub)
+                # x^pos * poly: the low N - pos coefficients move up by pos and
+                # the top pos wrap around to the bottom with their sign flipped
+                acc[:pos] = map(sub, acc[:pos], src[cls.N - pos:])
+                acc[pos:] = map(add, acc[pos:], src[:cls.N - pos])
+            result.append([coeff % cls.Q for coeff in acc])
+        return result
     
     @classmethod
     def _poly_add(cls, a: list, b: list) -> list:
@@ -299,7 +489,12 @@ class QuantumSignature:
     
     @classmethod
     def _poly_mul(cls, a: list, b: list) -> list:
-        """Polynomial multiplication (simplified)"""
+        """Polynomial multiplication using NTT"""
+        return cls._inv_ntt(cls._ntt_pointwise(cls._ntt(a), cls._ntt(b)))
+    
+    @classmethod
+    def _poly_mul_schoolbook(cls, a: list, b: list) -> list:
+        """Reference O(N^2) polynomial multiplication"""
         result = [0] * cls.N
         for i in range(cls.N):
             for j in range(cls.N):
@@ -309,6 +504,55 @@ class QuantumSignature:
                     result[i + j - cls.N] = (result[i + j - cls.N] - a[i] * b[j]) % cls.Q
         return result
     
+    @classmethod
+    def _ntt(cls, poly: list) -> list:
+        """Forward number-theoretic transform (Cooley-Tukey, bit-reversed output)"""
+        r = [coeff % cls.Q for coeff in poly]
+        zetas = cls.NTT_ZETAS
+        q = cls.Q
+        k = 0
+        length = 128
+        while length > 0:
+            for start in range(0, cls.N, 2 * length):
+                k += 1
+                zeta = zetas[k]
+                for j in range(start, start + length):
+                    t = zeta * r[j + length] % q
+                    r[j + length] = (r[j] - t) % q
+                    r[j] = (r[j] + t) % q
+            length >>= 1
+        return r
+    
+    @classmethod
+    def _inv_ntt(cls, poly: list) -> list:
+        """Inverse number-theoretic transform (Gentleman-Sande), includes 1/256 scaling"""
+        r = list(poly)
+        zetas = cls.NTT_ZETAS
+        q = cls.Q
+        k = cls.N
+        length = 1
+        while length < cls.N:
+            for start in range(0, cls.N, 2 * length):
+                k -= 1
+                zeta = q - zetas[k]
+                for j in range(start, start + length):
+                    t = r[j]
+                    r[j] = (t + r[j + length]) % q
+                    r[j + length] = zeta * (t - r[j + length]) % q
+            length <<= 1
+        return [coeff * cls.NTT_F % q for coeff in r]
+    
+    @classmethod
+    def _ntt_pointwise(cls, a: list, b: list) -> list:
+        """Pointwise product of two NTT-domain polynomials"""
+        return [(a[i] * b[i]) % cls.Q for i in range(cls.N)]
+    
+    @classmethod
+    def _center_vector(cls, v: list) -> list:
+        """Map coefficients from [0, Q) to the centered range (-Q/2, Q/2]"""
+        half = cls.Q // 2
+        return [[coeff - cls.Q if coeff > half else coeff for coeff in poly] for poly in v]
+    
     @classmethod
     def _high_bits(cls, v: list) -> list:
         """Extract high bits"""
@@ -319,15 +563,27 @@ class QuantumSignature:
         """Extract low bits"""
         return [cls._decompose_low(poly) for poly in v]
     
+    @classmethod
+    def _decompose(cls, coeff: int) -> Tuple[int, int]:
+        """Split coeff into (high, low) with coeff = high * 2*GAMMA2 + low mod Q"""
+        coeff %= cls.Q
+        low = coeff % (2 * cls.GAMMA2)
+        if low > cls.GAMMA2:
+            low -= 2 * cls.GAMMA2
+        if coeff - low == cls.Q - 1:
+            # Q - 1 wraps around to the same high bits as 0
+            return 0, low - 1
+        return (coeff - low) // (2 * cls.GAMMA2), low
+    
     @classmethod
     def _decompose_high(cls, poly: list) -> list:
         """Decompose polynomial to high bits"""
-        return [(coeff + cls.GAMMA2) // (2 * cls.GAMMA2) for coeff in poly]
+        return [cls._decompose(coeff)[0] for coeff in poly]
     
     @classmethod
     def _decompose_low(cls, poly: list) -> list:
         """Decompose polynomial to low bits"""
-        return [coeff % (2 * cls.GAMMA2) - cls.GAMMA2 for coeff in poly]
+        return [cls._decompose(coeff)[1] for coeff in poly]
     
     @classmethod
     def _check_bounds(cls, v: list, bound: int) -> bool:
@@ -338,117 +594,320 @@ class QuantumSignature:
                     return True
         return False
     
+    @classmethod
+    def _check_length(cls, data: bytes, expected: int, what: str) -> None:
+        """Reject encodings of the wrong size before decoding them"""
+        if len(data) != expected:
+            raise ValueError(f"Invalid {what} length: {len(data)} != {expected}")
+    
+    @classmethod
+    def _check_canonical(cls, coeffs, what: str) -> None:
+        """Reject coefficients outside [0, Q): the encoding must be unique"""
+        if max(coeffs) >= cls.Q:
+            raise ValueError(f"Invalid {what}: coefficient not reduced mod Q")
+    
+    @classmethod
+    def _split_polys(cls, coeffs: list, k: int) -> list:
+        """Split a flat coefficient list into k polynomials"""
+        return [coeffs[i * cls.N:(i + 1) * cls.N] for i in range(k)]
+    
+    @classmethod
+    def _pack_challenge(cls, c: list) -> bytes:
+        """
+        Pack the sparse challenge: nonzero count, ascending positions padded
+        to TAU bytes, then one sign bit per position (1 for +1)
+        """
+        positions = [i for i, coeff in enumerate(c) if coeff]
+        if len(positions) > cls.TAU:
+            raise ValueError("Challenge has too many nonzero coefficients")
+        signs = codec.pack_bits((1 if c[pos] > 0 else 0 for pos in positions), 1)
+        data = bytes([len(positions)]) + bytes(positions).ljust(cls.TAU, b'\x00')
+        return data + signs.ljust((cls.TAU + 7) // 8, b'\x00')
+    
+    @classmethod
+    def _unpack_challenge(cls, data: bytes) -> list:
+        """Unpack the sparse challenge, rejecting non-canonical encodings"""
+        count = data[0]
+        if count > cls.TAU:
+            raise ValueError("Challenge has too many nonzero coefficients")
+        positions = data[1:1 + count]
+        signs = codec.unpack_bits(data[1 + cls.TAU:], 1, count)
+        c = [0] * cls.N
+        for pos, sign in zip(positions, signs):
+            c[pos] = 1 if sign else -1
+        if cls._pack_challenge(c) != bytes(data[:cls.CHALLENGE_BYTES]):
+            raise ValueError("Non-canonical challenge encoding")
+        return c
+    
     @classmethod
     def _pack_public_key(cls, rho: bytes, t: list) -> bytes:
-        """Pack public key"""
-        data = rho
-        for poly in t:
-            for coeff in poly:
-                data += coeff.to_bytes(3, 'little')
-        return data
+        """Pack public key: rho followed by t as 23-bit coefficients"""
+        return rho + codec.pack_bits((coeff for poly in t for coeff in poly), cls.T_BITS)
     
     @classmethod
     def _unpack_public_key(cls, pk: bytes) -> Tuple[bytes, list]:
         """Unpack public key"""
-        rho = pk[:32]
-        t = []
-        offset = 32
-        for i in range(cls.K):
-            poly = []
-            for j in range(cls.N):
-                coeff = int.from_bytes(pk[offset:offset+3], 'little')
-                poly.append(coeff)
-                offset += 3
-            t.append(poly)
-        return rho, t
+        cls._check_length(pk, cls.PUBLIC_KEY_BYTES, "public key")
+        coeffs = codec.unpack_bits(pk[32:], cls.T_BITS, cls.K * cls.N)
+        cls._check_canonical(coeffs, "public key")
+        return pk[:32], cls._split_polys(coeffs, cls.K)
     
     @classmethod
     def _pack_private_key(cls, rho: bytes, K_bytes: bytes, s1: list, s2: list, t: list) -> bytes:
-        """Pack private key"""
-        data = rho + K_bytes
-        for poly in s1:
-            for coeff in poly:
-                data += coeff.to_bytes(2, 'little', signed=True)
-        for poly in s2:
-            for coeff in poly:
-                data += coeff.to_bytes(2, 'little', signed=True)
-        for poly in t:
-            for coeff in poly:
-                data += coeff.to_bytes(3, 'little')
-        return data
+        """Pack private key: rho, K, s1 and s2 as ETA - s in 3 bits, t in 23 bits"""
+        secret = (cls.ETA - coeff for poly in list(s1) + list(s2) for coeff in poly)
+        return (rho + K_bytes + codec.pack_bits(secret, cls.ETA_BITS)
+                + codec.pack_bits((coeff for poly in t for coeff in poly), cls.T_BITS))
     
     @classmethod
     def _unpack_private_key(cls, sk: bytes) -> Tuple[bytes, bytes, list, list, list]:
         """Unpack private key"""
-        rho = sk[:32]
-        K_bytes = sk[32:64]
-        
-        offset = 64
-        s1 = []
-        for i in range(cls.L):
-            poly = []
-            for j in range(cls.N):
-                coeff = int.from_bytes(sk[offset:offset+2], 'little', signed=True)
-                poly.append(coeff)
-                offset += 2
-            s1.append(poly)
-        
-        s2 = []
-        for i in range(cls.K):
-            poly = []
-            for j in range(cls.N):
-                coeff = int.from_bytes(sk[offset:offset+2], 'little', signed=True)
-                poly.append(coeff)
-                offset += 2
-            s2.append(poly)
-        
-        t = []
-        for i in range(cls.K):
-            poly = []
-            for j in range(cls.N):
-                coeff = int.from_bytes(sk[offset:offset+3], 'little')
-                poly.append(coeff)
-                offset += 3
-            t.append(poly)
-        
-        return rho, K_bytes, s1, s2, t
+        cls._check_length(sk, cls.PRIVATE_KEY_BYTES, "private key")
+        count = (cls.L + cls.K) * cls.N
+        secret = [cls.ETA - coeff for coeff in codec.unpack_bits(sk[64:], cls.ETA_BITS, count)]
+        s1 = cls._split_polys(secret[:cls.L * cls.N], cls.L)
+        s2 = cls._split_polys(secret[cls.L * cls.N:], cls.K)
+        offset = 64 + codec.packed_size(count, cls.ETA_BITS)
+        coeffs = codec.unpack_bits(sk[offset:], cls.T_BITS, cls.K * cls.N)
+        cls._check_canonical(coeffs, "private key")
+        return sk[:32], sk[32:64], s1, s2, cls._split_polys(coeffs, cls.K)
     
     @classmethod
     def _pack_signature(cls, c: list, z: list) -> bytes:
-        """Pack signature"""
-        data = b''
-        for coeff in c:
-            data += coeff.to_bytes(1, 'little', signed=True)
-        for poly in z:
-            for coeff in poly:
-                data += coeff.to_bytes(3, 'little', signed=True)
-        return data
+        """Pack signature: sparse challenge, then z as GAMMA1 - z in 18 bits"""
+        return cls._pack_challenge(c) + codec.pack_bits(
+            (cls.GAMMA1 - coeff for poly in z for coeff in poly), cls.Z_BITS)
     
     @classmethod
     def _unpack_signature(cls, sig: bytes) -> Tuple[list, list]:
         """Unpack signature"""
-        c = []
-        for i in range(cls.N):
-            coeff = int.from_bytes(sig[i:i+1], 'little', signed=True)
-            c.append(coeff)
-        
-        offset = cls.N
-        z = []
-        for i in range(cls.L):
-            poly = []
-            for j in range(cls.N):
-                coeff = int.from_bytes(sig[offset:offset+3], 'little', signed=True)
-                poly.append(coeff)
-                offset += 3
-            z.append(poly)
-        
-        return c, z
+        cls._check_length(sig, cls.SIGNATURE_BYTES, "signature")
+        c = cls._unpack_challenge(sig)
+        z = [cls.GAMMA1 - coeff for coeff in codec.unpack_bits(sig[cls.CHALLENGE_BYTES:], cls.Z_BITS, cls.L * cls.N)]
+        return c, cls._split_polys(z, cls.L)
     
     @classmethod
     def _pack_w1(cls, w1: list) -> bytes:
         """Pack w1 for hashing"""
-        data = b''
-        for poly in w1:
-            for coeff in poly:
-                data += coeff.to_bytes(1, 'little')
-        return data
\ No newline at end of file
+        return bytes(coeff for poly in w1 for coeff in poly)
+
+
+class QuantumSignatureNumPy(QuantumSignatureReference):
+    """
+    QuantumSignature with ndarray-backed polynomials
+    Vectors are (k, N) and matrices (K, L, N) int64 arrays, so each helper
+    processes a whole vector per call. The challenge polynomial stays a list
+    of ints. Byte formats match the reference.
+    """
+    
+    # Contexts hold ndarrays here, so they are not shared with the reference class
+    _verification_cache = ContextCache()
+    
+    if np is not None:
+        _ZETAS = polyvec.as_table(QuantumSignatureReference.NTT_ZETAS)
+    
+    @classmethod
+    def _expand_matrix(cls, rho: bytes) -> np.ndarray:
+        """Expand matrix A from seed rho, sampling all entries in one pass"""
+        seeds = [rho + bytes([j, i]) for i in range(cls.K) for j in range(cls.L)]
+        A = polyvec.sample_uniform_matrix(cls._shake256, seeds, cls.Q, cls.N,
+                                          cls.UNIFORM_BITS, cls.UNIFORM_STREAM_BYTES)
+        return A.reshape(cls.K, cls.L, cls.N)
+    
+    @classmethod
+    def _sample_uniform_poly(cls, seed: bytes) -> np.ndarray:
+        """Sample a uniform polynomial"""
+        return polyvec.sample_uniform_matrix(cls._shake256, [seed], cls.Q, cls.N,
+                                             cls.UNIFORM_BITS, cls.UNIFORM_STREAM_BYTES)[0]
+    
+    @classmethod
+    def _sample_in_ball(cls, seed: bytes, length: int) -> np.ndarray:
+        """Sample polynomials with coefficients in {-eta, ..., eta}"""
+        return np.stack([cls._cbd(cls._shake256(seed + bytes([i]), 64), cls.ETA) for i in range(length)])
+    
+    @classmethod
+    def _sample_mask(cls, seed: bytes) -> np.ndarray:
+        """Sample mask polynomials"""
+        return np.stack([cls._sample_gamma1(cls._shake256(seed + bytes([i]), 5 * cls.N)) for i in range(cls.L)])
+    
+    @classmethod
+    def _cbd(cls, stream: bytes, eta: int) -> np.ndarray:
+        """Centered binomial distribution"""
+        return polyvec.cbd(stream, eta, cls.N)
+    
+    @classmethod
+    def _sample_gamma1(cls, stream: bytes) -> np.ndarray:
+        """Sample polynomial with coefficients in [-gamma1, gamma1]"""
+        data = np.frombuffer(stream, dtype=np.uint8).astype(np.int64)
+        offsets = np.arange(cls.N) * 5 // 8
+        valid = offsets + 4 < len(data)
+        offsets = np.where(valid, offsets, 0)
+        val = data[offsets] | (data[offsets + 1] << 8) | (data[offsets + 2] << 16) | (data[offsets + 3] << 24)
+        return np.where(valid, val % (2 * cls.GAMMA1 + 1) - cls.GAMMA1, 0)
+    
+    @classmethod
+    def _ntt_matrix(cls, A: np.ndarray) -> np.ndarray:
+        """Transform every entry of a polynomial matrix to the NTT domain"""
+        return cls._ntt(A)
+    
+    @classmethod
+    def _matrix_ntt_vector_mul(cls, A_hat: np.ndarray, v: np.ndarray) -> np.ndarray:
+        """Multiply an NTT-domain matrix by a coefficient-domain vector"""
+        products = A_hat * cls._ntt(v)[None, :, :] % cls.Q
+        return cls._inv_ntt(products.sum(axis=1))
+    
+    @classmethod
+    def _vector_add(cls, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Vector addition"""
+        return (a + b) % cls.Q
+    
+    @classmethod
+    def _vector_sub(cls, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Vector subtraction"""
+        return (a - b) % cls.Q
+    
+    @classmethod
+    def _scalar_vector_mul(cls, c_hat: np.ndarray, v: np.ndarray) -> np.ndarray:
+        """Scalar-vector multiplication with an NTT-domain scalar"""
+        return cls._inv_ntt(c_hat * cls._ntt(v) % cls.Q)
+    
+    @classmethod
+    def _sparse_scalar_vector_mul(cls, terms: list, v: np.ndarray) -> np.ndarray:
+        """Multiply each polynomial of v by a sparse (position, sign) challenge"""
+        if not terms:
+            return np.zeros_like(v)
+        positions = np.array([pos for pos, _ in terms], dtype=np.int64)[:, None]
+        signs = np.array([sign for _, sign in terms], dtype=np.int64)[:, None]
+        columns = np.arange(cls.N)[None, :]
+        # Row r of the gather holds x^positions[r] * poly, wrapped terms negated
+        source = (columns - positions) % cls.N
+        factors = np.where(columns < positions, -signs, signs)
+        return (np.asarray(v)[..., source] * factors).sum(axis=-2) % cls.Q
+    
+    @classmethod
+    def _poly_add(cls, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Polynomial addition"""
+        return (a + b) % cls.Q
+    
+    @classmethod
+    def _poly_sub(cls, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Polynomial subtraction"""
+        return (a - b) % cls.Q
+    
+    @classmethod
+    def _poly_mul(cls, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Polynomial multiplication using NTT"""
+        return cls._inv_ntt(cls._ntt(a) * cls._ntt(b) % cls.Q)
+    
+    @classmethod
+    def _ntt(cls, poly: np.ndarray) -> np.ndarray:
+        """Forward NTT over the last axis"""
+        return polyvec.ntt(poly, cls._ZETAS, cls.Q, 1)
+    
+    @classmethod
+    def _inv_ntt(cls, poly: np.ndarray) -> np.ndarray:
+        """Inverse NTT over the last axis"""
+        return polyvec.inv_ntt(poly, cls._ZETAS, cls.Q, 1, cls.NTT_F)
+    
+    @classmethod
+    def _ntt_pointwise(cls, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Pointwise product of two NTT-domain polynomials"""
+        return a * b % cls.Q
+    
+    @classmethod
+    def _center_vector(cls, v: np.ndarray) -> np.ndarray:
+        """Map coefficients from [0, Q) to the centered range (-Q/2, Q/2]"""
+        return np.where(v > cls.Q // 2, v - cls.Q, v)
+    
+    @classmethod
+    def _decompose_array(cls, v: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized _decompose: split coefficients into (high, low) arrays"""
+        coeffs = v % cls.Q
+        low = coeffs % (2 * cls.GAMMA2)
+        low = np.where(low > cls.GAMMA2, low - 2 * cls.GAMMA2, low)
+        wrap = coeffs - low == cls.Q - 1
+        high = np.where(wrap, 0, (coeffs - low) // (2 * cls.GAMMA2))
+        return high, np.where(wrap, low - 1, low)
+    
+    @classmethod
+    def _high_bits(cls, v: np.ndarray) -> np.ndarray:
+        """Extract high bits"""
+        return cls._decompose_array(v)[0]
+    
+    @classmethod
+    def _low_bits(cls, v: np.ndarray) -> np.ndarray:
+        """Extract low bits"""
+        return cls._decompose_array(v)[1]
+    
+    @classmethod
+    def _decompose_high(cls, poly: np.ndarray) -> np.ndarray:
+        """Decompose polynomial to high bits"""
+        return cls._decompose_array(poly)[0]
+    
+    @classmethod
+    def _decompose_low(cls, poly: np.ndarray) -> np.ndarray:
+        """Decompose polynomial to low bits"""
+        return cls._decompose_array(poly)[1]
+    
+    @classmethod
+    def _check_bounds(cls, v: np.ndarray, bound: int) -> bool:
+        """Check if vector coefficients are within bounds"""
+        return bool(np.any(np.abs(v) >= bound))
+    
+    @classmethod
+    def _check_canonical(cls, coeffs: np.ndarray, what: str) -> None:
+        """Reject coefficients outside [0, Q): the encoding must be unique"""
+        if coeffs.max() >= cls.Q:
+            raise ValueError(f"Invalid {what}: coefficient not reduced mod Q")
+    
+    @classmethod
+    def _pack_public_key(cls, rho: bytes, t: np.ndarray) -> bytes:
+        """Pack public key: rho followed by t as 23-bit coefficients"""
+        return rho + polyvec.pack_bits(t, cls.T_BITS)
+    
+    @classmethod
+    def _unpack_public_key(cls, pk: bytes) -> Tuple[bytes, np.ndarray]:
+        """Unpack public key"""
+        cls._check_length(pk, cls.PUBLIC_KEY_BYTES, "public key")
+        t = polyvec.unpack_bits(memoryview(pk)[32:], cls.T_BITS, cls.K * cls.N).reshape(cls.K, cls.N)
+        cls._check_canonical(t, "public key")
+        return pk[:32], t
+    
+    @classmethod
+    def _pack_private_key(cls, rho: bytes, K_bytes: bytes, s1: np.ndarray, s2: np.ndarray, t: np.ndarray) -> bytes:
+        """Pack private key: rho, K, s1 and s2 as ETA - s in 3 bits, t in 23 bits"""
+        secret = cls.ETA - np.concatenate((np.asarray(s1), np.asarray(s2)))
+        return rho + K_bytes + polyvec.pack_bits(secret, cls.ETA_BITS) + polyvec.pack_bits(t, cls.T_BITS)
+    
+    @classmethod
+    def _unpack_private_key(cls, sk: bytes) -> Tuple[bytes, bytes, np.ndarray, np.ndarray, np.ndarray]:
+        """Unpack private key"""
+        cls._check_length(sk, cls.PRIVATE_KEY_BYTES, "private key")
+        count = (cls.L + cls.K) * cls.N
+        secret = cls.ETA - polyvec.unpack_bits(memoryview(sk)[64:], cls.ETA_BITS, count).reshape(cls.L + cls.K, cls.N)
+        offset = 64 + codec.packed_size(count, cls.ETA_BITS)
+        t = polyvec.unpack_bits(memoryview(sk)[offset:], cls.T_BITS, cls.K * cls.N).reshape(cls.K, cls.N)
+        cls._check_canonical(t, "private key")
+        return sk[:32], sk[32:64], secret[:cls.L], secret[cls.L:], t
+    
+    @classmethod
+    def _pack_signature(cls, c: list, z: np.ndarray) -> bytes:
+        """Pack signature: sparse challenge, then z as GAMMA1 - z in 18 bits"""
+        return cls._pack_challenge(c) + polyvec.pack_bits(cls.GAMMA1 - z, cls.Z_BITS)
+    
+    @classmethod
+    def _unpack_signature(cls, sig: bytes) -> Tuple[list, np.ndarray]:
+        """Unpack signature"""
+        cls._check_length(sig, cls.SIGNATURE_BYTES, "signature")
+        c = cls._unpack_challenge(sig)
+        z = cls.GAMMA1 - polyvec.unpack_bits(memoryview(sig)[cls.CHALLENGE_BYTES:], cls.Z_BITS, cls.L * cls.N)
+        return c, z.reshape(cls.L, cls.N)
+    
+    @classmethod
+    def _pack_w1(cls, w1: np.ndarray) -> bytes:
+        """Pack w1 for hashing"""
+        return polyvec.pack_ints(w1, 1)
+
+
+# Default implementation: vectorized when numpy is available
+QuantumSignature = QuantumSignatureNumPy if np is not None else QuantumSignatureReference
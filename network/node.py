@@ -12,6 +12,7 @@ import time
 
 from ..core.blockchain import QXBlockchain
 from ..core.block import Block, Transaction
+from ..core.miner import MiningJob
 
 
 class QXNode:
@@ -26,6 +27,7 @@ class QXNode:
         self.blockchain = QXBlockchain()
         self.peers: Set[str] = set()
         self.is_mining = False
+        self.mining_job: Optional[MiningJob] = None
         self.sync_in_progress = False
         
         # Setup logging
@@ -74,10 +76,9 @@ class QXNode:
     
     async def get_chain(self, request):
         """Get the blockchain"""
-        return web.json_response({
-            'chain': [block.to_dict() for block in self.blockchain.chain],
-            'length': len(self.blockchain.chain)
-        })
+        chain = self.blockchain.chain
+        body = b'{"chain": ' + chain.to_json() + b', "length": %d}' % len(chain)
+        return web.Response(body=body, content_type='application/json')
     
     async def get_peers(self, request):
         """Get connected peers"""
@@ -131,7 +132,7 @@ class QXNode:
             tx_data = data.get('transaction')
             
             if tx_data:
-                transaction = Transaction(**tx_data)
+                transaction = Transaction.from_dict(tx_data)
                 
                 if self.blockchain.add_transaction(transaction):
                     self.logger.info(f"Received transaction {transaction.transaction_hash}")
@@ -176,6 +177,8 @@ class QXNode:
     async def stop_mining(self, request):
         """Stop mining"""
         self.is_mining = False
+        if self.mining_job is not None:
+            self.mining_job.cancel()
         self.logger.info("Stopped mining")
         
         return web.json_response({'message': 'Mining stopped'})
@@ -183,38 +186,14 @@ class QXNode:
     async def validate_and_add_block(self, block: Block) -> bool:
         """Validate and add a block to the chain"""
         try:
-            # Check if block is valid
-            if not block.is_valid():
+            # Check proof-of-work and signatures off the event loop
+            loop = asyncio.get_running_loop()
+            if not await loop.run_in_executor(None, block.is_valid):
                 return False
             
-            # Check if block extends the current chain
-            latest_block = self.blockchain.get_latest_block()
-            if block.previous_hash != latest_block.block_hash:
-                return False
-            
-            if block.index != latest_block.index + 1:
-                return False
-            
-            # Add block to chain
-            self.blockchain.chain.append(block)
-            
-            # Update balances
-            for tx in block.transactions:
-                if tx.sender != "0":
-                    self.blockchain.balances[tx.sender] -= (tx.amount + tx.fee)
-                self.blockchain.balances[tx.recipient] = self.blockchain.balances.get(tx.recipient, 0) + tx.amount
-                
-                if tx.fee > 0:
-                    self.blockchain.balances[block.miner_address] = self.blockchain.balances.get(block.miner_address, 0) + tx.fee
-            
-            # Remove mined transactions from pending
-            mined_hashes = {tx.transaction_hash for tx in block.transactions}
-            self.blockchain.pending_transactions = [
-                tx for tx in self.blockchain.pending_transactions 
-                if tx.transaction_hash not in mined_hashes
-            ]
-            
-            return True
+            # Connect it if it extends the current chain; the chain cancels a
+            # mining job for the same height, which restarts on a fresh template
+            return self.blockchain.add_block(block)
             
         except Exception as e:
             self.logger.error(f"Error validating block: {e}")
@@ -222,15 +201,14 @@ class QXNode:
     
     async def broadcast_block(self, block: Block, exclude_peer: str = None):
         """Broadcast a block to all peers"""
-        message = {
-            'block': block.to_dict()
-        }
+        body = b'{"block": ' + block.to_json() + b'}'
+        headers = {'Content-Type': 'application/json'}
         
         for peer in self.peers:
             if peer != exclude_peer:
                 try:
                     async with aiohttp.ClientSession() as session:
-                        async with session.post(f"{peer}/blocks/receive", json=message) as response:
+                        async with session.post(f"{peer}/blocks/receive", data=body, headers=headers) as response:
                             if response.status == 200:
                                 self.logger.debug(f"Broadcasted block to {peer}")
                 except Exception as e:
@@ -253,44 +231,22 @@ class QXNode:
                     self.logger.error(f"Failed to broadcast transaction to {peer}: {e}")
     
     async def sync_with_network(self):
-        """Sync blockchain with the network"""
-        longest_chain = self.blockchain.chain
-        longest_length = len(longest_chain)
-        
+        """Sync blockchain with the network, adopting the valid chain with the most work"""
         for peer in self.peers:
             try:
                 chain = await self.get_peer_chain(peer)
-                if chain and len(chain) > longest_length:
-                    # Validate the longer chain
-                    temp_blockchain = QXBlockchain()
-                    temp_blockchain.chain = [Block.from_dict(block_data) for block_data in chain]
-                    
-                    if temp_blockchain.validate_chain():
-                        longest_chain = temp_blockchain.chain
-                        longest_length = len(longest_chain)
-                        self.logger.info(f"Found longer valid chain from {peer}")
+                if chain and self.blockchain.replace_chain([Block.from_dict(block_data) for block_data in chain]):
+                    self.logger.info(f"Adopted heavier valid chain from {peer} (length {len(chain)})")
             
             except Exception as e:
                 self.logger.error(f"Error syncing with peer {peer}: {e}")
-        
-        # Replace chain if we found a longer valid one
-        if longest_length > len(self.blockchain.chain):
-            self.blockchain.chain = longest_chain
-            self.blockchain.recalculate_balances()
-            self.logger.info(f"Blockchain updated to length {longest_length}")
     
     async def sync_with_peer(self, peer_url: str):
         """Sync with a specific peer"""
         try:
             chain = await self.get_peer_chain(peer_url)
-            if chain and len(chain) > len(self.blockchain.chain):
-                temp_blockchain = QXBlockchain()
-                temp_blockchain.chain = [Block.from_dict(block_data) for block_data in chain]
-                
-                if temp_blockchain.validate_chain():
-                    self.blockchain.chain = temp_blockchain.chain
-                    self.blockchain.recalculate_balances()
-                    self.logger.info(f"Synced with peer {peer_url}")
+            if chain and self.blockchain.replace_chain([Block.from_dict(block_data) for block_data in chain]):
+                self.logger.info(f"Synced with peer {peer_url}")
         
         except Exception as e:
             self.logger.error(f"Error syncing with peer {peer_url}: {e}")
@@ -325,8 +281,16 @@ class QXNode:
                 if self.is_mining and self.blockchain.pending_transactions and hasattr(self, 'miner_address'):
                     self.logger.info("Mining new block...")
                     
-                    # Mine a new block
-                    new_block = self.blockchain.mine_pending_transactions(self.miner_address)
+                    # Mine a new block off the event loop
+                    self.mining_job = MiningJob(self.blockchain, self.miner_address)
+                    try:
+                        new_block = await self.mining_job.run()
+                    finally:
+                        self.mining_job = None
+                    
+                    if new_block is None:
+                        self.logger.info("Mining job cancelled or superseded")
+                        continue
                     
                     self.logger.info(f"Mined block {new_block.index} with hash {new_block.block_hash}")
                     
@@ -349,4 +313,6 @@ class QXNode:
     async def shutdown(self):
         """Shutdown the node"""
         self.is_mining = False
+        if self.mining_job is not None:
+            self.mining_job.cancel()
         self.logger.info(f"Node {self.node_id} shutting down")
\ No newline at end of file
@@ -15,6 +15,9 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from api.server import app, blockchain, broadcast_update
 from core.blockchain import QXBlockchain
+from core.block_store import FileBlockStore
+from core.miner import MiningJob
+from crypto.backends import ENV_VAR, registered_backends, select_backend
 import logging
 
 # Configure logging
@@ -66,9 +69,21 @@ def main():
     parser.add_argument("--create-wallet", type=str, help="Create a wallet with given user ID")
     parser.add_argument("--mine", action="store_true", help="Start mining mode")
     parser.add_argument("--miner-address", type=str, help="Miner address for mining rewards")
+    parser.add_argument("--crypto-backend", type=str, choices=["auto"] + registered_backends(),
+                        help=f"Crypto backend to use (default: ${ENV_VAR} or auto)")
+    parser.add_argument("--block-dir", type=str,
+                        help="Keep block bodies in this directory instead of memory, loading the chain already in it")
     
     args = parser.parse_args()
     
+    # Select the crypto backend before any keys are generated or verified
+    backend = select_backend(args.crypto_backend)
+    logger.info(f"Crypto backend: {backend.name} ({backend.description})")
+    
+    if args.block_dir:
+        blockchain.set_block_store(FileBlockStore(args.block_dir))
+        logger.info(f"Block bodies stored in {args.block_dir} ({len(blockchain.headers)} blocks)")
+    
     # Parse peers
     peers = []
     if args.peers:
@@ -103,7 +118,9 @@ def main():
                 try:
                     if blockchain.pending_transactions:
                         print(f"Mining block with {len(blockchain.pending_transactions)} transactions...")
-                        block = blockchain.mine_pending_transactions(args.miner_address)
+                        block = await MiningJob(blockchain, args.miner_address).run()
+                        if block is None:
+                            continue
                         print(f"Block mined! Hash: {block.block_hash}")
                         
                         # Broadcast the new block
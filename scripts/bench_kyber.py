@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+QXChain Kyber1024 Microbenchmark
+Times the public KEM operations and the internals they are built from,
+reports ops/sec and p50/p99 latency, and optionally checks the results
+against a stored baseline
+
+Usage:
+    python scripts/bench_kyber.py --output bench.json
+    python scripts/bench_kyber.py --baseline bench.json --max-regression 15
+"""
+
+import sys
+import os
+import json
+import time
+import platform
+import argparse
+from typing import Callable, Dict, List, Optional
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crypto.kyber import Kyber1024, Kyber1024Reference
+
+try:
+    from crypto.kyber import Kyber1024NumPy
+except ImportError:
+    Kyber1024NumPy = None
+
+BACKENDS = {
+    'default': Kyber1024,
+    'reference': Kyber1024Reference,
+    'numpy': Kyber1024NumPy
+}
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def measure(fn: Callable[[], object], iterations: int, warmup: int) -> Dict[str, float]:
+    """Time iterations calls of fn after warmup untimed calls"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    total = sum(samples)
+    return {
+        'iterations': iterations,
+        'ops_per_sec': iterations / total if total else float('inf'),
+        'mean_ms': total / iterations * 1000,
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000
+    }
+
+
+def build_cases(kem) -> Dict[str, Callable[[], object]]:
+    """Benchmark cases for one Kyber1024 implementation, keyed by name"""
+    pk, sk = kem.keygen()
+    ct, _ = kem.encaps(pk)
+    rho = pk[:32]
+    seed = os.urandom(32)
+    A = kem._gen_matrix(rho)
+    s = kem._sample_poly_cbd(seed, kem.ETA1, kem.K)
+    t, _ = kem._unpack_public_key(pk)
+    u, v = kem._unpack_ciphertext(ct)
+    stream = kem._shake128(seed, 64 * kem.ETA1)
+
+    def encaps_cold():
+        kem.encapsulation_cache().clear()
+        return kem.encaps(pk)
+
+    return {
+        'keygen': kem.keygen,
+        'encaps': lambda: kem.encaps(pk),
+        'encaps_cold': encaps_cold,
+        'decaps': lambda: kem.decaps(ct, sk),
+        '_gen_matrix': lambda: kem._gen_matrix(rho),
+        '_poly_mul': lambda: kem._poly_mul(A[0][0], s[0]),
+        '_cbd': lambda: kem._cbd(stream, kem.ETA1),
+        '_pack_public_key': lambda: kem._pack_public_key(t, rho),
+        '_unpack_public_key': lambda: kem._unpack_public_key(pk),
+        '_pack_ciphertext': lambda: kem._pack_ciphertext(u, v),
+        '_unpack_ciphertext': lambda: kem._unpack_ciphertext(ct)
+    }
+
+
+def run(kem, iterations: int, warmup: int, only: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    """Run every (or every selected) case and collect its statistics"""
+    results = {}
+    for name, fn in build_cases(kem).items():
+        if only and name not in only:
+            continue
+        results[name] = measure(fn, iterations, warmup)
+        stats = results[name]
+        print(f"  {name:<20} {stats['ops_per_sec']:>10.1f} ops/s   "
+              f"p50 {stats['p50_ms']:>8.3f} ms   p99 {stats['p99_ms']:>8.3f} ms")
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            max_regression: float) -> List[str]:
+    """Names of cases whose throughput fell more than max_regression percent below baseline"""
+    regressions = []
+    for name, stats in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        change = (stats['ops_per_sec'] - reference['ops_per_sec']) / reference['ops_per_sec'] * 100
+        marker = '❌' if change < -max_regression else '✅'
+        print(f"  {marker} {name:<20} {change:+7.1f}% vs baseline")
+        if change < -max_regression:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    """Benchmark Kyber1024 and optionally enforce a regression budget"""
+    parser = argparse.ArgumentParser(description='Kyber1024 microbenchmark')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='default',
+                        help='Implementation to benchmark')
+    parser.add_argument('--iterations', type=int, default=50, help='Timed calls per case')
+    parser.add_argument('--warmup', type=int, default=3, help='Untimed calls per case')
+    parser.add_argument('--only', nargs='*', help='Run only these cases')
+    parser.add_argument('--output', help='Write results as JSON to this path')
+    parser.add_argument('--baseline', help='JSON results from an earlier run to compare against')
+    parser.add_argument('--max-regression', type=float, default=10.0,
+                        help='Fail when ops/sec drops more than this percent below the baseline')
+    args = parser.parse_args()
+
+    kem = BACKENDS[args.backend]
+    if kem is None:
+        print(f"❌ Backend '{args.backend}' is not available (is numpy installed?)")
+        return 2
+
+    print(f"⏱️  Benchmarking {kem.__name__} ({args.iterations} iterations, {args.warmup} warmup)")
+    results = run(kem, args.iterations, args.warmup, args.only)
+
+    report = {
+        'implementation': kem.__name__,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'timestamp': time.time(),
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"\n📊 Comparing against {args.baseline} ({baseline.get('implementation', 'unknown')})")
+        regressions = compare(results, baseline.get('results', {}), args.max_regression)
+        if regressions:
+            print(f"❌ {len(regressions)} case(s) regressed more than {args.max_regression}%: {', '.join(regressions)}")
+            return 1
+        print("✅ No regressions")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+QXChain Transaction Memory Benchmark
+Builds the same set of signed transactions as dataclass Transactions and
+as CompactTransactions (witness inline, in a WitnessStore, and dropped)
+and reports the memory each representation holds per transaction.
+CompactTransaction keeps the hash as 32 raw bytes, interned addresses and
+integer amounts in base units; it is a candidate layout for a pruned
+transaction index and is not used by the node
+
+Usage:
+    python scripts/bench_tx_memory.py --count 20000 --senders 100
+"""
+
+import sys
+import os
+import gc
+import importlib
+import json
+import time
+import platform
+import argparse
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+# core uses package-relative imports, so load the repository as a package
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(ROOT))
+PACKAGE = os.path.basename(ROOT)
+
+Transaction = importlib.import_module(f"{PACKAGE}.core.block").Transaction
+QuantumSignature = importlib.import_module(f"{PACKAGE}.crypto.quantum_signatures").QuantumSignature
+encoding = importlib.import_module(f"{PACKAGE}.core.encoding")
+ENCODING_VERSION, amount_to_units, units_to_amount = (encoding.ENCODING_VERSION, encoding.amount_to_units,
+                                                      encoding.units_to_amount)
+
+
+class WitnessStore:
+    """
+    Out-of-line signatures and public keys keyed by raw transaction hash
+    Identical public keys are stored once, so a sender's key costs memory
+    only for their first transaction.
+    """
+    
+    def __init__(self):
+        self._witnesses: Dict[bytes, Tuple[Optional[bytes], Optional[bytes]]] = {}
+        self._public_keys: Dict[bytes, bytes] = {}
+    
+    def __len__(self) -> int:
+        return len(self._witnesses)
+    
+    def put(self, tx_hash: bytes, signature: Optional[bytes], public_key: Optional[bytes]) -> None:
+        if public_key is not None:
+            public_key = self._public_keys.setdefault(public_key, public_key)
+        self._witnesses[tx_hash] = (signature, public_key)
+    
+    def get(self, tx_hash: bytes) -> Tuple[Optional[bytes], Optional[bytes]]:
+        """(signature, public_key) for a transaction, (None, None) if unknown"""
+        return self._witnesses.get(tx_hash, (None, None))
+    
+    def discard(self, tx_hash: bytes) -> None:
+        self._witnesses.pop(tx_hash, None)
+
+
+class CompactTransaction:
+    """
+    Slotted representation of a confirmed transaction
+    Converts losslessly to and from Transaction.
+    """
+    
+    __slots__ = ('tx_hash', 'sender', 'recipient', 'amount_units', 'fee_units', 'timestamp',
+                 'data', 'signature', 'public_key', 'version')
+    
+    def __init__(self, tx_hash: bytes, sender: str, recipient: str, amount_units: int, fee_units: int,
+                 timestamp: float, data: Optional[str] = None, signature: Optional[bytes] = None,
+                 public_key: Optional[bytes] = None, version: int = ENCODING_VERSION):
+        self.tx_hash = tx_hash
+        self.sender = sys.intern(sender)
+        self.recipient = sys.intern(recipient)
+        self.amount_units = amount_units
+        self.fee_units = fee_units
+        self.timestamp = timestamp
+        self.data = data
+        self.signature = signature
+        self.public_key = public_key
+        self.version = version
+    
+    @property
+    def transaction_hash(self) -> str:
+        return self.tx_hash.hex()
+    
+    @property
+    def amount(self) -> float:
+        return units_to_amount(self.amount_units)
+    
+    @property
+    def fee(self) -> float:
+        return units_to_amount(self.fee_units)
+    
+    @classmethod
+    def from_transaction(cls, tx: Transaction, store: Optional[WitnessStore] = None) -> 'CompactTransaction':
+        """Compact a transaction, moving its signature and public key to store if one is given"""
+        compact = cls(
+            tx_hash=bytes.fromhex(tx.transaction_hash),
+            sender=tx.sender,
+            recipient=tx.recipient,
+            amount_units=amount_to_units(tx.amount),
+            fee_units=amount_to_units(tx.fee),
+            timestamp=tx.timestamp,
+            data=tx.data,
+            signature=tx.signature,
+            public_key=tx.public_key,
+            version=tx.version
+        )
+        if store is not None:
+            compact.detach_witness(store)
+        return compact
+    
+    def to_transaction(self, store: Optional[WitnessStore] = None) -> Transaction:
+        """Expand to a Transaction, taking a detached signature and public key from store"""
+        signature, public_key = self.signature, self.public_key
+        if signature is None and public_key is None and store is not None:
+            signature, public_key = store.get(self.tx_hash)
+        return Transaction(
+            sender=self.sender,
+            recipient=self.recipient,
+            amount=self.amount,
+            fee=self.fee,
+            timestamp=self.timestamp,
+            data=self.data,
+            signature=signature,
+            public_key=public_key,
+            transaction_hash=self.transaction_hash,
+            version=self.version
+        )
+    
+    def detach_witness(self, store: WitnessStore) -> None:
+        """Move the signature and public key to store"""
+        if self.signature is not None or self.public_key is not None:
+            store.put(self.tx_hash, self.signature, self.public_key)
+        self.drop_witness()
+    
+    def drop_witness(self) -> None:
+        """Forget the signature and public key, e.g. for pruned blocks"""
+        self.signature = None
+        self.public_key = None
+
+
+def make_transaction(i: int, senders: int, public_keys: List[bytes]) -> Transaction:
+    """
+    Transaction i with fresh strings and buffers, as decoding a block yields
+    Public keys repeat per sender, signatures are unique.
+    """
+    sender = i % senders
+    return Transaction(
+        sender=f"QX{sender:034d}",
+        recipient=f"QX{(i * 7919) % senders:034d}",
+        amount=float(i % 1000) + 0.5,
+        fee=0.01,
+        timestamp=1700000000.0 + i,
+        signature=os.urandom(QuantumSignature.SIGNATURE_BYTES),
+        public_key=bytes(bytearray(public_keys[sender]))
+    )
+
+
+def measure(build: Callable[[], object], count: int) -> Dict[str, float]:
+    """Memory still allocated after build() returns, per transaction"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return {'bytes_total': held, 'bytes_per_tx': held / count}
+
+
+def build_cases(count: int, senders: int) -> Dict[str, Callable[[], object]]:
+    """Representations to compare, keyed by name"""
+    public_keys = [os.urandom(QuantumSignature.PUBLIC_KEY_BYTES) for _ in range(senders)]
+
+    def transactions():
+        return [make_transaction(i, senders, public_keys) for i in range(count)]
+
+    def compact_inline():
+        return [CompactTransaction.from_transaction(make_transaction(i, senders, public_keys))
+                for i in range(count)]
+
+    def compact_store():
+        store = WitnessStore()
+        return store, [CompactTransaction.from_transaction(make_transaction(i, senders, public_keys), store)
+                       for i in range(count)]
+
+    def compact_pruned():
+        compacts = []
+        for i in range(count):
+            compact = CompactTransaction.from_transaction(make_transaction(i, senders, public_keys))
+            compact.drop_witness()
+            compacts.append(compact)
+        return compacts
+
+    return {
+        'transaction': transactions,
+        'compact_inline': compact_inline,
+        'compact_store': compact_store,
+        'compact_pruned': compact_pruned
+    }
+
+
+def main():
+    """Report bytes per transaction for each representation"""
+    parser = argparse.ArgumentParser(description='Transaction memory benchmark')
+    parser.add_argument('--count', type=int, default=20000, help='Transactions per representation')
+    parser.add_argument('--senders', type=int, default=100, help='Distinct sender key pairs')
+    parser.add_argument('--output', help='Write results as JSON to this path')
+    args = parser.parse_args()
+
+    print(f"🧮 Measuring {args.count} transactions from {args.senders} senders")
+    results = {}
+    for name, build in build_cases(args.count, args.senders).items():
+        results[name] = measure(build, args.count)
+        change = results[name]['bytes_per_tx'] / results['transaction']['bytes_per_tx'] * 100
+        print(f"  {name:<16} {results[name]['bytes_per_tx']:>10.0f} bytes/tx   {change:6.1f}% of transaction")
+
+    if args.output:
+        report = {
+            'count': args.count,
+            'senders': args.senders,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'timestamp': time.time(),
+            'results': results
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+QXChain Differential Conformance Harness
+Runs the pure-Python reference crypto and an accelerated backend side by side
+on seeded keys and messages, asserts byte-identical outputs and
+cross-verification, and reports the per-primitive speedup
+
+Usage:
+    python scripts/conformance.py --cases 20 --seed 7
+    python scripts/conformance.py --targets kyber signature legacy --output conformance.json
+"""
+
+import sys
+import os
+import json
+import time
+import hashlib
+import argparse
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Tuple
+from unittest import mock
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crypto import kyber, quantum_signatures
+from crypto import signatures as legacy_signatures
+
+# crypto/signatures.py is the unused pre-backend scheme and is known broken:
+# _sample_in_ball returns one polynomial where keygen needs vectors s1 and s2,
+# and its hint cannot recover w1 from Az - ct. Nothing imports it, so the
+# target runs as an expected failure and does not affect the exit status.
+LEGACY_XFAIL = ("crypto/signatures.py cannot round-trip: keygen samples single "
+                "polynomials for secret vectors and verify's hint does not recover w1")
+
+
+@contextmanager
+def seeded_urandom(seed: bytes):
+    """Replace os.urandom with a deterministic SHAKE-256 stream for the duration"""
+    counter = [0]
+
+    def urandom(n: int) -> bytes:
+        counter[0] += 1
+        return hashlib.shake_256(seed + counter[0].to_bytes(8, 'little')).digest(n)
+
+    with mock.patch('os.urandom', side_effect=urandom):
+        yield
+
+
+class Timer:
+    """Accumulates wall time per (implementation, primitive)"""
+
+    def __init__(self):
+        self.totals: Dict[str, Dict[str, float]] = {}
+
+    def call(self, impl: str, primitive: str, fn: Callable, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+        per_impl = self.totals.setdefault(impl, {})
+        per_impl[primitive] = per_impl.get(primitive, 0.0) + elapsed
+        return result
+
+
+def case_seed(seed: int, target: str, index: int) -> bytes:
+    """Seed for one case, independent of which other targets run"""
+    return hashlib.sha3_256(f"{seed}:{target}:{index}".encode()).digest()
+
+
+def check_kyber(reference, accelerated, seed: bytes, timer: Timer) -> List[str]:
+    """Compare one seeded keygen/encaps/decaps run; returns mismatch descriptions"""
+    outputs = {}
+    for impl in (reference, accelerated):
+        with seeded_urandom(seed):
+            pk, sk = timer.call(impl.__name__, 'keygen', impl.keygen)
+            impl.encapsulation_cache().clear()
+            ct, ss = timer.call(impl.__name__, 'encaps', impl.encaps, pk)
+        outputs[impl] = (pk, sk, ct, ss)
+
+    failures = []
+    for name, ref_value, acc_value in zip(('public key', 'private key', 'ciphertext', 'shared secret'),
+                                          outputs[reference], outputs[accelerated]):
+        if ref_value != acc_value:
+            failures.append(f"{name} differs")
+
+    # Each implementation must decapsulate the other's ciphertext
+    for impl, other in ((reference, accelerated), (accelerated, reference)):
+        _, sk, _, _ = outputs[impl]
+        _, _, ct, ss = outputs[other]
+        if timer.call(impl.__name__, 'decaps', impl.decaps, ct, sk) != ss:
+            failures.append(f"{impl.__name__} cannot decapsulate {other.__name__} ciphertext")
+    return failures
+
+
+def check_signature(reference, accelerated, seed: bytes, timer: Timer) -> List[str]:
+    """Compare one seeded keygen/sign run and cross-verify; returns mismatch descriptions"""
+    message = hashlib.shake_256(seed + b'message').digest(1 + seed[0])
+    outputs = {}
+    for impl in (reference, accelerated):
+        with seeded_urandom(seed):
+            pk, sk = timer.call(impl.__name__, 'keygen', impl.keygen)
+        sig = timer.call(impl.__name__, 'sign', impl.sign, message, sk)
+        outputs[impl] = (pk, sk, sig)
+
+    failures = []
+    for name, ref_value, acc_value in zip(('public key', 'private key', 'signature'),
+                                          outputs[reference], outputs[accelerated]):
+        if ref_value != acc_value:
+            failures.append(f"{name} differs")
+
+    # Every implementation must accept every signature and reject a tampered message
+    for impl in (reference, accelerated):
+        impl.verification_cache().clear()
+        for other in (reference, accelerated):
+            pk, _, sig = outputs[other]
+            if not timer.call(impl.__name__, 'verify', impl.verify, message, sig, pk):
+                failures.append(f"{impl.__name__} rejects {other.__name__} signature")
+            if impl.verify(message + b'\x00', sig, pk):
+                failures.append(f"{impl.__name__} accepts a tampered message")
+    return failures
+
+
+def check_legacy(scheme, seed: bytes, timer: Timer) -> List[str]:
+    """
+    crypto/signatures.py has no accelerated counterpart, so only check that
+    seeded keygen is deterministic and that sign/verify round-trips
+    """
+    message = hashlib.shake_256(seed + b'message').digest(1 + seed[0])
+    try:
+        keys = []
+        for _ in range(2):
+            with seeded_urandom(seed):
+                keys.append(timer.call(scheme.__name__, 'keygen', scheme.keygen))
+        failures = [] if keys[0] == keys[1] else ["seeded keygen is not deterministic"]
+        pk, sk = keys[0]
+        sig = timer.call(scheme.__name__, 'sign', scheme.sign, message, sk)
+        if not timer.call(scheme.__name__, 'verify', scheme.verify, message, sig, pk):
+            failures.append("rejects its own signature")
+        return failures
+    except Exception as e:
+        return [f"raised {type(e).__name__}: {e}"]
+
+
+def report_speedup(timer: Timer, reference: str, accelerated: str) -> Dict[str, float]:
+    """Print and return reference time / accelerated time per primitive"""
+    speedups = {}
+    ref_totals = timer.totals.get(reference, {})
+    acc_totals = timer.totals.get(accelerated, {})
+    for primitive, ref_time in ref_totals.items():
+        acc_time = acc_totals.get(primitive)
+        if acc_time:
+            speedups[primitive] = ref_time / acc_time
+            print(f"  {primitive:<8} {ref_time * 1000:>10.1f} ms  vs {acc_time * 1000:>8.1f} ms   "
+                  f"{speedups[primitive]:>6.1f}x")
+    return speedups
+
+
+def main():
+    """Run the selected conformance targets and exit non-zero on any mismatch"""
+    parser = argparse.ArgumentParser(description='Differential conformance harness for crypto backends')
+    parser.add_argument('--cases', type=int, default=10, help='Seeded cases per target')
+    parser.add_argument('--seed', type=int, default=0, help='Master seed')
+    parser.add_argument('--targets', nargs='*', default=['kyber', 'signature'],
+                        choices=['kyber', 'signature', 'legacy'],
+                        help="Targets to check ('legacy' is crypto/signatures.py, expected to fail)")
+    parser.add_argument('--output', help='Write the report as JSON to this path')
+    args = parser.parse_args()
+
+    pairs: Dict[str, Tuple] = {}
+    if 'kyber' in args.targets:
+        pairs['kyber'] = (kyber.Kyber1024Reference, getattr(kyber, 'Kyber1024NumPy', None), check_kyber)
+    if 'signature' in args.targets:
+        pairs['signature'] = (quantum_signatures.QuantumSignatureReference,
+                              getattr(quantum_signatures, 'QuantumSignatureNumPy', None), check_signature)
+
+    report = {'seed': args.seed, 'cases': args.cases, 'targets': {}}
+    total_failures = 0
+
+    for target, (reference, accelerated, check) in pairs.items():
+        if accelerated is None or kyber.np is None:
+            print(f"⚠️  {target}: no accelerated backend available (is numpy installed?), skipping")
+            report['targets'][target] = {'skipped': True}
+            continue
+        print(f"🔬 {target}: {reference.__name__} vs {accelerated.__name__}")
+        timer = Timer()
+        failures = {}
+        for i in range(args.cases):
+            problems = check(reference, accelerated, case_seed(args.seed, target, i), timer)
+            if problems:
+                failures[i] = problems
+                print(f"  ❌ case {i}: {'; '.join(problems)}")
+        print(f"  {'✅' if not failures else '❌'} {args.cases - len(failures)}/{args.cases} cases identical")
+        speedups = report_speedup(timer, reference.__name__, accelerated.__name__)
+        report['targets'][target] = {
+            'reference': reference.__name__,
+            'accelerated': accelerated.__name__,
+            'failures': failures,
+            'timings': timer.totals,
+            'speedup': speedups
+        }
+        total_failures += len(failures)
+
+    if 'legacy' in args.targets:
+        scheme = legacy_signatures.QuantumSignature
+        print(f"🔬 legacy: {scheme.__module__}.{scheme.__name__} (self-consistency only, expected failure)")
+        timer = Timer()
+        failures = {}
+        for i in range(args.cases):
+            problems = check_legacy(scheme, case_seed(args.seed, 'legacy', i), timer)
+            if problems:
+                failures[i] = problems
+                print(f"  ⚠️  case {i}: {'; '.join(problems)}")
+        print(f"  ⚠️  {args.cases - len(failures)}/{args.cases} cases passed; xfail: {LEGACY_XFAIL}")
+        report['targets']['legacy'] = {'xfail': LEGACY_XFAIL, 'failures': failures, 'timings': timer.totals}
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Report written to {args.output}")
+
+    return 1 if total_failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
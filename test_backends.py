@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Tests for the crypto backend registry: every loadable backend must produce
+transactions that verify
+"""
+
+import pytest
+
+from qxchain.core.blockchain import QXBlockchain
+from qxchain.crypto import backends
+
+
+@pytest.fixture
+def restore_backend():
+    previous = backends.get_backend()
+    yield
+    backends.select_backend(previous.name)
+
+
+@pytest.mark.parametrize('name', backends.registered_backends())
+def test_transaction_round_trip(name, restore_backend):
+    """A wallet's transaction is signed and verifies under each backend"""
+    try:
+        backends.load_backend(name)
+    except (ImportError, RuntimeError) as e:
+        pytest.skip(f"backend '{name}' unavailable: {e}")
+    assert backends.select_backend(name).name == name
+    
+    blockchain = QXBlockchain()
+    wallet = blockchain.create_wallet('alice')
+    blockchain.balances[wallet['address']] = 100.0
+    
+    transaction = blockchain.create_transaction('alice', 'QX' + '1' * 34, 1.5)
+    assert transaction.public_key == bytes.fromhex(wallet['signature_public_key'])
+    assert transaction.verify_signature()
+    assert blockchain.add_transaction(transaction)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])
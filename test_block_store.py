@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for block body storage: the memory and file stores, ChainView, and
+reloading a block directory
+"""
+
+import json
+import os
+
+import pytest
+
+from qxchain.core.block import Block
+from qxchain.core.block_store import ChainView, FileBlockStore, MemoryBlockStore
+from qxchain.core.blockchain import QXBlockchain
+
+MINER = 'QX' + '1' * 34
+
+
+def mine(blockchain: QXBlockchain, count: int) -> None:
+    for _ in range(count):
+        block = blockchain.create_block_template(MINER)
+        block.mine_block()
+        assert blockchain.add_block(block)
+
+
+@pytest.fixture(params=['memory', 'file'])
+def store(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryBlockStore(cache_size=2, json_cache_size=2)
+    return FileBlockStore(str(tmp_path / 'blocks'), cache_size=2, json_cache_size=2)
+
+
+def test_store_round_trip(store):
+    """Blocks come back equal after falling out of the decoded-block cache"""
+    blockchain = QXBlockchain()
+    mine(blockchain, 3)
+    blocks = list(blockchain.chain)
+    for block in blocks:
+        store.put(block)
+    
+    assert sorted(store.hashes()) == sorted(block.block_hash for block in blocks)
+    for block in blocks:
+        assert block.block_hash in store
+        assert store.get(block.block_hash).to_bytes() == block.to_bytes()
+        assert json.loads(store.get_json(block.block_hash)) == block.to_dict()
+    
+    store.discard(blocks[0].block_hash)
+    assert blocks[0].block_hash not in store
+    with pytest.raises(KeyError):
+        store.get(blocks[0].block_hash)
+    
+    store.clear()
+    assert store.hashes() == []
+
+
+def test_file_store_writes_one_file_per_block(tmp_path):
+    store = FileBlockStore(str(tmp_path))
+    block = Block.create_genesis_block()
+    block.mine_block()
+    store.put(block)
+    assert os.listdir(tmp_path) == [block.block_hash + FileBlockStore.SUFFIX]
+
+
+def test_chain_view():
+    blockchain = QXBlockchain()
+    mine(blockchain, 3)
+    view = ChainView(blockchain.headers, blockchain.block_store)
+    
+    assert len(view) == 4
+    assert [block.block_hash for block in view] == [header.block_hash for header in blockchain.headers]
+    assert view[-1].block_hash == blockchain.get_latest_header().block_hash
+    assert [block.index for block in view[1:3]] == [1, 2]
+    assert json.loads(view.block_json(2)) == view[2].to_dict()
+    assert [block['index'] for block in json.loads(view.to_json())] == [0, 1, 2, 3]
+
+
+def test_reload_block_directory(tmp_path):
+    """A node restarted on an existing --block-dir adopts the stored chain instead of wiping it"""
+    directory = str(tmp_path)
+    original = QXBlockchain()
+    original.set_block_store(FileBlockStore(directory))
+    mine(original, 3)
+    files = sorted(os.listdir(directory))
+    
+    restarted = QXBlockchain()
+    restarted.set_block_store(FileBlockStore(directory))
+    assert sorted(os.listdir(directory)) == files
+    assert restarted.headers == original.headers
+    assert restarted.get_balance(MINER) == original.get_balance(MINER)
+    assert restarted.validate_chain()
+
+
+def test_reload_rejects_corrupt_directory(tmp_path):
+    directory = str(tmp_path)
+    original = QXBlockchain()
+    original.set_block_store(FileBlockStore(directory))
+    mine(original, 2)
+    path = os.path.join(directory, original.get_latest_header().block_hash + FileBlockStore.SUFFIX)
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) - 1)
+    
+    restarted = QXBlockchain()
+    headers, store = restarted.headers, restarted.block_store
+    with pytest.raises(ValueError):
+        restarted.set_block_store(FileBlockStore(directory))
+    assert restarted.headers == headers and restarted.block_store is store
+
+
+def test_reorg_writes_only_new_blocks(tmp_path):
+    """Replacing the chain keeps shared bodies on disk and drops only the abandoned ones"""
+    directory = str(tmp_path)
+    local = QXBlockchain()
+    local.set_block_store(FileBlockStore(directory))
+    mine(local, 1)
+    
+    fork = QXBlockchain()
+    fork.chain = list(local.chain)[:1]
+    fork.adjust_difficulty()
+    mine(fork, 3)
+    
+    genesis_path = os.path.join(directory, local.headers[0].block_hash + FileBlockStore.SUFFIX)
+    genesis_mtime = os.stat(genesis_path).st_mtime_ns
+    abandoned = local.get_latest_header().block_hash
+    
+    assert local.replace_chain(list(fork.chain))
+    assert os.stat(genesis_path).st_mtime_ns == genesis_mtime
+    assert sorted(local.block_store.hashes()) == sorted(header.block_hash for header in fork.headers)
+    assert abandoned not in local.block_store
+    assert local.validate_chain()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for QXBlockchain chain validation and replacement
+"""
+
+import pytest
+
+from qxchain.core.blockchain import QXBlockchain
+from qxchain.core.key_reservoir import generate_wallet_keys
+from qxchain.core.miner import MiningJob
+
+
+def make_chain(blocks: int, **params) -> QXBlockchain:
+    """Chain with params applied and `blocks` mined blocks on top of genesis"""
+    blockchain = QXBlockchain()
+    for name, value in params.items():
+        setattr(blockchain, name, value)
+    for _ in range(blocks):
+        block = blockchain.create_block_template('QX' + '1' * 34)
+        block.mine_block()
+        assert blockchain.add_block(block)
+    return blockchain
+
+
+def test_import_uses_own_consensus_params():
+    """An export validates on a node with the same non-default retarget settings"""
+    params = {'target_block_time': 0.001, 'retarget_window': 3}
+    source = make_chain(6, **params)
+    assert source.validate_chain()
+    exported = source.export_chain()
+    
+    target = QXBlockchain()
+    for name, value in params.items():
+        setattr(target, name, value)
+    assert target.import_chain(exported)
+    assert target.get_latest_header().block_hash == source.get_latest_header().block_hash
+    
+    # Under the default settings the retargeted bits do not match
+    assert not QXBlockchain().import_chain(exported)
+
+
+
+def test_wallet_batch_limit():
+    blockchain = QXBlockchain()
+    with pytest.raises(ValueError):
+        blockchain.create_wallets([f'user{i}' for i in range(QXBlockchain.MAX_WALLET_BATCH + 1)])
+    assert blockchain.wallets == {}
+
+
+def test_rejected_wallet_batch_returns_keys(monkeypatch):
+    """Keys taken for a batch that loses a race for a user ID go back to the reservoir"""
+    blockchain = QXBlockchain()
+    blockchain.key_reservoir.give_back([generate_wallet_keys(), generate_wallet_keys()])
+    ready = list(blockchain.key_reservoir._keys)
+    
+    check = blockchain._check_new_user_ids
+    calls = []
+    
+    def racing_check(user_ids):
+        check(user_ids)
+        if not calls:  # another request takes 'bob' between the two checks
+            blockchain.wallets['bob'] = {}
+        calls.append(user_ids)
+    
+    monkeypatch.setattr(blockchain, '_check_new_user_ids', racing_check)
+    with pytest.raises(ValueError):
+        blockchain.create_wallets(['alice', 'bob'])
+    assert 'alice' not in blockchain.wallets
+    assert list(blockchain.key_reservoir._keys) == ready
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])
+
+
+def test_mining_jobs_cancelled_when_tip_moves():
+    """A registered job stops once another block takes its height or the chain is replaced"""
+    blockchain = make_chain(0)
+    job = MiningJob(blockchain, 'QX' + '2' * 34)
+    assert job.height == 1 and not job.cancelled
+    
+    block = blockchain.create_block_template('QX' + '1' * 34)
+    block.mine_block()
+    assert blockchain.add_block(block)
+    assert job.cancelled
+    
+    job = MiningJob(blockchain, 'QX' + '2' * 34)
+    assert not job.cancelled
+    heavier = make_chain(3)
+    assert blockchain.replace_chain(list(heavier.chain))
+    assert job.cancelled
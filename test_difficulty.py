@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Tests for compact targets, retargeting, cumulative work, and the
+median-time-past and future-time rules for block timestamps
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from qxchain.core.blockchain import QXBlockchain
+from qxchain.core.difficulty import (GENESIS_BITS, INITIAL_BITS, MAX_TARGET, chain_work, compact_to_target,
+                                     leading_zeros_target, retarget, target_to_compact, target_work)
+
+MINER = 'QX' + '1' * 34
+
+
+@pytest.mark.parametrize('bits', [0x1d00ffff, 0x1f0fffff, 0x03123456, 0x04123456, 0x207fffff,
+                                  GENESIS_BITS, INITIAL_BITS])
+def test_compact_round_trip(bits):
+    assert target_to_compact(compact_to_target(bits)) == bits
+
+
+@pytest.mark.parametrize('target', [1, 0x7f, 0x80, 0xffff, 0x123456, 0x800000, 2 ** 100 + 12345,
+                                    leading_zeros_target(4), MAX_TARGET])
+def test_target_truncates_to_mantissa(target):
+    """Encoding keeps the top 23 mantissa bits; expanding again never exceeds the target"""
+    expanded = compact_to_target(target_to_compact(target))
+    assert expanded <= target
+    assert target_to_compact(expanded) == target_to_compact(target)
+    if target.bit_length() <= 23:
+        assert expanded == target
+
+
+def test_compact_edge_cases():
+    assert target_to_compact(0) == 0
+    assert compact_to_target(0) == 0
+    # A set high mantissa bit moves into the exponent instead of reading as a sign
+    assert target_to_compact(0x80) == 0x02008000
+    with pytest.raises(ValueError):
+        compact_to_target(0x04923456)
+
+
+def test_retarget_scales_with_block_times():
+    target = 1 << 200
+    targets = [target] * 5
+    assert retarget(targets, [0, 10, 20, 30, 40], block_time=10) == target
+    assert retarget(targets, [0, 20, 40, 60, 80], block_time=10) == target * 2
+    assert retarget(targets, [0, 5, 10, 15, 20], block_time=10) == target // 2
+
+
+def test_retarget_averages_targets_after_the_first():
+    targets = [1, 100, 200, 300]
+    assert retarget(targets, [0, 10, 20, 30], block_time=10) == 200
+
+
+def test_retarget_clamps_adjustment():
+    target = 1 << 200
+    targets = [target] * 3
+    assert retarget(targets, [0, 1000, 2000], block_time=10) == target * 4
+    assert retarget(targets, [0, 0, 0], block_time=10) == target // 4
+    assert retarget(targets, [0, 1000, 2000], block_time=10, max_adjustment=2) == target * 2
+
+
+def test_retarget_bounds():
+    assert retarget([MAX_TARGET] * 3, [0, 100, 200], block_time=10) == MAX_TARGET
+    assert retarget([1] * 3, [0, 0, 0], block_time=10) == 1
+    with pytest.raises(ValueError):
+        retarget([MAX_TARGET], [0], block_time=10)
+
+
+def test_chain_work():
+    assert target_work((1 << 256) - 1) == 1
+    assert target_work((1 << 255) - 1) == 2
+    assert target_work(leading_zeros_target(4)) == 1 << 16
+    assert chain_work([]) == 0
+    assert chain_work([(1 << 255) - 1] * 3) == 6
+    # Fewer blocks at a harder target can outweigh more easy ones
+    hard, easy = leading_zeros_target(5), leading_zeros_target(4)
+    assert chain_work([hard]) > chain_work([easy] * 15)
+
+
+def headers(*timestamps):
+    return [SimpleNamespace(timestamp=timestamp) for timestamp in timestamps]
+
+
+def test_median_time_past():
+    blockchain = QXBlockchain()
+    blockchain.median_time_span = 5
+    assert blockchain.median_time_past(headers(7)) == 7
+    assert blockchain.median_time_past(headers(1, 9, 3, 7, 5)) == 5
+    # Only the last median_time_span blocks count
+    assert blockchain.median_time_past(headers(100, 100, 1, 9, 3, 7, 5)) == 5
+
+
+def test_timestamp_must_exceed_median_time_past():
+    blockchain = QXBlockchain()
+    first = blockchain.create_block_template(MINER)
+    first.mine_block()
+    assert blockchain.add_block(first)
+    
+    median = blockchain.median_time_past(blockchain.headers)
+    block = blockchain.create_block_template(MINER)
+    block.timestamp = median
+    assert not blockchain._valid_timestamp(block, blockchain.headers)
+    assert not blockchain.add_block(block)
+    block.timestamp = median + 0.001
+    assert blockchain._valid_timestamp(block, blockchain.headers)
+
+
+def test_timestamp_future_limit():
+    blockchain = QXBlockchain()
+    blockchain.max_future_block_time = 60.0
+    block = blockchain.create_block_template(MINER)
+    block.timestamp = time.time() + 30
+    assert blockchain._valid_timestamp(block, blockchain.headers)
+    block.timestamp = time.time() + 120
+    assert not blockchain._valid_timestamp(block, blockchain.headers)
+    assert not blockchain.add_block(block)
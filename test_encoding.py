@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Tests for the binary encoding, version 1 hashing, and verification of
+pre-versioning (legacy JSON-hashed) blocks
+"""
+
+import copy
+
+import pytest
+
+from qxchain.core.block import Block, Transaction
+from qxchain.core.encoding import Decoder, Encoder, amount_to_units, units_to_amount
+from qxchain.core.legacy import legacy_block_hash, verify_legacy_block, verify_legacy_chain
+
+# Block produced by the pre-versioning Block class (difficulty 3)
+LEGACY_BLOCK = {
+    "index": 1,
+    "timestamp": 1700000002.0,
+    "transactions": [
+        {
+            "sender": "0",
+            "recipient": "QX1Miner",
+            "amount": 10.0,
+            "fee": 0.0,
+            "timestamp": 1700000000.5,
+            "data": None,
+            "signature": None,
+            "public_key": None,
+            "transaction_hash": "7e99724d3d9d5ee4249170aca1919e78ceca1508145605780d4aff4a2d3ea5cf"
+        },
+        {
+            "sender": "QX1Alice",
+            "recipient": "QX1Bob",
+            "amount": 2.5,
+            "fee": 0.01,
+            "timestamp": 1700000001.25,
+            "data": "coffee",
+            "signature": None,
+            "public_key": None,
+            "transaction_hash": "79a92c3a5bbdd9eef530b0f61a9d8be71efb820f656c5e1685d1016c52af3579"
+        }
+    ],
+    "previous_hash": "0" * 64,
+    "nonce": 1823,
+    "difficulty": 3,
+    "miner_address": "QX1Miner",
+    "block_reward": 10.0,
+    "merkle_root": "7ce9271d978f9507dafb3bfa71bfd87043ad82483e31bf09fb1778e260406ab9",
+    "block_hash": "000f4be805bd5b5a2a2771fdf8a5b73350792d40cc33efa1658f74766f51f0a9"
+}
+
+
+def test_amount_units():
+    assert amount_to_units(0.01) == 1_000_000
+    assert amount_to_units(42000000.0) == 4_200_000_000_000_000
+    assert amount_to_units(-2.5) == -250_000_000
+    assert units_to_amount(amount_to_units(10.12345678)) == 10.12345678
+
+
+@pytest.mark.parametrize('amount', [0.1 + 0.2, 1e-9, 10.123456789])
+def test_inexact_amounts_rejected(amount):
+    with pytest.raises(ValueError):
+        amount_to_units(amount)
+
+
+def test_text_length_limit():
+    encoded = Encoder().text('x' * 0xFFFF).getvalue()
+    assert Decoder(encoded).text() == 'x' * 0xFFFF
+    with pytest.raises(ValueError):
+        Encoder().text('x' * 0x10000)
+    with pytest.raises(ValueError):  # the limit counts UTF-8 bytes
+        Encoder().text('é' * 0x8000)
+
+
+def test_decoder_rejects_truncated_and_trailing_input():
+    encoded = Encoder().u32(7).text('abc').getvalue()
+    truncated = Decoder(encoded[:-1])
+    assert truncated.u32() == 7
+    with pytest.raises(ValueError):
+        truncated.text()
+    
+    decoder = Decoder(encoded + b'\x00')
+    assert (decoder.u32(), decoder.text()) == (7, 'abc')
+    with pytest.raises(ValueError):
+        decoder.finish()
+
+
+def test_transaction_hash_verification():
+    tx = Transaction('QX1Alice', 'QX1Bob', 2.5, 0.01, 1700000001.25, data='coffee')
+    decoded = Transaction.from_bytes(tx.to_bytes())
+    assert decoded == tx
+    assert Transaction.from_dict(tx.to_dict()) == tx
+    
+    tampered = dict(tx.to_dict(), amount=25.0)
+    with pytest.raises(ValueError):
+        Transaction.from_dict(tampered)
+    with pytest.raises(ValueError):
+        Transaction.from_dict({k: v for k, v in tx.to_dict().items() if k != 'version'})
+
+
+def test_block_hash_verification():
+    block = Block(index=1, timestamp=1700000002.0, previous_hash='0' * 64, miner_address='QX1Miner',
+                  transactions=[Transaction('0', 'QX1Miner', 10.0, 0.0, 1700000000.5)])
+    block.mine_block()
+    assert block.is_valid()
+    decoded = Block.from_bytes(block.to_bytes())
+    assert decoded.block_hash == block.block_hash and decoded.is_valid()
+    
+    data = copy.deepcopy(block.to_dict())
+    data['timestamp'] += 1
+    assert not Block.from_dict(data).is_valid()
+
+
+def test_legacy_block_verification():
+    assert verify_legacy_block(LEGACY_BLOCK)
+    assert legacy_block_hash(LEGACY_BLOCK) == LEGACY_BLOCK['block_hash']
+    with pytest.raises(ValueError):
+        Block.from_dict(LEGACY_BLOCK)
+    
+    for path, value in [(('nonce',), 1824), (('difficulty',), 4), (('transactions', 1, 'amount'), 3.0),
+                        (('merkle_root',), '0' * 64)]:
+        tampered = copy.deepcopy(LEGACY_BLOCK)
+        target = tampered
+        for key in path[:-1]:
+            target = target[key]
+        target[path[-1]] = value
+        assert not verify_legacy_block(tampered), path
+
+
+def test_legacy_chain_links():
+    successor = copy.deepcopy(LEGACY_BLOCK)
+    assert not verify_legacy_chain([LEGACY_BLOCK, successor])  # same index, wrong link
+    assert verify_legacy_chain([LEGACY_BLOCK])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental Merkle tree, inclusion proofs, and the chain's
+transaction index that proofs are served from
+"""
+
+import hashlib
+
+import pytest
+
+from qxchain.core.blockchain import QXBlockchain
+from qxchain.core.merkle import EMPTY_ROOT, MerkleTree, hash_pair, verify_merkle_proof
+
+
+def leaf(i: int) -> str:
+    return hashlib.sha3_256(b'tx%d' % i).hexdigest()
+
+
+def full_root(leaves):
+    """Root computed level by level, pairing an odd last node with itself"""
+    level = list(leaves)
+    if not level:
+        return EMPTY_ROOT
+    while len(level) > 1:
+        level = [hash_pair(level[i], level[i + 1] if i + 1 < len(level) else level[i])
+                 for i in range(0, len(level), 2)]
+    return level[0]
+
+
+@pytest.mark.parametrize('count', [0, 1, 2, 3, 5, 7, 8, 13])
+def test_append_matches_full_rebuild(count):
+    tree = MerkleTree()
+    for i in range(count):
+        tree.append(leaf(i))
+        assert tree.root == full_root(leaf(j) for j in range(i + 1))
+    assert len(tree) == count
+    assert MerkleTree(leaf(i) for i in range(count)).root == tree.root
+
+
+@pytest.mark.parametrize('count', [1, 2, 3, 5, 7, 8, 13])
+def test_proofs_verify(count):
+    tree = MerkleTree(leaf(i) for i in range(count))
+    for i in range(count):
+        assert verify_merkle_proof(leaf(i), tree.proof(i), tree.root)
+    with pytest.raises(IndexError):
+        tree.proof(count)
+
+
+def test_tampered_proofs_fail():
+    tree = MerkleTree(leaf(i) for i in range(5))
+    proof = tree.proof(4)  # last leaf of an odd level is paired with itself
+    assert verify_merkle_proof(leaf(4), proof, tree.root)
+    
+    assert not verify_merkle_proof(leaf(3), proof, tree.root)
+    assert not verify_merkle_proof(leaf(4), proof, leaf(0))
+    assert not verify_merkle_proof(leaf(4), proof[:-1], tree.root)
+    
+    flipped = [dict(step) for step in proof]
+    flipped[-1]['position'] = 'right'  # the top sibling is a distinct subtree
+    swapped = [dict(step) for step in proof]
+    swapped[1]['hash'] = leaf(9)
+    for bad in (flipped, swapped, [{'hash': leaf(0), 'position': 'up'}], [{'position': 'left'}]):
+        assert not verify_merkle_proof(leaf(4), bad, tree.root)
+
+
+def test_transaction_index_follows_chain():
+    """Proof lookups find transactions through the index after mining and after a reorganization"""
+    blockchain = QXBlockchain()
+    block = blockchain.create_block_template('QX' + '1' * 34)
+    block.mine_block()
+    assert blockchain.add_block(block)
+    reward = block.transactions[0].transaction_hash
+    
+    found = blockchain.find_transaction_block(reward)
+    assert found.block_hash == block.block_hash
+    assert verify_merkle_proof(reward, found.merkle_proof(reward), found.merkle_root)
+    assert blockchain.find_transaction_block('0' * 64) is None
+    
+    fork = QXBlockchain()
+    fork.chain = list(blockchain.chain)[:1]
+    fork.adjust_difficulty()
+    for _ in range(2):
+        other = fork.create_block_template('QX' + '2' * 34)
+        other.mine_block()
+        assert fork.add_block(other)
+    assert blockchain.replace_chain(list(fork.chain))
+    assert blockchain.find_transaction_block(reward) is None
+    assert blockchain.find_transaction_block(other.transactions[0].transaction_hash).block_hash == other.block_hash
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Regression tests for the QXChain lattice signature scheme
+"""
+
+from crypto.quantum_signatures import QuantumSignatureReference as QS
+
+
+def test_masks_differ_between_messages():
+    """Signatures of two messages must not share a mask: z1 - z2 == (c1 - c2)s1 recovers s1"""
+    public_key, private_key = QS.keygen()
+    _, _, s1, _, _ = QS._unpack_private_key(private_key)
+    
+    signature1 = QS.sign(b"first message", private_key)
+    signature2 = QS.sign(b"second message", private_key)
+    assert QS.verify(b"first message", signature1, public_key)
+    assert QS.verify(b"second message", signature2, public_key)
+    
+    c1, z1 = QS._unpack_signature(signature1)
+    c2, z2 = QS._unpack_signature(signature2)
+    z_diff = QS._center_vector(QS._vector_sub(z1, z2))
+    cs1_diff = QS._center_vector(QS._vector_sub(
+        QS._sparse_scalar_vector_mul(QS._challenge_terms(c1), s1),
+        QS._sparse_scalar_vector_mul(QS._challenge_terms(c2), s1)
+    ))
+    assert z_diff != cs1_diff
+
+
+if __name__ == "__main__":
+    test_masks_differ_between_messages()
+    print("✅ Signature tests passed")